@@ -1,24 +1,33 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 
-# Loading Datasets
-results = pd.read_csv("datasets/results.csv", na_values=[r"\N"])
-drivers = pd.read_csv("datasets/drivers.csv", na_values=[r"\N"])
-races = pd.read_csv("datasets/races.csv")
-constructors = pd.read_csv("datasets/constructors.csv")
+from ingestion.columnar import read_processed
+from ingestion.loader import load_config
+
+# Loading Datasets: the ingestion outputs, memory-mapped from their columnar
+# copies when present (only the columns used here are read)
+datasets = load_config("ingestion/config.yaml")["datasets"]
+
+results = read_processed(
+    datasets["results"]["valid_output_path"],
+    columns = ["race_id", "driver_id", "constructor_id", "grid", "position", "points"]
+)
+drivers = read_processed(datasets["drivers"]["valid_output_path"], columns = ["driver_id", "forename", "surname"])
+races = read_processed(datasets["races"]["valid_output_path"], columns = ["race_id", "year"])
+constructors = read_processed(datasets["constructors"]["valid_output_path"], columns = ["constructor_id", "name"])
 
 results["points"] = pd.to_numeric(results["points"], errors="coerce")
 races["year"] = pd.to_numeric(races["year"], errors="coerce")
 
 # Total points per driver
-driver_points = results.groupby("driverId")["points"].sum().reset_index()
+driver_points = results.groupby("driver_id")["points"].sum().reset_index()
 
 # Merge with drivers table
-driver_points = driver_points.merge(drivers, on = "driverId")
+driver_points = driver_points.merge(drivers, on = "driver_id")
 
 # Merged: results -> races (to get year) -> constructors (to get names)
-merged = results.merge(races[["raceId", "year"]], on = "raceId", how = "left")
-merged = merged.merge(constructors[["constructorId", "name"]], on = "constructorId", how = "left")
+merged = results.merge(races[["race_id", "year"]], on = "race_id", how = "left")
+merged = merged.merge(constructors[["constructor_id", "name"]], on = "constructor_id", how = "left")
 
 merged = merged.dropna(subset = ["year", "name", "points"])
 
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+
+from backend.db import connection
+
+# Points are NUMERIC(6,2); loading them as whole hundredths keeps every sum exact
+RESULTS_SQL = """
+    SELECT driver_id, constructor_id, season,
+           COALESCE(position, 0),
+           COALESCE((points * 100)::INTEGER, 0),
+           points IS NOT NULL
+    FROM core.results
+"""
+
+# (name, dtype) of each RESULTS_SQL column, in select order
+RESULT_COLUMNS = [
+    ("driver_id", np.int32),
+    ("constructor_id", np.int32),
+    ("season", np.int16),
+    ("position", np.int16),
+    ("cents", np.int32),
+    ("has_points", np.bool_),
+]
+
+# Rows fetched from the server-side cursor per round trip
+RESULTS_BATCH_ROWS = 50_000
+
+DRIVERS_SQL = "SELECT driver_id, forename || ' ' || surname FROM core.drivers ORDER BY driver_id"
+
+CONSTRUCTORS_SQL = "SELECT constructor_id, name FROM core.constructors ORDER BY constructor_id"
+
+
+def _points(cents: int, has_points: bool) -> Decimal | None:
+    # Same value and scale as SUM() over NUMERIC(6,2), e.g. Decimal("4820.50")
+    return Decimal(int(cents)).scaleb(-2) if has_points else None
+
+
+def _join_index(ids: np.ndarray, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Position of each key in the sorted ids array, and which keys were found
+    (an inner join: rows whose key is missing are dropped by the caller).
+    """
+    pos = np.searchsorted(ids, keys)
+    pos[pos == len(ids)] = 0
+    found = ids[pos] == keys if len(ids) else np.zeros(len(keys), dtype=bool)
+    return pos, found
+
+
+def _group_points(codes: np.ndarray, cents: np.ndarray, has_points: np.ndarray, size: int):
+    """
+    Per-group row count, points sum (hundredths) and whether any row had points.
+    """
+    rows = np.bincount(codes, minlength=size)
+    # float64 sums are exact here: hundredths stay far below 2**53
+    total = np.rint(np.bincount(codes, weights=cents, minlength=size)).astype(np.int64)
+    with_points = np.bincount(codes[has_points], minlength=size) > 0
+    return rows, total, with_points
+
+
+@dataclass(frozen=True)
+class AnalyticsSnapshot:
+    """
+    Driver careers and constructor seasons aggregated from one load of
+    core.results, core.drivers and core.constructors.
+
+    Rows come back in the shape (and order) of the /api/core/* SQL over the
+    materialized views: points as Decimal, NULL points sorted first, ties
+    broken by id.
+    """
+    driver_ids: np.ndarray
+    driver_names: np.ndarray
+    races: np.ndarray
+    wins: np.ndarray
+    podiums: np.ndarray
+    driver_cents: np.ndarray
+    driver_has_points: np.ndarray
+    leaderboard_order: np.ndarray
+    season_years: np.ndarray
+    season_constructor_ids: np.ndarray
+    season_constructor_names: np.ndarray
+    season_cents: np.ndarray
+    season_has_points: np.ndarray
+    result_rows: int = 0
+    nbytes: int = 0
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(
+            cls,
+            results: dict[str, np.ndarray],
+            driver_ids: np.ndarray,
+            driver_names: np.ndarray,
+            constructor_ids: np.ndarray,
+            constructor_names: np.ndarray,
+    ) -> "AnalyticsSnapshot":
+        """
+        Aggregate results (driver_id, constructor_id, season, position with 0
+        for NULL, cents, has_points arrays) against id-sorted driver and
+        constructor lookups.
+        """
+        cents = results["cents"]
+        has_points = results["has_points"]
+        position = results["position"]
+
+        # 1) Driver careers: one bincount per measure over the driver's dense index
+        d_idx, d_found = _join_index(driver_ids, results["driver_id"])
+        d_idx = d_idx[d_found]
+        d_pos = position[d_found]
+        n_drivers = len(driver_ids)
+
+        races, d_cents, d_has = _group_points(d_idx, cents[d_found], has_points[d_found], n_drivers)
+        wins = np.bincount(d_idx[d_pos == 1], minlength=n_drivers)
+        podiums = np.bincount(d_idx[(d_pos >= 1) & (d_pos <= 3)], minlength=n_drivers)
+
+        career = np.flatnonzero(races > 0)
+        # ORDER BY total_points DESC (NULLs first, as in Postgres), driver_id
+        order = career[np.lexsort((driver_ids[career], -d_cents[career], d_has[career]))]
+
+        # 2) Constructor seasons: group code = season index * constructors + constructor index
+        c_idx, c_found = _join_index(constructor_ids, results["constructor_id"])
+        years, s_idx = np.unique(results["season"][c_found], return_inverse=True)
+        n_constructors = len(constructor_ids)
+        codes = s_idx * n_constructors + c_idx[c_found]
+
+        rows, s_cents, s_has = _group_points(codes, cents[c_found], has_points[c_found], len(years) * n_constructors)
+        groups = np.flatnonzero(rows > 0)
+        g_year = years[groups // max(n_constructors, 1)]
+        g_constructor = groups % max(n_constructors, 1)
+        # By year, then total_points DESC (NULLs first), constructor_id
+        g_order = np.lexsort((constructor_ids[g_constructor], -s_cents[groups], s_has[groups], g_year))
+        groups, g_year, g_constructor = groups[g_order], g_year[g_order], g_constructor[g_order]
+
+        arrays = {
+            "driver_ids": driver_ids,
+            "driver_names": driver_names,
+            "races": races,
+            "wins": wins,
+            "podiums": podiums,
+            "driver_cents": d_cents,
+            "driver_has_points": d_has,
+            "leaderboard_order": order,
+            "season_years": g_year,
+            "season_constructor_ids": constructor_ids[g_constructor],
+            "season_constructor_names": constructor_names[g_constructor],
+            "season_cents": s_cents[groups],
+            "season_has_points": s_has[groups],
+        }
+        return cls(
+            **arrays,
+            result_rows=len(cents),
+            nbytes=sum(a.nbytes for a in arrays.values()),
+        )
+
+    def leaderboard(self, limit: int) -> list[dict[str, Any]]:
+        top = self.leaderboard_order[:limit]
+        return [
+            {"driver_id": d, "driver_name": name, "total_points": _points(cents, has)}
+            for d, name, cents, has in zip(
+                self.driver_ids[top].tolist(),
+                self.driver_names[top],
+                self.driver_cents[top].tolist(),
+                self.driver_has_points[top].tolist(),
+            )
+        ]
+
+    def constructors_by_year(self, year: int) -> list[dict[str, Any]]:
+        start, stop = np.searchsorted(self.season_years, [year, year + 1])
+        return [
+            {"constructor_id": c, "constructor_name": name, "total_points": _points(cents, has)}
+            for c, name, cents, has in zip(
+                self.season_constructor_ids[start:stop].tolist(),
+                self.season_constructor_names[start:stop],
+                self.season_cents[start:stop].tolist(),
+                self.season_has_points[start:stop].tolist(),
+            )
+        ]
+
+    def _stats_rows(self, idx: np.ndarray) -> list[dict[str, Any]]:
+        return [
+            {
+                "driver_id": d,
+                "driver_name": name,
+                "races": races,
+                "wins": wins,
+                "podiums": podiums,
+                "total_points": _points(cents, has),
+            }
+            for d, name, races, wins, podiums, cents, has in zip(
+                self.driver_ids[idx].tolist(),
+                self.driver_names[idx],
+                self.races[idx].tolist(),
+                self.wins[idx].tolist(),
+                self.podiums[idx].tolist(),
+                self.driver_cents[idx].tolist(),
+                self.driver_has_points[idx].tolist(),
+            )
+        ]
+
+    def drivers_stats(self, driver_ids: list[int]) -> list[dict[str, Any]]:
+        """
+        Career totals for each of driver_ids (in that order) that has results.
+        """
+        keys = np.asarray(driver_ids, dtype=np.int64)
+        idx, found = _join_index(self.driver_ids, keys)
+        idx = idx[found]
+        return self._stats_rows(idx[self.races[idx] > 0])
+
+    def top_driver_stats(self, limit: int) -> list[dict[str, Any]]:
+        """
+        Career totals for the leaderboard's first limit drivers, in leaderboard order.
+        """
+        return self._stats_rows(self.leaderboard_order[:limit])
+
+    def driver_stats(self, driver_id: int) -> dict[str, Any] | None:
+        """
+        Career totals for driver_id, or None if the driver has no results.
+        """
+        rows = self.drivers_stats([driver_id])
+        return rows[0] if rows else None
+
+
+def _fetch_results(conn, batch_rows: int = RESULTS_BATCH_ROWS) -> dict[str, np.ndarray]:
+    """
+    RESULTS_SQL as one typed array per column, streamed through a server-side
+    cursor batch_rows at a time: only the current batch is ever held as
+    Python tuples, and each batch is converted before the next is fetched.
+    """
+    parts: dict[str, list[np.ndarray]] = {name: [] for name, _ in RESULT_COLUMNS}
+
+    # WITH HOLD lets the cursor outlive the implicit per-statement transaction in autocommit mode
+    with conn.cursor(name="analytics_results", withhold=conn.autocommit) as cur:
+        cur.execute(RESULTS_SQL)
+        while True:
+            rows = cur.fetchmany(batch_rows)
+            if not rows:
+                break
+            for (name, dtype), values in zip(RESULT_COLUMNS, zip(*rows)):
+                parts[name].append(np.array(values, dtype=dtype))
+
+    return {
+        name: np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)
+        for name, dtype in RESULT_COLUMNS
+    }
+
+
+def load_snapshot(conn) -> AnalyticsSnapshot:
+    """
+    Read the core tables into compact typed arrays and aggregate them.
+    """
+    results = _fetch_results(conn)
+
+    with conn.cursor() as cur:
+        cur.execute(DRIVERS_SQL)
+        drivers = cur.fetchall()
+        cur.execute(CONSTRUCTORS_SQL)
+        constructors = cur.fetchall()
+
+    def lookup(pairs):
+        ids = np.array([p[0] for p in pairs], dtype=np.int32)
+        names = np.empty(len(pairs), dtype=object)
+        names[:] = [p[1] for p in pairs]
+        return ids, names
+
+    return AnalyticsSnapshot.build(results, *lookup(drivers), *lookup(constructors))
+
+
+class AnalyticsEngine:
+    """
+    In-process replacement for the /api/core/* SQL.
+
+    Holds one AnalyticsSnapshot per data version: the first request for a new
+    version reloads the arrays (once, whatever the concurrency), every other
+    request is answered from memory.
+    """
+
+    def __init__(self):
+        self._snapshot: AnalyticsSnapshot | None = None
+        self._version: str | None = None
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.load_seconds = 0.0
+
+    def is_current(self, version: str | None) -> bool:
+        """
+        True if snapshot(version) would return without querying the database.
+        """
+        return version is not None and self._snapshot is not None and self._version == version
+
+    def snapshot(self, version: str | None, conn=None) -> AnalyticsSnapshot | None:
+        """
+        The snapshot for data version, loading it if needed. None without a
+        data version, since changes could not be detected; callers use SQL then.
+        """
+        if version is None:
+            return None
+        if self.is_current(version):
+            return self._snapshot
+
+        with self._lock:
+            if self.is_current(version):
+                return self._snapshot
+
+            start = time.perf_counter()
+            if conn is not None:
+                snap = load_snapshot(conn)
+            else:
+                with connection() as pooled:
+                    snap = load_snapshot(pooled)
+
+            self.loads += 1
+            self.load_seconds = round(time.perf_counter() - start, 4)
+            self._snapshot, self._version = snap, version
+            return snap
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        return {
+            "data_version": self._version,
+            "loads": self.loads,
+            "last_load_seconds": self.load_seconds,
+            "result_rows": snap.result_rows if snap else 0,
+            "bytes": snap.nbytes if snap else 0,
+            "age_seconds": round(time.monotonic() - snap.loaded_at, 3) if snap else None,
+        }
@@ -1,17 +1,41 @@
 from __future__ import annotations
 
+import base64
+import csv
+import hashlib
+import io
+import json
 import math
-from typing import Any
+import os
+import uuid
+from contextlib import asynccontextmanager
+from types import ModuleType
+from typing import Any, Callable
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 import psycopg2
 from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
 
-from backend.db import get_conn
+from backend.analytics_engine import AnalyticsEngine, AnalyticsSnapshot
+from backend.cache import LRUCache
+from backend.catalog import CatalogSnapshot, SchemaCatalog
+from backend.data_version import DataVersion
+from backend.db import connection, pool_stats
+from backend.table_queries import SearchLookup, SearchMatches, TableQueries
 
-app = FastAPI(title="TRNG2364 Project1 API", version="0.1")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_analytics()
+    yield
+
+
+app = FastAPI(title="TRNG2364 Project1 API", version="0.1", lifespan=lifespan)
 
 # Dev-friendly CORS (tighten later)
 app.add_middleware(
@@ -20,50 +44,223 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# gzip for clients that send Accept-Encoding: gzip, on bodies of at least GZIP_MINIMUM_SIZE bytes
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", 1000))
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
 DATA_SCHEMA = "core"
 
+# Trigram-indexed text of the whole row, maintained by infra/sql/03_search_schema.sql
+SEARCH_DOC_COLUMN = "search_doc"
+
+
+# Latest ingestion run_id (meta.ingestion_runs); re-read at most every few seconds
+data_version = DataVersion(ttl=float(os.getenv("DATA_VERSION_TTL_SECONDS", 5)))
+
+# Table/column lookups are served from memory; refreshed on TTL expiry, invalidation or a new data version
+catalog = SchemaCatalog(
+    DATA_SCHEMA, ttl=float(os.getenv("CATALOG_TTL_SECONDS", 300)), data_version=data_version
+)
+
+# (endpoint, params, data version) -> (etag, JSON body); bounded by total body bytes
+response_cache = LRUCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_ENTRIES", 1024)),
+    max_weight=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+    weigh=lambda item: len(item[1]),
+)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (t.strip() for t in header.split(","))
+
+
+def _cached_body(endpoint: str, params: tuple, version: str | None) -> tuple[tuple, tuple[str, bytes] | None]:
+    key = (endpoint, params, version)
+    return key, response_cache.get(key) if version is not None else None
+
+
+def _store_body(key: tuple, payload: Any) -> tuple[str, bytes]:
+    # Encoded as FastAPI's own JSONResponse would (NUMERIC -> number), so caching doesn't change the wire format
+    body = json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    cached = (f'"{hashlib.sha256(body).hexdigest()}"', body)
+    if key[-1] is not None:
+        response_cache.put(key, cached)
+    return cached
+
+
+def _etag_response(request: Request, cached: tuple[str, bytes]) -> Response:
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _versioned_json(request: Request, endpoint: str, params: tuple, compute: Callable[[], Any]) -> Response:
+    """
+    JSON response for data that only changes when ingestion runs.
+
+    Bodies are cached per (endpoint, params, data version) and carry a strong
+    ETag (SHA-256 of the body); a matching If-None-Match gets an empty 304.
+    Without a data version (no meta.ingestion_runs) nothing is cached, but
+    ETags still work.
+    """
+    key, cached = _cached_body(endpoint, params, data_version.current())
+    if cached is None:
+        cached = _store_body(key, compute())
+    return _etag_response(request, cached)
+
+
+@app.get("/api/health/response-cache")
+def get_response_cache_stats() -> dict[str, Any]:
+    return {"data_version": data_version.current(), **response_cache.stats()}
+
+
+@app.get("/api/health/pool")
+def get_pool_stats() -> dict[str, Any]:
+    return pool_stats()
+
+
+@app.get("/api/catalog")
+def get_catalog_stats() -> dict[str, Any]:
+    return catalog.stats()
 
-def _get_schema_tables(conn, schema: str) -> list[str]:
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = %s AND table_type = 'BASE TABLE'
-            ORDER BY table_name
-            """,
-            (schema,),
-        )
-        return [r[0] for r in cur.fetchall()]
-
-
-def _get_table_columns(conn, schema: str, table: str) -> list[str]:
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_schema = %s AND table_name = %s
-            ORDER BY ordinal_position
-            """,
-            (schema, table),
-        )
-        cols = [r[0] for r in cur.fetchall()]
-        if not cols:
-            raise HTTPException(status_code = 404, detail = f"Unknown table: {schema}.{table}")
-        return cols
+
+@app.post("/api/catalog/refresh")
+def refresh_catalog() -> dict[str, Any]:
+    catalog.invalidate()
+    catalog.snapshot()
+    return catalog.stats()
 
 
 @app.get("/api/tables")
 def list_tables() -> dict[str, Any]:
-    conn = get_conn()
+    return {"schema": DATA_SCHEMA, "tables": catalog.tables()}
+
+
+def _encode_cursor(values: list[Any]) -> str:
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(token: str, key_len: int) -> list[Any]:
     try:
-        tables = _get_schema_tables(conn, DATA_SCHEMA)
-        return {"schema": DATA_SCHEMA, "tables": tables}
-    finally:
-        conn.close()
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != key_len:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+# (table, search, data version, table storage) -> SearchMatches; bounded by total number of keys held
+search_cache = LRUCache(
+    max_entries=int(os.getenv("SEARCH_CACHE_ENTRIES", 256)),
+    max_weight=int(os.getenv("SEARCH_CACHE_MAX_KEYS", 2_000_000)),
+)
+
+
+def _table_request(
+        table: str,
+        search: str,
+        cursor: str | None,
+        sql_module: ModuleType = sql,
+        snap: CatalogSnapshot | None = None
+) -> tuple[TableQueries, list[Any] | None]:
+    """
+    Validate a /api/tables/{table} request against the cached catalog (or the
+    given snapshot of it) and return its query builder (for the given driver's
+    sql module) plus the decoded cursor (if any).
+    """
+    snap = snap or catalog.snapshot()
+
+    # Validate table exists in core (from the cached catalog)
+    all_cols = snap.columns.get(table)
+    if all_cols is None:
+        raise HTTPException(status_code=404, detail=f"Unknown table: {table}")
+
+    cols = [c for c in all_cols if c != SEARCH_DOC_COLUMN]
+    has_search_doc = len(cols) != len(all_cols)
+
+    pk = snap.primary_keys.get(table, [])
+    if cursor is not None and not pk:
+        raise HTTPException(status_code=400, detail=f"Cursor pagination needs a primary key; {table} has none")
+
+    after = _decode_cursor(cursor, len(pk)) if cursor is not None else None
+    queries = TableQueries(
+        sql_module, DATA_SCHEMA, table, cols, pk, search, SEARCH_DOC_COLUMN if has_search_doc else None
+    )
+    return queries, after
+
+
+def _rows_payload(columns: list[str], rows: list[dict[str, Any]], fmt: str) -> dict[str, Any]:
+    """
+    "rows": one object per row, or with fmt="columnar", "data": one array per
+    column, so column names are sent once instead of on every row.
+    """
+    if fmt == "columnar":
+        return {"data": {c: [r[c] for r in rows] for c in columns}}
+    return {"rows": rows}
+
+
+def _table_response(
+        queries: TableQueries,
+        table: str,
+        page: int | None,
+        page_size: int,
+        total_rows: int,
+        total_rows_exact: bool,
+        rows: list[dict[str, Any]],
+        fmt: str = "rows",
+) -> dict[str, Any]:
+    pk = queries.pk
+    next_cursor = None
+    if pk and len(rows) == page_size:
+        next_cursor = _encode_cursor([rows[-1][c] for c in pk])
+
+    return {
+        "schema": DATA_SCHEMA,
+        "table": table,
+        "page": page,
+        "page_size": page_size,
+        "total_rows": total_rows,
+        "total_rows_exact": total_rows_exact,
+        "total_pages": max(1, math.ceil(total_rows / page_size)),
+        "columns": queries.columns,
+        **_rows_payload(queries.columns, rows, fmt),
+        "next_cursor": next_cursor,
+    }
+
+
+def _search_matches(conn, table: str, search: str, queries: TableQueries, version: str | None) -> SearchMatches:
+    """
+    The ordered keys of table's rows matching search (see SearchLookup).
+    """
+    lookup = SearchLookup(search_cache, DATA_SCHEMA, table, search, version)
+    with conn.cursor() as cur:
+        cur.execute(*lookup.storage_query())
+        row = cur.fetchone()
+        matches = lookup.cached(row[0] if row else None)
+        if matches is None:
+            cur.execute(*queries.matching_keys())
+            matches = lookup.store([tuple(r) for r in cur.fetchall()])
+
+    return matches
+
+
+@app.get("/api/health/search-cache")
+def get_search_cache_stats() -> dict[str, Any]:
+    return search_cache.stats()
 
 
 @app.get("/api/tables/{table}")
@@ -72,138 +269,277 @@ def get_table_data(
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1, le=200),
     search: str = Query("", max_length=200),
+    cursor: str | None = Query(None, max_length=1000),
+    exact_count: bool = Query(False),
+    fmt: str = Query("rows", alias="format", pattern="^(rows|columnar)$"),
 ) -> dict[str, Any]:
-    conn = get_conn()
-    try:
-        # Validate table exists in staging
-        tables = set(_get_schema_tables(conn, DATA_SCHEMA))
-        if table not in tables:
-            raise HTTPException(status_code=404, detail=f"Unknown table: {table}")
-
-        cols = _get_table_columns(conn, DATA_SCHEMA, table)
-
-        where_sql = sql.SQL("")
-        params: list[Any] = []
-
-        # Simple "search across all columns" (CAST to text + ILIKE)
-        if search:
-            like = f"%{search}%"
-            or_parts = [
-                sql.SQL("CAST({c} AS TEXT) ILIKE %s").format(c=sql.Identifier(c))
-                for c in cols
-            ]
-            where_sql = sql.SQL("WHERE ") + sql.SQL(" OR ").join(or_parts)
-            params.extend([like] * len(cols))
-
-        # Count total
-        with conn.cursor() as cur:
-            count_q = sql.SQL("SELECT COUNT(*) FROM {s}.{t} ").format(
-                s=sql.Identifier(DATA_SCHEMA),
-                t=sql.Identifier(table),
-            ) + where_sql
-            cur.execute(count_q, params)
-            total_rows = cur.fetchone()[0]
-
-        total_pages = max(1, math.ceil(total_rows / page_size))
-        offset = (page - 1) * page_size
-
-        # Fetch page
+    """
+    One page of a core table (format=columnar for one array per column).
+
+    Pages are addressed either by page number (OFFSET) or, for tables with a
+    primary key, by the opaque next_cursor from the previous response, which
+    seeks straight to the next key range instead of skipping earlier rows.
+
+    Searches on tables with a primary key run once per (table, search, data
+    version): the ordered matching keys are cached and every page is a slice
+    of them plus a primary key lookup. Without a search, total_rows is the
+    planner's estimate unless exact_count is set (total_rows_exact says which).
+    """
+    queries, after = _table_request(table, search, cursor)
+    offset = (page - 1) * page_size
+    # Read before checking out the page's connection (it may need one of its own)
+    version = data_version.current() if search and queries.pk else None
+
+    rows = None
+    with connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            data_q = (
-                sql.SQL("SELECT * FROM {s}.{t} ").format(
-                    s=sql.Identifier(DATA_SCHEMA),
-                    t=sql.Identifier(table),
-                )
-                + where_sql
-                + sql.SQL(" ORDER BY 1 ASC LIMIT %s OFFSET %s")
-            )
-            cur.execute(data_q, params + [page_size, offset])
-            rows = cur.fetchall()
-
-        return {
-            "schema": DATA_SCHEMA,
-            "table": table,
-            "page": page,
-            "page_size": page_size,
-            "total_rows": total_rows,
-            "total_pages": total_pages,
-            "columns": cols,
-            "rows": rows,
-        }
-    finally:
-        conn.close()
+            if search and queries.pk:
+                matches = _search_matches(conn, table, search, queries, version)
+                total_rows, total_rows_exact = len(matches), True
+
+                start = offset if after is None else matches.position_after(tuple(after))
+                if start is not None:
+                    keys = matches.keys[start:start + page_size]
+                    rows = []
+                    if keys:
+                        cur.execute(*queries.rows_by_key(keys))
+                        rows = cur.fetchall()
+            else:
+                total_rows = None if (search or exact_count) else catalog.row_estimate(table)
+                total_rows_exact = total_rows is None
+
+                # Count total
+                if total_rows is None:
+                    cur.execute(*queries.count())
+                    total_rows = cur.fetchone()["count"]
+
+            # Fetch page (unless it was served from the search cache)
+            if rows is None:
+                cur.execute(*queries.page(page_size, offset, after))
+                rows = cur.fetchall()
+
+    return _table_response(
+        queries, table, None if cursor is not None else page, page_size, total_rows, total_rows_exact, rows, fmt
+    )
+
+
+# Bulk export: rows stream from a named (server-side) cursor EXPORT_FETCH_SIZE at a time
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", 2000))
+
+
+def _export_header(columns: list[str], fmt: str) -> bytes:
+    if fmt != "csv":
+        return b""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(columns)
+    return buf.getvalue().encode("utf-8")
+
+
+def _export_batch(columns: list[str], rows: list[tuple], fmt: str) -> bytes:
+    buf = io.StringIO()
+    if fmt == "csv":
+        csv.writer(buf, lineterminator="\n").writerows(rows)
+    else:
+        for row in rows:
+            # Same encoding as the JSON endpoints (NUMERIC as a number, dates as ISO strings)
+            buf.write(json.dumps(dict(zip(columns, row)), default=jsonable_encoder, separators=(",", ":")))
+            buf.write("\n")
+    return buf.getvalue().encode("utf-8")
+
+
+def _export_response(table: str, fmt: str, body) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{fmt}"'},
+    )
+
+
+def _stream_export(queries: TableQueries, fmt: str):
+    yield _export_header(queries.columns, fmt)
+
+    # The pooled connection is held until the last batch is sent (or the client goes away)
+    with connection() as conn:
+        with conn.cursor(name=f"export_{uuid.uuid4().hex}") as cur:
+            cur.itersize = EXPORT_FETCH_SIZE
+            cur.execute(*queries.all_rows())
+
+            while True:
+                rows = cur.fetchmany(EXPORT_FETCH_SIZE)
+                if not rows:
+                    break
+                yield _export_batch(queries.columns, rows, fmt)
+
+
+@app.get("/api/tables/{table}/export")
+def export_table(
+    table: str,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    search: str = Query("", max_length=200),
+) -> StreamingResponse:
+    """
+    Every row of a core table (optionally filtered by search, as in
+    /api/tables/{table}) as CSV or NDJSON, in primary key order.
+
+    Rows are read through a server-side cursor and sent in batches of
+    EXPORT_FETCH_SIZE, so memory stays flat on both ends however large the table.
+    """
+    queries, _ = _table_request(table, search, None)
+    return _export_response(table, fmt, _stream_export(queries, fmt))
+
+
+# Core analytics, pre-aggregated by infra/sql/04_analytics_views.sql
+LEADERBOARD_SQL = """
+    SELECT driver_id, driver_name, total_points
+    FROM core.mv_driver_career
+    ORDER BY total_points DESC, driver_id
+    LIMIT %s;
+"""
+
+CONSTRUCTORS_BY_YEAR_SQL = """
+    SELECT constructor_id, constructor_name, total_points
+    FROM core.mv_constructor_season_points
+    WHERE year = %s
+    ORDER BY total_points DESC, constructor_id;
+"""
+
+DRIVER_STATS_SQL = """
+    SELECT driver_id, driver_name, races, wins, podiums, total_points
+    FROM core.mv_driver_career
+    WHERE driver_id = %s;
+"""
+
+# /api/core/drivers/stats: the whole batch in one query over the career view
+TOP_DRIVERS_STATS_SQL = """
+    SELECT driver_id, driver_name, races, wins, podiums, total_points
+    FROM core.mv_driver_career
+    ORDER BY total_points DESC, driver_id
+    LIMIT %s;
+"""
+
+DRIVERS_STATS_SQL = """
+    SELECT driver_id, driver_name, races, wins, podiums, total_points
+    FROM core.mv_driver_career
+    WHERE driver_id = ANY(%s::INTEGER[])
+    ORDER BY array_position(%s::INTEGER[], driver_id);
+"""
+
+MAX_DRIVER_BATCH = 100
+
+# Optional in-memory answers for /api/core/* (ANALYTICS_ENGINE=true), reloaded per data version
+analytics = AnalyticsEngine() if os.getenv("ANALYTICS_ENGINE", "false").lower() == "true" else None
+
+
+def _analytics_snapshot() -> AnalyticsSnapshot | None:
+    """
+    The engine's snapshot for the current data version, or None to use SQL.
+    """
+    return analytics.snapshot(data_version.current()) if analytics is not None else None
+
+
+def warm_analytics() -> None:
+    """
+    Load the engine's first snapshot at startup rather than on the first request.
+    """
+    if analytics is not None:
+        try:
+            _analytics_snapshot()
+        except psycopg2.Error:
+            pass  # Database not reachable yet; the first request loads it
+
+
+@app.get("/api/health/analytics")
+def get_analytics_stats() -> dict[str, Any]:
+    return {"enabled": analytics is not None, **(analytics.stats() if analytics is not None else {})}
 
 @app.get("/api/core/leaderboard")
-def get_leaderboard(limit: int = Query(10, ge = 1, le = 50)) -> list[dict[str, Any]]:
-    conn = get_conn()
-    try:
+def get_leaderboard(request: Request, limit: int = Query(10, ge = 1, le = 50)) -> Response:
+    return _versioned_json(request, "leaderboard", (limit,), lambda: _leaderboard(limit))
+
+def _leaderboard(limit: int) -> list[dict[str, Any]]:
+    snap = _analytics_snapshot()
+    if snap is not None:
+        return snap.leaderboard(limit)
+
+    with connection() as conn:
         with conn.cursor(cursor_factory = RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT
-                    d.driver_id,
-                    d.forename || ' ' || d.surname AS driver_name,
-                    SUM(r.points) AS total_points
-                FROM core.results r
-                JOIN core.drivers d ON d.driver_id = r.driver_id
-                GROUP BY d.driver_id, driver_name
-                ORDER BY total_points DESC
-                LIMIT %s;
-                """,
-                (limit,),
-            )
+            cur.execute(LEADERBOARD_SQL, (limit,))
             return cur.fetchall()
-    finally:
-        conn.close()
 
 @app.get("/api/core/constructors")
-def get_constructors_by_year(year: int = Query(..., ge = 1950)) -> list[dict[str, Any]]:
-    conn = get_conn()
-    try:
+def get_constructors_by_year(request: Request, year: int = Query(..., ge = 1950)) -> Response:
+    return _versioned_json(request, "constructors", (year,), lambda: _constructors_by_year(year))
+
+def _constructors_by_year(year: int) -> list[dict[str, Any]]:
+    snap = _analytics_snapshot()
+    if snap is not None:
+        return snap.constructors_by_year(year)
+
+    with connection() as conn:
         with conn.cursor(cursor_factory = RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT
-                    c.constructor_id,
-                    c.name AS constructor_name,
-                    SUM(r.points) AS total_points
-                FROM core.results r
-                JOIN core.races ra ON ra.race_id = r.race_id
-                JOIN core.constructors c ON c.constructor_id = r.constructor_id
-                WHERE ra.year = %s
-                GROUP BY c.constructor_id, constructor_name
-                ORDER BY total_points DESC;
-                """,
-                (year,),
-            )
+            cur.execute(CONSTRUCTORS_BY_YEAR_SQL, (year,))
             return cur.fetchall()
-    finally:
-        conn.close()
 
-@app.get("/api/core/drivers/{driver_id}/stats")
-def get_driver_stats(driver_id: int) -> dict[str, Any]:
-    conn = get_conn()
-    try:
+def _driver_batch(ids: list[int], top: int | None) -> tuple:
+    """
+    Validated batch for /api/core/drivers/stats, also its cache params:
+    ("top", n) or ("ids", unique ids in request order).
+    """
+    if (top is None) == (not ids):
+        raise HTTPException(status_code = 400, detail = "Pass either ids or top")
+    if top is not None:
+        return ("top", top)
+
+    unique = tuple(dict.fromkeys(ids))
+    if len(unique) > MAX_DRIVER_BATCH:
+        raise HTTPException(status_code = 400, detail = f"At most {MAX_DRIVER_BATCH} driver ids per request")
+    return ("ids", unique)
+
+def _driver_batch_query(batch: tuple) -> tuple[str, tuple]:
+    kind, arg = batch
+    if kind == "top":
+        return TOP_DRIVERS_STATS_SQL, (arg,)
+    return DRIVERS_STATS_SQL, (list(arg), list(arg))
+
+@app.get("/api/core/drivers/stats")
+def get_drivers_stats(
+    request: Request,
+    ids: list[int] = Query([]),
+    top: int | None = Query(None, ge = 1, le = 50),
+) -> Response:
+    """
+    Career stats for several drivers in one response: ?ids=1&ids=20 (in that
+    order; drivers without results are left out) or ?top=N (leaderboard order).
+    """
+    batch = _driver_batch(ids, top)
+    return _versioned_json(request, "drivers_stats", batch, lambda: _drivers_stats(batch))
+
+def _drivers_stats(batch: tuple) -> list[dict[str, Any]]:
+    snap = _analytics_snapshot()
+    if snap is not None:
+        kind, arg = batch
+        return snap.top_driver_stats(arg) if kind == "top" else snap.drivers_stats(list(arg))
+
+    with connection() as conn:
         with conn.cursor(cursor_factory = RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT
-                    d.driver_id,
-                    d.forename || ' ' || d.surname AS driver_name,
-                    COUNT(*) AS races,
-                    SUM(CASE WHEN r.position = 1 THEN 1 ELSE 0 END) AS wins,
-                    SUM(CASE WHEN r.position IN (1, 2, 3) THEN 1 ELSE 0 END) AS podiums,
-                    SUM(r.points) AS total_points
-                FROM core.results r
-                JOIN core.drivers d ON d.driver_id = r.driver_id
-                WHERE d.driver_id = %s
-                GROUP BY d.driver_id, driver_name;
-                """,
-                (driver_id,),
-            )
-            row = cur.fetchone()
-            if not row:
-                raise HTTPException(status_code = 404, detail = "Driver not found")
-            return row
-    finally:
-        conn.close()
+            cur.execute(*_driver_batch_query(batch))
+            return cur.fetchall()
+
+@app.get("/api/core/drivers/{driver_id}/stats")
+def get_driver_stats(request: Request, driver_id: int) -> Response:
+    return _versioned_json(request, "driver_stats", (driver_id,), lambda: _driver_stats(driver_id))
+
+def _driver_stats(driver_id: int) -> dict[str, Any]:
+    snap = _analytics_snapshot()
+    if snap is not None:
+        row = snap.driver_stats(driver_id)
+    else:
+        with connection() as conn:
+            with conn.cursor(cursor_factory = RealDictCursor) as cur:
+                cur.execute(DRIVER_STATS_SQL, (driver_id,))
+                row = cur.fetchone()
+
+    if not row:
+        raise HTTPException(status_code = 404, detail = "Driver not found")
+    return row
@@ -0,0 +1,261 @@
+"""
+Async variant of backend.api on psycopg 3 and its async pool.
+
+Same routes, queries and caches as the sync app, but handlers are coroutines,
+so one worker keeps many database round trips in flight instead of one per
+threadpool thread. Run with `uvicorn backend.api_async:app`; `backend.api:app`
+stays available as the sync fallback.
+"""
+from __future__ import annotations
+
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from psycopg import sql
+from psycopg.rows import dict_row
+
+from backend import api
+from backend.db_async import async_connection, async_pool_stats, close_async_pool, open_async_pool
+from backend.catalog import CatalogSnapshot
+from backend.table_queries import SearchLookup, SearchMatches, TableQueries
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_async_pool()
+    await run_in_threadpool(api.warm_analytics)
+    try:
+        yield
+    finally:
+        await close_async_pool()
+
+
+app = FastAPI(title="TRNG2364 Project1 API (async)", version="0.1", lifespan=lifespan)
+
+# Dev-friendly CORS (tighten later)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=False,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+app.add_middleware(GZipMiddleware, minimum_size=api.GZIP_MINIMUM_SIZE)
+
+
+async def _catalog_snapshot() -> CatalogSnapshot:
+    """
+    The catalog snapshot a request should use from start to finish, so no
+    later lookup can find it expired and reload on the event loop.
+    """
+    snap = api.catalog.cached()
+    if snap is None:
+        # Reloads are rare (TTL / invalidation) and use the sync pool, so keep them off the loop
+        snap = await run_in_threadpool(api.catalog.snapshot)
+    return snap
+
+
+async def _data_version() -> str | None:
+    if api.data_version.is_fresh():
+        return api.data_version.current()
+    return await run_in_threadpool(api.data_version.current)
+
+
+async def _fetch_all(query, params) -> list[dict[str, Any]]:
+    async with async_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+
+async def _versioned_json(request: Request, endpoint: str, params: tuple, compute) -> Response:
+    """
+    Async counterpart of backend.api._versioned_json (shares its cache).
+    """
+    key, cached = api._cached_body(endpoint, params, await _data_version())
+    if cached is None:
+        cached = api._store_body(key, await compute())
+    return api._etag_response(request, cached)
+
+
+# In-memory stats and the catalog refresh are shared with the sync app as-is
+app.get("/api/health/response-cache")(api.get_response_cache_stats)
+app.get("/api/health/search-cache")(api.get_search_cache_stats)
+app.get("/api/catalog")(api.get_catalog_stats)
+app.get("/api/health/analytics")(api.get_analytics_stats)
+app.post("/api/catalog/refresh")(api.refresh_catalog)
+
+
+@app.get("/api/health/pool")
+async def get_pool_stats() -> dict[str, Any]:
+    return {"sync": api.pool_stats(), "async": async_pool_stats()}
+
+
+@app.get("/api/tables")
+async def list_tables() -> dict[str, Any]:
+    return {"schema": api.DATA_SCHEMA, "tables": (await _catalog_snapshot()).tables}
+
+
+async def _search_matches(cur, table: str, search: str, queries: TableQueries, version: str | None) -> SearchMatches:
+    lookup = SearchLookup(api.search_cache, api.DATA_SCHEMA, table, search, version)
+    await cur.execute(*lookup.storage_query())
+    row = await cur.fetchone()
+    matches = lookup.cached(row["relfilenode"] if row else None)
+    if matches is None:
+        await cur.execute(*queries.matching_keys())
+        matches = lookup.store([tuple(r.values()) for r in await cur.fetchall()])
+
+    return matches
+
+
+@app.get("/api/tables/{table}")
+async def get_table_data(
+    table: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(25, ge=1, le=200),
+    search: str = Query("", max_length=200),
+    cursor: str | None = Query(None, max_length=1000),
+    exact_count: bool = Query(False),
+    fmt: str = Query("rows", alias="format", pattern="^(rows|columnar)$"),
+) -> dict[str, Any]:
+    """
+    Async counterpart of backend.api.get_table_data (same parameters and response).
+    """
+    snap = await _catalog_snapshot()
+    queries, after = api._table_request(table, search, cursor, sql, snap)
+    offset = (page - 1) * page_size
+    version = await _data_version() if search and queries.pk else None
+
+    rows = None
+    async with async_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            if search and queries.pk:
+                matches = await _search_matches(cur, table, search, queries, version)
+                total_rows, total_rows_exact = len(matches), True
+
+                start = offset if after is None else matches.position_after(tuple(after))
+                if start is not None:
+                    keys = matches.keys[start:start + page_size]
+                    rows = []
+                    if keys:
+                        await cur.execute(*queries.rows_by_key(keys))
+                        rows = await cur.fetchall()
+            else:
+                total_rows = None if (search or exact_count) else snap.row_estimates.get(table)
+                total_rows_exact = total_rows is None
+
+                if total_rows is None:
+                    await cur.execute(*queries.count())
+                    total_rows = (await cur.fetchone())["count"]
+
+            if rows is None:
+                await cur.execute(*queries.page(page_size, offset, after))
+                rows = await cur.fetchall()
+
+    return api._table_response(
+        queries, table, None if cursor is not None else page, page_size, total_rows, total_rows_exact, rows, fmt
+    )
+
+
+async def _stream_export(queries: TableQueries, fmt: str):
+    yield api._export_header(queries.columns, fmt)
+
+    async with async_connection() as conn:
+        # Server-side cursors need a transaction (pool connections are autocommit)
+        async with conn.transaction():
+            async with conn.cursor(name=f"export_{uuid.uuid4().hex}") as cur:
+                cur.itersize = api.EXPORT_FETCH_SIZE
+                await cur.execute(*queries.all_rows())
+
+                while True:
+                    rows = await cur.fetchmany(api.EXPORT_FETCH_SIZE)
+                    if not rows:
+                        break
+                    yield api._export_batch(queries.columns, rows, fmt)
+
+
+@app.get("/api/tables/{table}/export")
+async def export_table(
+    table: str,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    search: str = Query("", max_length=200),
+) -> StreamingResponse:
+    """
+    Async counterpart of backend.api.export_table.
+    """
+    queries, _ = api._table_request(table, search, None, sql, await _catalog_snapshot())
+    return api._export_response(table, fmt, _stream_export(queries, fmt))
+
+
+async def _analytics_snapshot() -> api.AnalyticsSnapshot | None:
+    if api.analytics is None:
+        return None
+
+    # A reload reads the core tables over the sync pool, so keep it off the loop
+    version = await _data_version()
+    if api.analytics.is_current(version):
+        return api.analytics.snapshot(version)
+    return await run_in_threadpool(api.analytics.snapshot, version)
+
+
+@app.get("/api/core/leaderboard")
+async def get_leaderboard(request: Request, limit: int = Query(10, ge = 1, le = 50)) -> Response:
+    async def compute() -> list[dict[str, Any]]:
+        snap = await _analytics_snapshot()
+        if snap is not None:
+            return snap.leaderboard(limit)
+        return await _fetch_all(api.LEADERBOARD_SQL, (limit,))
+
+    return await _versioned_json(request, "leaderboard", (limit,), compute)
+
+@app.get("/api/core/constructors")
+async def get_constructors_by_year(request: Request, year: int = Query(..., ge = 1950)) -> Response:
+    async def compute() -> list[dict[str, Any]]:
+        snap = await _analytics_snapshot()
+        if snap is not None:
+            return snap.constructors_by_year(year)
+        return await _fetch_all(api.CONSTRUCTORS_BY_YEAR_SQL, (year,))
+
+    return await _versioned_json(request, "constructors", (year,), compute)
+
+@app.get("/api/core/drivers/stats")
+async def get_drivers_stats(
+    request: Request,
+    ids: list[int] = Query([]),
+    top: int | None = Query(None, ge = 1, le = 50),
+) -> Response:
+    """
+    Async counterpart of backend.api.get_drivers_stats.
+    """
+    batch = api._driver_batch(ids, top)
+
+    async def compute() -> list[dict[str, Any]]:
+        snap = await _analytics_snapshot()
+        if snap is not None:
+            kind, arg = batch
+            return snap.top_driver_stats(arg) if kind == "top" else snap.drivers_stats(list(arg))
+        return await _fetch_all(*api._driver_batch_query(batch))
+
+    return await _versioned_json(request, "drivers_stats", batch, compute)
+
+@app.get("/api/core/drivers/{driver_id}/stats")
+async def get_driver_stats(request: Request, driver_id: int) -> Response:
+    async def compute() -> dict[str, Any]:
+        snap = await _analytics_snapshot()
+        if snap is not None:
+            row = snap.driver_stats(driver_id)
+        else:
+            rows = await _fetch_all(api.DRIVER_STATS_SQL, (driver_id,))
+            row = rows[0] if rows else None
+        if row is None:
+            raise HTTPException(status_code = 404, detail = "Driver not found")
+        return row
+
+    return await _versioned_json(request, "driver_stats", (driver_id,), compute)
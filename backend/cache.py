@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by entry count and by total weight
+    (weigh(value), e.g. number of keys or bytes). Values heavier than
+    max_weight on their own are not cached.
+    """
+
+    def __init__(self, max_entries: int = 256, max_weight: int | None = None, weigh: Callable[[Any], int] = len):
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._weigh = weigh
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        weight = self._weigh(value)
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._weight -= old[1]
+
+            self._data[key] = (value, weight)
+            self._weight += weight
+
+            while self._data and (
+                len(self._data) > self.max_entries
+                or (self.max_weight is not None and self._weight > self.max_weight)
+            ):
+                _, (_, evicted_weight) = self._data.popitem(last=False)
+                self._weight -= evicted_weight
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "weight": self._weight,
+                "max_weight": self.max_weight,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
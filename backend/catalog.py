@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+from backend.data_version import DataVersion
+from backend.db import connection
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Tables, their columns (in ordinal order), primary key columns and planner
+    row estimates (pg_class.reltuples) for one schema, as loaded at loaded_at
+    under data_version. Partitions are left out; a partitioned table is listed
+    once, under its own name.
+    """
+    tables: list[str]
+    columns: dict[str, list[str]]
+    primary_keys: dict[str, list[str]] = field(default_factory=dict)
+    row_estimates: dict[str, int] = field(default_factory=dict)
+    data_version: str | None = None
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+class SchemaCatalog:
+    """
+    In-process cache of a schema's tables and columns.
+
+    The snapshot is reloaded with three catalog queries when it is older
+    than ttl seconds, after invalidate(), or, given a DataVersion, once a
+    new ingestion run is recorded (so every API process notices, not only
+    the one that ran the ingestion); otherwise lookups never touch the DB.
+    """
+
+    def __init__(self, schema: str, ttl: float = 300.0, data_version: DataVersion | None = None):
+        self.schema = schema
+        self.ttl = ttl
+        self.data_version = data_version
+        self._snapshot: CatalogSnapshot | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _current_version(self) -> str | None:
+        return self.data_version.current() if self.data_version is not None else None
+
+    def _is_current(self, snap: CatalogSnapshot | None, version: str | None) -> bool:
+        return (
+            snap is not None
+            and time.monotonic() - snap.loaded_at < self.ttl
+            and snap.data_version == version
+        )
+
+    def cached(self) -> CatalogSnapshot | None:
+        """
+        The snapshot if it is current, else None; never reloads or touches the
+        DB (for the async app, which must not block its event loop).
+        """
+        if self.data_version is not None and not self.data_version.is_fresh():
+            return None
+        snap = self._snapshot
+        return snap if self._is_current(snap, self._current_version()) else None
+
+    def is_fresh(self) -> bool:
+        """
+        True if lookups would be served from memory without a reload.
+        """
+        return self.cached() is not None
+
+    def snapshot(self, conn=None) -> CatalogSnapshot:
+        """
+        Return the cached snapshot, refreshing it if stale. conn is only used
+        on a refresh; without one, a pooled connection is checked out.
+        """
+        # Read before loading: a run landing mid-load leaves the snapshot stale, not wrong
+        version = self._current_version()
+        snap = self._snapshot
+        if self._is_current(snap, version):
+            self.hits += 1
+            return snap
+
+        # One thread refreshes; the others wait and reuse its result
+        with self._lock:
+            snap = self._snapshot
+            if self._is_current(snap, version):
+                self.hits += 1
+                return snap
+
+            self.misses += 1
+            if conn is not None:
+                snap = self._load(conn, version)
+            else:
+                with connection() as pooled:
+                    snap = self._load(pooled, version)
+
+            self._snapshot = snap
+            return snap
+
+    def tables(self, conn=None) -> list[str]:
+        return self.snapshot(conn).tables
+
+    def columns(self, table: str, conn=None) -> list[str] | None:
+        """
+        Columns of table, or None if the table is not in the schema.
+        """
+        return self.snapshot(conn).columns.get(table)
+
+    def primary_key(self, table: str, conn=None) -> list[str]:
+        """
+        Primary key columns of table in key order ([] if it has none).
+        """
+        return self.snapshot(conn).primary_keys.get(table, [])
+
+    def row_estimate(self, table: str, conn=None) -> int | None:
+        """
+        Planner estimate of the table's row count, or None if it has never
+        been analyzed (callers should count exactly instead).
+        """
+        return self.snapshot(conn).row_estimates.get(table)
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        return {
+            "schema": self.schema,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "tables": len(snap.tables) if snap else 0,
+            "data_version": snap.data_version if snap else None,
+            "age_seconds": round(time.monotonic() - snap.loaded_at, 3) if snap else None,
+        }
+
+    def _load(self, conn, version: str | None) -> CatalogSnapshot:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT c.table_name, c.column_name
+                FROM information_schema.columns c
+                JOIN information_schema.tables t
+                  ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+                JOIN pg_class pc
+                  ON pc.oid = format('%%I.%%I', c.table_schema, c.table_name)::regclass
+                WHERE c.table_schema = %s AND t.table_type = 'BASE TABLE' AND NOT pc.relispartition
+                ORDER BY c.table_name, c.ordinal_position
+                """,
+                (self.schema,),
+            )
+            rows = cur.fetchall()
+
+            cur.execute(
+                """
+                SELECT kcu.table_name, kcu.column_name
+                FROM information_schema.table_constraints tc
+                JOIN information_schema.key_column_usage kcu
+                  ON kcu.constraint_schema = tc.constraint_schema
+                 AND kcu.constraint_name = tc.constraint_name
+                WHERE tc.table_schema = %s AND tc.constraint_type = 'PRIMARY KEY'
+                ORDER BY kcu.table_name, kcu.ordinal_position
+                """,
+                (self.schema,),
+            )
+            pk_rows = cur.fetchall()
+
+            cur.execute(
+                """
+                SELECT c.relname,
+                       CASE WHEN c.relkind = 'p' THEN (
+                         -- A partitioned table's estimate is its partitions' (unknown if any is unanalyzed)
+                         SELECT CASE WHEN bool_or(p.reltuples < 0) THEN -1 ELSE SUM(p.reltuples) END
+                         FROM pg_inherits i
+                         JOIN pg_class p ON p.oid = i.inhrelid
+                         WHERE i.inhparent = c.oid
+                       ) ELSE c.reltuples END::BIGINT
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = %s AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+                """,
+                (self.schema,),
+            )
+            estimate_rows = cur.fetchall()
+
+        columns: dict[str, list[str]] = {}
+        for table, column in rows:
+            columns.setdefault(table, []).append(column)
+
+        primary_keys: dict[str, list[str]] = {}
+        for table, column in pk_rows:
+            primary_keys.setdefault(table, []).append(column)
+
+        # reltuples is -1 (or 0) until the table has been vacuumed/analyzed
+        row_estimates = {table: int(n) for table, n in estimate_rows if n and n > 0}
+
+        return CatalogSnapshot(
+            tables=sorted(columns),
+            columns=columns,
+            primary_keys=primary_keys,
+            row_estimates=row_estimates,
+            data_version=version,
+        )
+
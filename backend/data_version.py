@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime
+
+import psycopg2
+
+from backend.db import connection
+
+INGESTION_RUNS_TABLE = "meta.ingestion_runs"
+
+
+def record_ingestion_run(conn, started_at: datetime, datasets: dict, full_refresh: bool = False) -> int | None:
+    """
+    Insert a row into meta.ingestion_runs (infra/sql/05_metadata.sql) and return
+    its run_id, the new data version. Returns None if the table does not exist.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s)", (INGESTION_RUNS_TABLE,))
+        if cur.fetchone()[0] is None:
+            return None
+
+        cur.execute(
+            """
+            INSERT INTO meta.ingestion_runs (started_at, full_refresh, datasets)
+            VALUES (%s, %s, %s)
+            RETURNING run_id
+            """,
+            (started_at, full_refresh, json.dumps(datasets, default = str)),
+        )
+        run_id = cur.fetchone()[0]
+
+    conn.commit()
+    return run_id
+
+
+class DataVersion:
+    """
+    Latest ingestion run_id, re-read at most once every ttl seconds.
+
+    current() is None when meta.ingestion_runs does not exist (or is
+    unreadable), in which case callers should not cache by version.
+    """
+
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._value: str | None = None
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        """
+        True if current() would return without querying the database.
+        """
+        loaded_at = self._loaded_at
+        return loaded_at is not None and time.monotonic() - loaded_at < self.ttl
+
+    def current(self) -> str | None:
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < self.ttl:
+            return self._value
+
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return self._value
+
+            self._value = self._load()
+            self._loaded_at = time.monotonic()
+            return self._value
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    @staticmethod
+    def _load() -> str | None:
+        try:
+            with connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT to_regclass(%s)", (INGESTION_RUNS_TABLE,))
+                    if cur.fetchone()[0] is None:
+                        return None
+
+                    cur.execute("SELECT COALESCE(MAX(run_id), 0) FROM meta.ingestion_runs")
+                    return str(cur.fetchone()[0])
+        except psycopg2.Error:
+            return None
@@ -1,5 +1,10 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
+
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,3 +20,303 @@ def get_conn():
         user=os.getenv("PGUSER"),
         password=os.getenv("PGPASSWORD"),
     )
+
+
+class PoolTimeout(RuntimeError):
+    """
+    Raised when no connection could be checked out before checkout_timeout.
+    """
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    - open() fills the pool to min_size up front; otherwise connections are
+      opened on demand.
+    - Idle connections are reused LIFO; ones idle longer than idle_timeout are
+      closed, but never below min_size.
+    - On checkout, closed connections are dropped, and connections idle for more
+      than ping_after seconds are checked with SELECT 1 before being handed out.
+    - On return, any open transaction is rolled back; broken connections are discarded.
+    - When max_size connections are in use, callers wait up to checkout_timeout.
+    """
+
+    def __init__(
+            self,
+            connect = get_conn,
+            min_size: int = 1,
+            max_size: int = 10,
+            idle_timeout: float = 300.0,
+            checkout_timeout: float = 30.0,
+            ping_after: float = 5.0
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.ping_after = ping_after
+
+        self._cond = threading.Condition()
+        self._idle: list[tuple] = []  # (conn, idle_since)
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._wait_seconds = 0.0
+
+    def open(self) -> None:
+        """
+        Open connections until the pool holds min_size (idle or in use).
+        """
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+
+            with self._cond:
+                self._created += 1
+                if not self._closed:
+                    self._idle.append((conn, time.monotonic()))
+                    self._cond.notify()
+                    continue
+                self._size -= 1
+
+            self._close_quietly(conn)
+
+    def getconn(self):
+        """
+        Check out a healthy connection, opening a new one if the pool has room.
+        """
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+
+        while True:
+            create = False
+
+            # Expired connections are taken out under the lock but closed outside it
+            with self._cond:
+                expired = self._pop_expired_locked()
+            for stale in expired:
+                self._close_quietly(stale)
+
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                    self._in_use += 1
+                elif self._size < self.max_size:
+                    self._size += 1
+                    self._in_use += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(f"No connection available within {self.checkout_timeout}s")
+
+                    self._waiting += 1
+                    self._cond.wait(remaining)
+                    self._waiting -= 1
+                    continue
+
+            # Connect / health check outside the lock so other threads aren't blocked on I/O
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    self._release_slot(discarded = False)
+                    raise
+
+                with self._cond:
+                    self._created += 1
+            elif not self._is_healthy(conn, idle_since):
+                self._close_quietly(conn)
+                self._release_slot(discarded = True)
+                continue
+
+            with self._cond:
+                self._checkouts += 1
+                self._wait_seconds += time.monotonic() - started
+
+            return conn
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """
+        Return a connection to the pool (or close it if discard or broken).
+        """
+        if not discard:
+            try:
+                if conn.closed:
+                    discard = True
+                elif conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                self._in_use -= 1
+                self._discarded += 1
+            else:
+                self._in_use -= 1
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+
+            self._cond.notify()
+
+        if conn is not None:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that checks out a connection and always returns it.
+        Uncommitted work is rolled back on return.
+        """
+        conn = self.getconn()
+        try:
+            yield conn
+        except psycopg2.OperationalError:
+            self.putconn(conn, discard = True)
+            raise
+        except BaseException:
+            self.putconn(conn)
+            raise
+        else:
+            self.putconn(conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": (self._wait_seconds / self._checkouts * 1000) if self._checkouts else 0.0,
+            }
+
+    def closeall(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def _pop_expired_locked(self) -> list:
+        # Oldest idle connections sit at the front of the list
+        now = time.monotonic()
+        expired = []
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.pop(0)
+            self._size -= 1
+            self._discarded += 1
+            expired.append(conn)
+        return expired
+
+    def _release_slot(self, discarded: bool) -> None:
+        with self._cond:
+            self._size -= 1
+            self._in_use -= 1
+            if discarded:
+                self._discarded += 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+
+        if time.monotonic() - idle_since < self.ping_after:
+            return True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pool: ConnectionPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Return the process-wide pool, created on first use from PGPOOL_* environment
+    variables. A forked child (e.g. an ingestion worker) gets its own pool.
+    """
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(
+                min_size=int(os.getenv("PGPOOL_MIN_SIZE", 1)),
+                max_size=int(os.getenv("PGPOOL_MAX_SIZE", 10)),
+                idle_timeout=float(os.getenv("PGPOOL_IDLE_TIMEOUT", 300)),
+                checkout_timeout=float(os.getenv("PGPOOL_CHECKOUT_TIMEOUT", 30)),
+                ping_after=float(os.getenv("PGPOOL_PING_AFTER", 5)),
+            )
+            _pool_pid = os.getpid()
+
+            # Warm up to PGPOOL_MIN_SIZE; if the database is down, checkouts connect (and fail) as needed
+            try:
+                _pool.open()
+            except psycopg2.Error:
+                pass
+
+        return _pool
+
+
+@contextmanager
+def connection():
+    """
+    Check out a pooled connection: `with connection() as conn: ...`
+    """
+    with get_pool().connection() as conn:
+        yield conn
+
+
+def pool_stats() -> dict:
+    return get_pool().stats()
@@ -0,0 +1,73 @@
+import os
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+from psycopg_pool import AsyncConnectionPool
+
+load_dotenv()
+
+_pool: AsyncConnectionPool | None = None
+
+
+def _conn_kwargs() -> dict:
+    # Same PG* environment variables as backend.db.get_conn()
+    return {
+        "host": os.getenv("PGHOST"),
+        "port": int(os.getenv("PGPORT")),
+        "dbname": os.getenv("PGDATABASE"),
+        "user": os.getenv("PGUSER"),
+        "password": os.getenv("PGPASSWORD"),
+        "autocommit": True,
+    }
+
+
+async def open_async_pool() -> AsyncConnectionPool:
+    """
+    Open the process-wide psycopg 3 async pool, sized from the same PGPOOL_*
+    variables as the sync pool (PGPOOL_ASYNC_MAX_SIZE overrides the maximum,
+    since one event loop can keep many more queries in flight than a threadpool).
+    Must be called from the event loop that will use it, e.g. in an app lifespan.
+
+    Returns without waiting for the first connections, so the app starts even
+    while the database is down; the pool keeps reconnecting in the background
+    and requests fail with PoolTimeout until it is back.
+    """
+    global _pool
+
+    if _pool is None:
+        pool = AsyncConnectionPool(
+            kwargs=_conn_kwargs(),
+            min_size=int(os.getenv("PGPOOL_MIN_SIZE", 1)),
+            max_size=int(os.getenv("PGPOOL_ASYNC_MAX_SIZE", os.getenv("PGPOOL_MAX_SIZE", 10))),
+            max_idle=float(os.getenv("PGPOOL_IDLE_TIMEOUT", 300)),
+            timeout=float(os.getenv("PGPOOL_CHECKOUT_TIMEOUT", 30)),
+            open=False,
+        )
+        await pool.open(wait=False)
+        _pool = pool
+
+    return _pool
+
+
+async def close_async_pool() -> None:
+    global _pool
+
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+@asynccontextmanager
+async def async_connection():
+    """
+    Check out a pooled async connection: `async with async_connection() as conn: ...`
+    """
+    if _pool is None:
+        raise RuntimeError("Async connection pool is not open; call open_async_pool() first")
+
+    async with _pool.connection() as conn:
+        yield conn
+
+
+def async_pool_stats() -> dict:
+    return _pool.get_stats() if _pool is not None else {}
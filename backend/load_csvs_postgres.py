@@ -1,9 +1,38 @@
+import re
+import tempfile
+
 import pandas as pd
 import numpy as np
+from psycopg2 import sql
 from psycopg2.extensions import connection as PgConnection
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values
 from typing import Sequence, List
 
+# Marker written for missing values in COPY payloads (same as the raw Ergast files)
+COPY_NULL = r"\N"
+
+# Chunks larger than this spill from memory to a temp file while being streamed
+COPY_SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+# load_mode "swap": rows are loaded into <table>__shadow, then renamed over the table
+SHADOW_SUFFIX = "__shadow"
+
+# How long the swap waits for readers of the old table before giving up
+SWAP_LOCK_TIMEOUT = "10s"
+
+_INDEXDEF = re.compile(r"^(CREATE (?:UNIQUE )?INDEX )(\S+)( ON (?:ONLY )?)(\S+)( .*)$")
+
+
+def _truncate_table(conn: PgConnection, table_name: str, commit: bool = True) -> None:
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"TRUNCATE TABLE {table_name}")
+        if commit:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
 
 def load_dataframe_to_postgres(
         df: pd.DataFrame,
@@ -11,12 +40,19 @@ def load_dataframe_to_postgres(
         table_name: str,
         columns: Sequence[str],
         page_size: int = 100,
-        truncate_first: bool = False
+        truncate_first: bool = False,
+        commit: bool = True
 ) -> int:
     """
     Load a DataFrame inot a PostgreSQL table using batch inserts.
+
+    With commit=False the rows are left in the connection's open transaction,
+    for the caller to commit (on error, it is rolled back either way).
     """
     if df is None or df.empty:
+        # Still a reload: the table must not keep the previous run's rows
+        if truncate_first:
+            _truncate_table(conn, table_name, commit)
         return 0
     
     # Converting NaN/NaT to Python None so psycopg2 inserts NULLs
@@ -41,9 +77,237 @@ def load_dataframe_to_postgres(
             
             execute_batch(cur, insert_sql, records, page_size = page_size)
         
-        conn.commit()
+        if commit:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return len(records)
+
+
+def _prepare_copy_frame(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Select the DB columns and turn float columns that only hold whole numbers
+    back into nullable ints, so INTEGER columns don't receive values like "1.0".
+    """
+    out = df[list(columns)]
+
+    for col in out.columns:
+        series = out[col]
+        if not pd.api.types.is_float_dtype(series):
+            continue
+
+        non_null = series.dropna()
+        if non_null.empty or (non_null == np.floor(non_null)).all():
+            out = out.assign(**{col: series.astype("Int64")})
+
+    return out
+
+
+def copy_dataframe_to_postgres(
+        df: pd.DataFrame,
+        conn: PgConnection,
+        table_name: str,
+        columns: Sequence[str],
+        chunk_size: int = 50000,
+        truncate_first: bool = False,
+        commit: bool = True
+) -> int:
+    """
+    Load a DataFrame into a PostgreSQL table using COPY FROM STDIN.
+
+    Rows are serialized as CSV in chunks of chunk_size through a spooled buffer,
+    so only one chunk is held as text at a time. Missing values are sent as NULL.
+    With commit=False the rows are left in the connection's open transaction.
+    """
+    if df is None or df.empty:
+        if truncate_first:
+            _truncate_table(conn, table_name, commit)
+        return 0
+
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"DataFrame missing required DB columns: {missing}")
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    col_list = ", ".join(columns)
+    copy_sql = f"COPY {table_name} ({col_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+
+    frame = _prepare_copy_frame(df, columns)
+
+    try:
+        with conn.cursor() as cur:
+            if truncate_first:
+                cur.execute(f"TRUNCATE TABLE {table_name}")
+
+            for start in range(0, len(frame), chunk_size):
+                chunk = frame.iloc[start:start + chunk_size]
+
+                with tempfile.SpooledTemporaryFile(
+                    max_size = COPY_SPOOL_MAX_BYTES, mode = "w+", encoding = "utf-8", newline = ""
+                ) as buf:
+                    chunk.to_csv(buf, header = False, index = False, na_rep = COPY_NULL)
+                    buf.seek(0)
+                    cur.copy_expert(copy_sql, buf)
+
+        if commit:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return len(frame)
+
+
+def upsert_dataframe_to_postgres(
+        df: pd.DataFrame,
+        conn: PgConnection,
+        table_name: str,
+        columns: Sequence[str],
+        key_columns: Sequence[str],
+        page_size: int = 1000,
+        commit: bool = True
+) -> int:
+    """
+    Insert or update rows with INSERT ... ON CONFLICT (key_columns) DO UPDATE.
+    Used by incremental ingestion to write only new or modified rows.
+    With commit=False the rows are left in the connection's open transaction.
+    """
+    if df is None or df.empty:
+        return 0
+
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"DataFrame missing required DB columns: {missing}")
+
+    missing_keys = [c for c in key_columns if c not in columns]
+    if missing_keys:
+        raise ValueError(f"Key columns must be part of the DB columns: {missing_keys}")
+
+    col_list = ", ".join(columns)
+    key_list = ", ".join(key_columns)
+    update_columns = [c for c in columns if c not in key_columns]
+
+    if update_columns:
+        set_list = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)
+        conflict_sql = f"ON CONFLICT ({key_list}) DO UPDATE SET {set_list}"
+    else:
+        conflict_sql = f"ON CONFLICT ({key_list}) DO NOTHING"
+
+    upsert_sql = f"INSERT INTO {table_name} ({col_list}) VALUES %s {conflict_sql}"
+
+    # Converting NaN/NaT to Python None so psycopg2 inserts NULLs
+    frame = _prepare_copy_frame(df, columns).astype(object)
+    frame = frame.where(frame.notna(), None)
+    records: List[tuple] = list(frame.itertuples(index = False, name = None))
+
+    try:
+        with conn.cursor() as cur:
+            execute_values(cur, upsert_sql, records, page_size = page_size)
+
+        if commit:
+            conn.commit()
     except Exception:
         conn.rollback()
         raise
 
     return len(records)
+
+
+def create_shadow_table(conn: PgConnection, table_name: str) -> str:
+    """
+    Create an empty UNLOGGED copy of table_name's columns and defaults, with no
+    indexes or constraints, for a bulk load (replacing any leftover one).
+    Returns the shadow table's name.
+    """
+    shadow = f"{table_name}{SHADOW_SUFFIX}"
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {shadow}")
+            cur.execute(f"CREATE UNLOGGED TABLE {shadow} (LIKE {table_name} INCLUDING DEFAULTS)")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return shadow
+
+
+def swap_in_shadow_table(conn: PgConnection, table_name: str, shadow: str) -> None:
+    """
+    Replace table_name with its loaded shadow table.
+
+    The shadow is made durable (SET LOGGED, one sequential WAL write instead of
+    one per row), then gets table_name's indexes, primary/unique keys and grants,
+    all built while readers still use the old table. The swap itself is one
+    short transaction (drop the old table, rename the shadow and its indexes),
+    so readers see either the old rows or the new ones and never a partial load.
+    """
+    schema = table_name.rpartition(".")[0] or "public"
+    name = table_name.rpartition(".")[2]
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"ALTER TABLE {shadow} SET LOGGED")
+
+            cur.execute(
+                """
+                SELECT i.relname, pg_get_indexdef(x.indexrelid), c.contype
+                FROM pg_index x
+                JOIN pg_class i ON i.oid = x.indexrelid
+                LEFT JOIN pg_constraint c ON c.conindid = x.indexrelid AND c.conrelid = x.indrelid
+                WHERE x.indrelid = %s::regclass
+                """,
+                (table_name,)
+            )
+            indexes = cur.fetchall()
+
+            for index_name, indexdef, contype in indexes:
+                match = _INDEXDEF.match(indexdef)
+                if match is None:
+                    raise ValueError(f"Cannot rebuild index {index_name} on {shadow}: {indexdef}")
+                cur.execute(
+                    match.group(1) + f"{index_name}{SHADOW_SUFFIX}" + match.group(3) + shadow + match.group(5)
+                )
+                if contype in ("p", "u"):
+                    kind = "PRIMARY KEY" if contype == "p" else "UNIQUE"
+                    cur.execute(
+                        f"ALTER TABLE {shadow} ADD CONSTRAINT {index_name}{SHADOW_SUFFIX} "
+                        f"{kind} USING INDEX {index_name}{SHADOW_SUFFIX}"
+                    )
+
+            cur.execute(
+                """
+                SELECT grantee, string_agg(privilege_type, ', ')
+                FROM information_schema.role_table_grants
+                WHERE table_schema = %s AND table_name = %s AND grantee <> current_user
+                GROUP BY grantee
+                """,
+                (schema, name)
+            )
+            for grantee, privileges in cur.fetchall():
+                cur.execute(
+                    sql.SQL("GRANT {} ON {} TO {}").format(
+                        sql.SQL(privileges),
+                        sql.SQL(shadow),
+                        sql.SQL("PUBLIC") if grantee == "PUBLIC" else sql.Identifier(grantee)
+                    )
+                )
+
+            cur.execute(f"ANALYZE {shadow}")
+        conn.commit()
+
+        with conn.cursor() as cur:
+            cur.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+            cur.execute(f"DROP TABLE {table_name}")
+            cur.execute(f"ALTER TABLE {shadow} RENAME TO {name}")
+            for index_name, _, _ in indexes:
+                cur.execute(f"ALTER INDEX {schema}.{index_name}{SHADOW_SUFFIX} RENAME TO {index_name}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from types import ModuleType
+from typing import Any
+
+# Storage of a table: relfilenode changes on TRUNCATE, and a partitioned table
+# lists its partitions' (a partition swapped in by core.reload_season shows up
+# as a new relfilenode). Read from pg_class, so it is transactional; the search
+# cache pairs it with the ingestion data version.
+TABLE_STORAGE_SQL = """
+    SELECT string_agg(c.relfilenode::TEXT, ',' ORDER BY c.oid) AS relfilenode
+    FROM pg_partition_tree(to_regclass(format('%%I.%%I', %s::TEXT, %s::TEXT))) t
+    JOIN pg_class c ON c.oid = t.relid
+    HAVING COUNT(*) > 0
+"""
+
+
+class SearchMatches:
+    """
+    Primary keys of every row matching a search, in primary key order.
+    """
+
+    def __init__(self, keys: list[tuple]):
+        self.keys = keys
+        self._positions: dict[tuple, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def position_after(self, key: tuple) -> int | None:
+        """
+        Index just past key, or None if key is not among the matches.
+        """
+        if self._positions is None:
+            self._positions = {k: i for i, k in enumerate(self.keys)}
+        i = self._positions.get(key)
+        return None if i is None else i + 1
+
+
+class SearchLookup:
+    """
+    A search's matches through the search cache, cached per data version (a
+    new ingestion run) and table storage (a TRUNCATE or swapped-in partition).
+    Without a data version nothing is cached, as for the response cache.
+
+    The sync and async endpoints only differ in how they run the queries:
+
+        cur.execute(*lookup.storage_query())
+        matches = lookup.cached(<the row's relfilenode, or None>)
+        if matches is None:
+            cur.execute(*queries.matching_keys())
+            matches = lookup.store(<the rows as tuples>)
+    """
+
+    def __init__(self, cache: Any, schema: str, table: str, search: str, version: str | None):
+        self.cache = cache
+        self.schema = schema
+        self.table = table
+        self.search = search
+        self.version = version
+        self._key: tuple | None = None
+
+    def storage_query(self) -> tuple[str, tuple[str, str]]:
+        return TABLE_STORAGE_SQL, (self.schema, self.table)
+
+    def cached(self, storage: str | None) -> SearchMatches | None:
+        self._key = (self.table, self.search, self.version, storage or "")
+        return self.cache.get(self._key) if self.version is not None else None
+
+    def store(self, rows: list[tuple]) -> SearchMatches:
+        matches = SearchMatches(rows)
+        if self.version is not None:
+            self.cache.put(self._key, matches)
+        return matches
+
+
+class TableQueries:
+    """
+    Builds the /api/tables/{table} queries for one request.
+
+    sql is the driver's sql module (psycopg2.sql or psycopg.sql, which share
+    the same API), so the sync and async endpoints run identical statements.
+    Each method returns (query, params).
+    """
+
+    def __init__(
+            self,
+            sql: ModuleType,
+            schema: str,
+            table: str,
+            columns: list[str],
+            pk: list[str],
+            search: str = "",
+            search_doc_column: str | None = None
+    ):
+        self.sql = sql
+        self.columns = columns
+        self.pk = pk
+        self._table = sql.SQL("{}.{}").format(sql.Identifier(schema), sql.Identifier(table))
+        self._pk = sql.SQL(", ").join(sql.Identifier(c) for c in pk)
+        self._cols = sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+
+        self.conditions: list[Any] = []
+        self.params: list[Any] = []
+
+        # Simple "search across all columns" (CAST to text + ILIKE)
+        if search:
+            like = f"%{search}%"
+
+            # The trigram index on search_doc finds candidate rows; the per-column
+            # check below keeps the exact same matches as before
+            if search_doc_column:
+                self.conditions.append(sql.SQL("{} ILIKE %s").format(sql.Identifier(search_doc_column)))
+                self.params.append(like)
+
+            or_parts = [
+                sql.SQL("CAST({c} AS TEXT) ILIKE %s").format(c=sql.Identifier(c))
+                for c in columns
+            ]
+            self.conditions.append(sql.SQL("(") + sql.SQL(" OR ").join(or_parts) + sql.SQL(")"))
+            self.params.extend([like] * len(columns))
+
+    def _where(self, conditions: list[Any]):
+        sql = self.sql
+        return sql.SQL(" WHERE ") + sql.SQL(" AND ").join(conditions) if conditions else sql.SQL("")
+
+    def count(self) -> tuple[Any, list[Any]]:
+        sql = self.sql
+        return sql.SQL("SELECT COUNT(*) FROM {}").format(self._table) + self._where(self.conditions), self.params
+
+    def matching_keys(self) -> tuple[Any, list[Any]]:
+        """
+        Primary keys of all matching rows, in key order.
+        """
+        sql = self.sql
+        query = (
+            sql.SQL("SELECT {} FROM {}").format(self._pk, self._table)
+            + self._where(self.conditions)
+            + sql.SQL(" ORDER BY {}").format(self._pk)
+        )
+        return query, self.params
+
+    def rows_by_key(self, keys: list[tuple]) -> tuple[Any, list[Any]]:
+        """
+        Rows whose primary key is in keys, in key order.
+        """
+        sql = self.sql
+        if len(self.pk) == 1:
+            key_filter = sql.SQL("{} = ANY(%s)").format(sql.Identifier(self.pk[0]))
+            params: list[Any] = [[k[0] for k in keys]]
+        else:
+            values = sql.SQL(", ").join(
+                sql.SQL("({})").format(sql.SQL(", ").join(sql.Placeholder() * len(self.pk))) for _ in keys
+            )
+            key_filter = sql.SQL("({}) IN (VALUES {})").format(self._pk, values)
+            params = [v for k in keys for v in k]
+
+        query = sql.SQL("SELECT {} FROM {} WHERE {} ORDER BY {}").format(self._cols, self._table, key_filter, self._pk)
+        return query, params
+
+    def all_rows(self) -> tuple[Any, list[Any]]:
+        """
+        Every matching row in primary key order (for streaming through a server-side cursor).
+        """
+        sql = self.sql
+        order_sql = sql.SQL(" ORDER BY {} ASC").format(self._pk) if self.pk else sql.SQL("")
+        query = sql.SQL("SELECT {} FROM {}").format(self._cols, self._table) + self._where(self.conditions) + order_sql
+        return query, self.params
+
+    def page(self, page_size: int, offset: int = 0, after: list[Any] | None = None) -> tuple[Any, list[Any]]:
+        """
+        One page of matching rows, by OFFSET or (with after) by keyset.
+        """
+        sql = self.sql
+        conditions, params = list(self.conditions), list(self.params)
+
+        # Keyset: (pk...) > (last seen pk...) so Postgres starts from an index range scan
+        if after is not None:
+            conditions.append(
+                sql.SQL("({}) > ({})").format(self._pk, sql.SQL(", ").join(sql.Placeholder() * len(self.pk)))
+            )
+            params += after
+
+        order_sql = sql.SQL(" ORDER BY {} ASC").format(self._pk) if self.pk else sql.SQL(" ORDER BY 1 ASC")
+        query = sql.SQL("SELECT {} FROM {}").format(self._cols, self._table) + self._where(conditions) + order_sql
+
+        if after is not None:
+            return query + sql.SQL(" LIMIT %s"), params + [page_size]
+        return query + sql.SQL(" LIMIT %s OFFSET %s"), params + [page_size, offset]
@@ -0,0 +1,80 @@
+"""
+Latency of the /api/core/* aggregates: the SQL over the materialized views vs
+the in-process NumPy engine (backend.analytics_engine).
+
+    python benchmarks/bench_analytics_engine.py --repeat 200
+
+Uses the database configured in the PG* environment variables. Checks that
+both return identical rows for every query before timing.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import api  # noqa: E402
+from backend.analytics_engine import load_snapshot  # noqa: E402
+from backend.db import get_conn  # noqa: E402
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type = int, default = 50, help = "Leaderboard size")
+    parser.add_argument("--year", type = int, default = 2009)
+    parser.add_argument("--driver-id", type = int, default = 1)
+    parser.add_argument("--repeat", type = int, default = 200)
+    return parser.parse_args(argv)
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def fetch_dicts(conn, query: str, params: tuple) -> list[dict]:
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        names = [d[0] for d in cur.description]
+        return [dict(zip(names, row)) for row in cur.fetchall()]
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    conn = get_conn()
+    conn.autocommit = True
+
+    start = time.perf_counter()
+    snap = load_snapshot(conn)
+    print(f"engine load: {(time.perf_counter() - start) * 1000:.1f} ms, {snap.result_rows} results rows, "
+          f"{snap.nbytes / 1024:.0f} KiB of arrays")
+
+    cases = [
+        ("leaderboard", api.LEADERBOARD_SQL, (args.limit,), lambda: snap.leaderboard(args.limit)),
+        ("constructors", api.CONSTRUCTORS_BY_YEAR_SQL, (args.year,), lambda: snap.constructors_by_year(args.year)),
+        ("driver_stats", api.DRIVER_STATS_SQL, (args.driver_id,),
+         lambda: [row] if (row := snap.driver_stats(args.driver_id)) else []),
+    ]
+
+    print(f"{'query':<14} {'rows':>5} {'sql ms':>8} {'engine ms':>10} {'speedup':>8}")
+    for name, query, params, engine in cases:
+        expected = fetch_dicts(conn, query, params)
+        if engine() != expected:
+            raise AssertionError(f"{name}: engine and SQL results differ")
+
+        before = best_of(args.repeat, lambda: fetch_dicts(conn, query, params))
+        after = best_of(args.repeat, engine)
+        print(f"{name:<14} {len(expected):>5} {before * 1000:>8.3f} {after * 1000:>10.4f} {before / after:>7.0f}x")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
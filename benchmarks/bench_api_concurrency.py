@@ -0,0 +1,139 @@
+"""
+Throughput of the sync (backend.api) vs async (backend.api_async) FastAPI apps
+under concurrent clients.
+
+Starts each app in its own single-worker uvicorn process against the database
+configured in the PG* environment variables, then drives it with N concurrent
+httpx clients for a fixed duration per concurrency level and reports
+requests/second and latency percentiles.
+
+    python benchmarks/bench_api_concurrency.py --concurrency 50 100 200 --duration 10
+
+The default request mix pages through core tables by page number (not served
+from the response cache), so every request does real database work.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+
+APPS = {
+    "sync": "backend.api:app",
+    "async": "backend.api_async:app",
+}
+
+DEFAULT_PATHS = [
+    "/api/tables/results?page={page}&page_size=25",
+    "/api/tables/drivers?page={page}&page_size=25",
+    "/api/tables/races?page={page}&page_size=25",
+]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("--apps", nargs = "+", choices = list(APPS), default = list(APPS))
+    parser.add_argument("--concurrency", nargs = "+", type = int, default = [50, 100, 200])
+    parser.add_argument("--duration", type = float, default = 10.0, help = "Seconds per concurrency level")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--paths", nargs = "+", default = DEFAULT_PATHS, help = "Paths; {page} is replaced by 1..20")
+    return parser.parse_args(argv)
+
+
+def start_server(app: str, port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--workers", "1", "--log-level", "warning"],
+        cwd = ROOT,
+        env = {**os.environ, "PYTHONPATH": str(ROOT)},
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/tables", timeout = 1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    proc.terminate()
+    raise RuntimeError(f"{app} did not start on port {port}")
+
+
+async def drive(base_url: str, paths: list[str], concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        while time.monotonic() < stop_at:
+            path = random.choice(paths).format(page = random.randint(1, 20))
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code != 200:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections = concurrency, max_keepalive_connections = concurrency)
+    async with httpx.AsyncClient(base_url = base_url, limits = limits, timeout = 60) as client:
+        started = time.monotonic()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        if not latencies:
+            return float("nan")
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else float("nan"),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    print(f"{'app':<6} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+
+    for name in args.apps:
+        proc = start_server(APPS[name], args.port)
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            asyncio.run(drive(base_url, args.paths, 10, 2.0))  # warm up pools and caches
+
+            for concurrency in args.concurrency:
+                r = asyncio.run(drive(base_url, args.paths, concurrency, args.duration))
+                print(
+                    f"{name:<6} {concurrency:>7} {r['rps']:>9.1f} {r['p50_ms']:>8.1f} "
+                    f"{r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['errors']:>7}"
+                )
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Search latency in main.get_table: the original per-request per-column
+str.contains pass vs the SearchIndex built at load time.
+
+    python benchmarks/bench_main_search.py --data-dir data/processed --tables results drivers
+
+Checks that both return identical rows for every term before timing.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from main import SearchIndex  # noqa: E402
+
+DEFAULT_TERMS = ["ham", "lewis", "25", "2009", "1.0", "mclaren", "zzz", "s+"]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", default = "data/processed")
+    parser.add_argument("--tables", nargs = "+", default = ["results", "drivers"])
+    parser.add_argument("--terms", nargs = "+", default = DEFAULT_TERMS)
+    parser.add_argument("--repeat", type = int, default = 5)
+    return parser.parse_args(argv)
+
+
+def per_column_search(df: pd.DataFrame, term: str) -> np.ndarray:
+    mask = df.astype(str).apply(lambda row: row.str.contains(term, case = False, na = False)).any(axis = 1)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    print(f"{'table':<10} {'term':<10} {'rows':>7} {'matches':>8} {'before ms':>10} {'after ms':>9} {'speedup':>8}")
+
+    for table in args.tables:
+        df = pd.read_csv(Path(args.data_dir) / f"{table}_processed.csv")
+
+        start = time.perf_counter()
+        index = SearchIndex(df)
+        print(f"{table:<10} {'(build)':<10} {len(df):>7} {'':>8} {'':>10} {(time.perf_counter() - start) * 1000:>9.2f}")
+
+        for term in args.terms:
+            expected = per_column_search(df, term)
+            if not np.array_equal(index.search(df, term), expected):
+                raise AssertionError(f"{table}: results differ for {term!r}")
+
+            before = best_of(args.repeat, lambda: per_column_search(df, term))
+            after = best_of(args.repeat, lambda: index.search(df, term))
+            print(
+                f"{table:<10} {term:<10} {len(df):>7} {len(expected):>8} "
+                f"{before * 1000:>10.2f} {after * 1000:>9.3f} {before / after:>7.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
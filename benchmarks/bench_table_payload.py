@@ -0,0 +1,98 @@
+"""
+Payload size and serialization CPU of /api/tables/{table} pages: format=rows
+(one object per row) vs format=columnar (one array per column), plain and gzipped.
+
+    python benchmarks/bench_table_payload.py --tables results drivers races
+    python benchmarks/bench_table_payload.py --source csv --data-dir data/processed
+
+--source db calls backend.api against the PG* database; --source csv calls
+main.py over the processed CSVs. Serialization is what FastAPI does with the
+returned dict (jsonable_encoder, then compact json.dumps); gzip uses the
+GZipMiddleware default level.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+FORMATS = ["rows", "columnar"]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("--source", choices = ["db", "csv"], default = "db")
+    parser.add_argument("--data-dir", default = "data/processed", help = "Processed CSVs (--source csv)")
+    parser.add_argument("--tables", nargs = "+", default = ["results", "drivers", "races", "qualifying", "pit_stops"])
+    parser.add_argument("--page-size", type = int, default = 200)
+    parser.add_argument("--repeat", type = int, default = 20)
+    return parser.parse_args(argv)
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def serialize(payload: dict) -> bytes:
+    return json.dumps(jsonable_encoder(payload), ensure_ascii = False, separators = (",", ":")).encode("utf-8")
+
+
+def page_fetcher(args: argparse.Namespace):
+    """
+    fetch(table, fmt) -> the dict the endpoint returns for the first page.
+    """
+    if args.source == "db":
+        from backend import api
+
+        return lambda table, fmt: api.get_table_data(
+            table, page = 1, page_size = args.page_size, search = "", cursor = None, exact_count = False, format = fmt
+        )
+
+    import main
+
+    main.table_cache = main.TableCache(Path(args.data_dir), max_bytes = 1024 ** 3)
+    return lambda table, fmt: main.get_table(table, page = 1, page_size = args.page_size, search = "", format = fmt)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    fetch = page_fetcher(args)
+
+    print(f"{'table':<12} {'format':<9} {'rows':>5} {'bytes':>8} {'gzip':>7} {'serialize ms':>13} {'gzip ms':>8}")
+    for table in args.tables:
+        sizes = {}
+        for fmt in FORMATS:
+            payload = fetch(table, fmt)
+            body = serialize(payload)
+            packed = gzip.compress(body, compresslevel = 9)
+            sizes[fmt] = (len(body), len(packed))
+
+            ser = best_of(args.repeat, lambda: serialize(payload))
+            zipped = best_of(args.repeat, lambda: gzip.compress(body, compresslevel = 9))
+            rows = len(payload["rows"]) if fmt == "rows" else len(next(iter(payload["data"].values()), []))
+            print(
+                f"{table:<12} {fmt:<9} {rows:>5} {len(body):>8} {len(packed):>7} "
+                f"{ser * 1000:>13.3f} {zipped * 1000:>8.3f}"
+            )
+
+        (rows_bytes, rows_gzip), (col_bytes, col_gzip) = sizes["rows"], sizes["columnar"]
+        print(
+            f"{table:<12} {'':<9} {'':>5} {col_bytes / rows_bytes:>7.0%} {col_gzip / rows_gzip:>6.0%}"
+            f"   (columnar / rows; gzipped rows are {rows_gzip / rows_bytes:.0%} of plain)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,12 @@ export function fetchTables() {
   return request("/api/tables");
 }
 
-export function fetchTableData(table, { page = 1, pageSize = 25, search = "" } = {}) {
+export function fetchTableData(table, { page = 1, pageSize = 25, search = "", cursor = null } = {}) {
   const params = new URLSearchParams({
     page: String(page),
     page_size: String(pageSize),
     search: search || "",
   });
+  if (cursor) params.set("cursor", cursor);
   return request(`/api/tables/${encodeURIComponent(table)}?${params.toString()}`);
 }
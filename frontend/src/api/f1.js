@@ -14,12 +14,13 @@ export async function getTables() {
   return jsonOrThrow(res, "GET /api/tables");
 }
 
-export async function getTableData(table, { page = 1, page_size = 25, search = "" } = {}) {
+export async function getTableData(table, { page = 1, page_size = 25, search = "", cursor = null } = {}) {
   const url =
     `/api/tables/${encodeURIComponent(table)}` +
     `?page=${encodeURIComponent(page)}` +
     `&page_size=${encodeURIComponent(page_size)}` +
-    `&search=${encodeURIComponent(search)}`;
+    `&search=${encodeURIComponent(search)}` +
+    (cursor ? `&cursor=${encodeURIComponent(cursor)}` : "");
   const res = await fetch(url);
   return jsonOrThrow(res, `GET /api/tables/${table}`);
 }
@@ -38,3 +39,12 @@ export async function getDriverStats(driverId) {
   const res = await fetch(`/api/core/drivers/${encodeURIComponent(driverId)}/stats`);
   return jsonOrThrow(res, "GET /api/core/drivers/{driver_id}/stats");
 }
+
+// One request for many drivers: { ids: [1, 20] } (in that order) or { top: 10 } (leaderboard order)
+export async function getDriversStats({ ids = [], top = null } = {}) {
+  const params = new URLSearchParams();
+  if (top != null) params.set("top", String(top));
+  for (const id of ids) params.append("ids", String(id));
+  const res = await fetch(`/api/core/drivers/stats?${params.toString()}`);
+  return jsonOrThrow(res, "GET /api/core/drivers/stats");
+}
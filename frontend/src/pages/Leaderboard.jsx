@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import { getLeaderboard } from "../api/f1";
+import { getDriversStats } from "../api/f1";
 
 export default function Leaderboard() {
   const [limit, setLimit] = useState(10);
@@ -12,7 +12,8 @@ export default function Leaderboard() {
       try {
         setLoading(true);
         setErr("");
-        const data = await getLeaderboard(limit);
+        // Leaderboard rows with career stats, in one request
+        const data = await getDriversStats({ top: limit });
         setRows(Array.isArray(data) ? data : []);
       } catch (e) {
         setErr(e.message || "Failed to load leaderboard");
@@ -65,6 +66,9 @@ export default function Leaderboard() {
                 <th>POS</th>
                 <th>Driver</th>
                 <th>Total Points</th>
+                <th>Races</th>
+                <th>Wins</th>
+                <th>Podiums</th>
                 <th>Driver ID</th>
               </tr>
             </thead>
@@ -77,6 +81,9 @@ export default function Leaderboard() {
                     </td>
                     <td>{r.driver_name}</td>
                     <td>{r.total_points}</td>
+                    <td>{r.races}</td>
+                    <td>{r.wins}</td>
+                    <td>{r.podiums}</td>
                     <td>{r.driver_id}</td>
                   </tr>
                 ))
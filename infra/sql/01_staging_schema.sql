@@ -47,3 +47,75 @@ CREATE TABLE IF NOT EXISTS staging.stg_results (
 CREATE INDEX IF NOT EXISTS idx_stg_results_race_id        ON staging.stg_results (race_id);
 CREATE INDEX IF NOT EXISTS idx_stg_results_driver_id      ON staging.stg_results (driver_id);
 CREATE INDEX IF NOT EXISTS idx_stg_results_constructor_id ON staging.stg_results (constructor_id);
+
+CREATE TABLE IF NOT EXISTS staging.stg_qualifying (
+  qualify_id     INTEGER PRIMARY KEY,
+  race_id        INTEGER NOT NULL,
+  driver_id      INTEGER NOT NULL,
+  constructor_id INTEGER NOT NULL,
+  number         INTEGER,
+  position       INTEGER,
+  q1             TEXT,
+  q2             TEXT,
+  q3             TEXT,
+  ingested_at    TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS staging.stg_driver_standings (
+  driver_standings_id INTEGER PRIMARY KEY,
+  race_id             INTEGER NOT NULL,
+  driver_id           INTEGER NOT NULL,
+  points              NUMERIC(6,2),
+  position            INTEGER,
+  position_text       TEXT,
+  wins                INTEGER,
+  ingested_at         TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS staging.stg_constructor_standings (
+  constructor_standings_id INTEGER PRIMARY KEY,
+  race_id                  INTEGER NOT NULL,
+  constructor_id           INTEGER NOT NULL,
+  points                   NUMERIC(6,2),
+  position                 INTEGER,
+  position_text            TEXT,
+  wins                     INTEGER,
+  ingested_at              TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS staging.stg_pit_stops (
+  race_id      INTEGER NOT NULL,
+  driver_id    INTEGER NOT NULL,
+  stop         INTEGER NOT NULL,
+  lap          INTEGER,
+  time         TIME,
+  duration     TEXT,
+  milliseconds INTEGER,
+  ingested_at  TIMESTAMPTZ DEFAULT NOW(),
+  PRIMARY KEY (race_id, driver_id, stop)
+);
+
+CREATE TABLE IF NOT EXISTS staging.stg_sprint_results (
+  result_id        INTEGER PRIMARY KEY,
+  race_id          INTEGER NOT NULL,
+  driver_id        INTEGER NOT NULL,
+  constructor_id   INTEGER NOT NULL,
+  number           INTEGER,
+  grid             INTEGER,
+  position         INTEGER,
+  position_text    TEXT,
+  position_order   INTEGER,
+  points           NUMERIC(6,2),
+  laps             INTEGER,
+  time             TEXT,
+  milliseconds     INTEGER,
+  fastest_lap      INTEGER,
+  fastest_lap_time TEXT,
+  status_id        INTEGER,
+  ingested_at      TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_stg_qualifying_race_id            ON staging.stg_qualifying (race_id);
+CREATE INDEX IF NOT EXISTS idx_stg_driver_standings_race_id      ON staging.stg_driver_standings (race_id);
+CREATE INDEX IF NOT EXISTS idx_stg_constructor_standings_race_id ON staging.stg_constructor_standings (race_id);
+CREATE INDEX IF NOT EXISTS idx_stg_sprint_results_race_id        ON staging.stg_sprint_results (race_id);
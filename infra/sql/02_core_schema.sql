@@ -1,3 +1,12 @@
+-- 0) Databases created before the fact tables were partitioned need a one-time
+--    migration first (infra/sql/06_partition_core_facts.sql)
+DO $$
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('core.results')) = 'r' THEN
+    RAISE EXCEPTION 'core.results is not partitioned; run infra/sql/06_partition_core_facts.sql first';
+  END IF;
+END $$;
+
 -- 1) Core schema
 CREATE SCHEMA IF NOT EXISTS core;
 
@@ -33,15 +42,180 @@ CREATE TABLE IF NOT EXISTS core.races (
   url          TEXT
 );
 
+-- Fact tables are LIST-partitioned by season (the race's year), one partition
+-- per season named <table>_<season> (e.g. core.results_2009), so queries that
+-- filter on season scan one partition and a season can be reloaded on its own
+-- (core.reload_season). The season is part of every primary key, as Postgres
+-- requires for partitioned tables.
 CREATE TABLE IF NOT EXISTS core.results (
-  result_id      INTEGER PRIMARY KEY,
+  result_id      INTEGER NOT NULL,
+  race_id        INTEGER NOT NULL,
+  driver_id      INTEGER NOT NULL,
+  constructor_id INTEGER NOT NULL,
+  position       INTEGER,
+  points         NUMERIC(6,2),
+  season         INTEGER NOT NULL,
+  PRIMARY KEY (season, result_id)
+) PARTITION BY LIST (season);
+
+CREATE TABLE IF NOT EXISTS core.qualifying (
+  qualify_id     INTEGER NOT NULL,
   race_id        INTEGER NOT NULL,
   driver_id      INTEGER NOT NULL,
   constructor_id INTEGER NOT NULL,
+  number         INTEGER,
   position       INTEGER,
-  points         NUMERIC(6,2)
+  q1             TEXT,
+  q2             TEXT,
+  q3             TEXT,
+  season         INTEGER NOT NULL,
+  PRIMARY KEY (season, qualify_id)
+) PARTITION BY LIST (season);
+
+CREATE TABLE IF NOT EXISTS core.driver_standings (
+  driver_standings_id INTEGER NOT NULL,
+  race_id             INTEGER NOT NULL,
+  driver_id           INTEGER NOT NULL,
+  points              NUMERIC(6,2),
+  position            INTEGER,
+  position_text       TEXT,
+  wins                INTEGER,
+  season              INTEGER NOT NULL,
+  PRIMARY KEY (season, driver_standings_id)
+) PARTITION BY LIST (season);
+
+CREATE TABLE IF NOT EXISTS core.constructor_standings (
+  constructor_standings_id INTEGER NOT NULL,
+  race_id                  INTEGER NOT NULL,
+  constructor_id           INTEGER NOT NULL,
+  points                   NUMERIC(6,2),
+  position                 INTEGER,
+  position_text            TEXT,
+  wins                     INTEGER,
+  season                   INTEGER NOT NULL,
+  PRIMARY KEY (season, constructor_standings_id)
+) PARTITION BY LIST (season);
+
+CREATE TABLE IF NOT EXISTS core.pit_stops (
+  race_id      INTEGER NOT NULL,
+  driver_id    INTEGER NOT NULL,
+  stop         INTEGER NOT NULL,
+  lap          INTEGER,
+  time         TIME,
+  duration     TEXT,
+  milliseconds INTEGER,
+  season       INTEGER NOT NULL,
+  PRIMARY KEY (season, race_id, driver_id, stop)
+) PARTITION BY LIST (season);
+
+-- A few hundred rows: not worth partitioning
+CREATE TABLE IF NOT EXISTS core.sprint_results (
+  result_id        INTEGER PRIMARY KEY,
+  race_id          INTEGER NOT NULL,
+  driver_id        INTEGER NOT NULL,
+  constructor_id   INTEGER NOT NULL,
+  number           INTEGER,
+  grid             INTEGER,
+  position         INTEGER,
+  position_text    TEXT,
+  position_order   INTEGER,
+  points           NUMERIC(6,2),
+  laps             INTEGER,
+  time             TEXT,
+  milliseconds     INTEGER,
+  fastest_lap      INTEGER,
+  fastest_lap_time TEXT,
+  status_id        INTEGER
 );
 
+-- Create core.<table>_<season> for every season that staging.stg_<table> has
+-- rows for and that has no partition yet. Returns the number created.
+CREATE OR REPLACE FUNCTION core.ensure_season_partitions(p_table TEXT) RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+  v_season  INTEGER;
+  v_created INTEGER := 0;
+BEGIN
+  FOR v_season IN EXECUTE format(
+    'SELECT DISTINCT ra.year FROM staging.%I s JOIN core.races ra ON ra.race_id = s.race_id
+     WHERE ra.year IS NOT NULL ORDER BY 1',
+    'stg_' || p_table
+  ) LOOP
+    IF to_regclass(format('core.%I', p_table || '_' || v_season)) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE core.%I PARTITION OF core.%I FOR VALUES IN (%s)',
+        p_table || '_' || v_season, p_table, v_season
+      );
+      v_created := v_created + 1;
+    END IF;
+  END LOOP;
+
+  RETURN v_created;
+END $$;
+
+-- Replace one season of core.<table> with that season's rows from
+-- staging.stg_<table>: the rows are loaded into a new table off to the side,
+-- then the old partition is detached and dropped and the new one attached, all
+-- in the caller's transaction, so readers see either the old season or the new
+-- one. Returns the number of rows loaded.
+CREATE OR REPLACE FUNCTION core.reload_season(p_table TEXT, p_season INTEGER) RETURNS BIGINT
+LANGUAGE plpgsql AS $$
+DECLARE
+  v_partition TEXT := p_table || '_' || p_season;
+  v_fresh     TEXT := p_table || '_' || p_season || '_new';
+  v_columns   TEXT;
+  v_selects   TEXT;
+  v_loaded    BIGINT;
+BEGIN
+  -- Columns core and staging share (core adds season, staging adds ingested_at)
+  SELECT string_agg(format('%I', c.column_name), ', ' ORDER BY c.ordinal_position),
+         string_agg(format('s.%I', c.column_name), ', ' ORDER BY c.ordinal_position)
+  INTO v_columns, v_selects
+  FROM information_schema.columns c
+  WHERE c.table_schema = 'core' AND c.table_name = p_table
+    AND c.column_name IN (
+      SELECT column_name FROM information_schema.columns
+      WHERE table_schema = 'staging' AND table_name = 'stg_' || p_table
+    );
+
+  IF v_columns IS NULL THEN
+    RAISE EXCEPTION 'core.% or staging.stg_% does not exist', p_table, p_table;
+  END IF;
+
+  -- The CHECK lets ATTACH PARTITION skip its validation scan
+  EXECUTE format('DROP TABLE IF EXISTS core.%I', v_fresh);
+  EXECUTE format(
+    'CREATE TABLE core.%I (LIKE core.%I INCLUDING DEFAULTS, CHECK (season = %s))',
+    v_fresh, p_table, p_season
+  );
+  EXECUTE format(
+    'INSERT INTO core.%I (%s, season)
+     SELECT %s, ra.year FROM staging.%I s JOIN core.races ra ON ra.race_id = s.race_id
+     WHERE ra.year = %s',
+    v_fresh, v_columns, v_selects, 'stg_' || p_table, p_season
+  );
+  GET DIAGNOSTICS v_loaded = ROW_COUNT;
+
+  IF to_regclass(format('core.%I', v_partition)) IS NOT NULL THEN
+    EXECUTE format('ALTER TABLE core.%I DETACH PARTITION core.%I', p_table, v_partition);
+    EXECUTE format('DROP TABLE core.%I', v_partition);
+  END IF;
+
+  EXECUTE format('ALTER TABLE core.%I RENAME TO %I', v_fresh, v_partition);
+  EXECUTE format('ALTER TABLE core.%I ATTACH PARTITION core.%I FOR VALUES IN (%s)', p_table, v_partition, p_season);
+
+  -- Row triggers (e.g. the search_doc trigger) only apply once attached
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = 'core' AND table_name = p_table AND column_name = 'search_doc'
+  ) THEN
+    EXECUTE format('UPDATE core.%I SET search_doc = NULL', v_partition);
+  END IF;
+
+  EXECUTE format('ANALYZE core.%I', v_partition);
+  RETURN v_loaded;
+END $$;
+
 -- 3) Load dimensions first (idempotent)
 INSERT INTO core.constructors (constructor_id, constructor_ref, name, nationality, url)
 SELECT s.constructor_id, s.constructor_ref, s.name, s.nationality, s.url
@@ -77,21 +251,129 @@ SET year       = EXCLUDED.year,
     race_time  = EXCLUDED.race_time,
     url        = EXCLUDED.url;
 
--- 4) Load fact table (results) after dimensions
-INSERT INTO core.results (result_id, race_id, driver_id, constructor_id, position, points)
-SELECT s.result_id, s.race_id, s.driver_id, s.constructor_id, s.position, s.points
+-- 4) Load fact tables after dimensions (the season comes from core.races)
+-- A staging row whose race is missing (or has no year) would be dropped by the
+-- joins below without a word, so stop instead, as the race foreign key did
+-- before the fact tables were partitioned
+DO $$
+DECLARE
+  v_table   TEXT;
+  v_orphans BIGINT;
+BEGIN
+  FOREACH v_table IN ARRAY ARRAY['results', 'qualifying', 'driver_standings', 'constructor_standings', 'pit_stops'] LOOP
+    EXECUTE format(
+      'SELECT COUNT(*) FROM staging.%I s LEFT JOIN core.races ra ON ra.race_id = s.race_id WHERE ra.year IS NULL',
+      'stg_' || v_table
+    ) INTO v_orphans;
+
+    IF v_orphans > 0 THEN
+      RAISE EXCEPTION 'staging.stg_%: % rows have no race with a year in core.races', v_table, v_orphans;
+    END IF;
+  END LOOP;
+END $$;
+
+SELECT core.ensure_season_partitions('results');
+SELECT core.ensure_season_partitions('qualifying');
+SELECT core.ensure_season_partitions('driver_standings');
+SELECT core.ensure_season_partitions('constructor_standings');
+SELECT core.ensure_season_partitions('pit_stops');
+
+INSERT INTO core.results (result_id, race_id, driver_id, constructor_id, position, points, season)
+SELECT s.result_id, s.race_id, s.driver_id, s.constructor_id, s.position, s.points, ra.year
 FROM staging.stg_results s
-ON CONFLICT (result_id) DO UPDATE
+JOIN core.races ra ON ra.race_id = s.race_id
+ON CONFLICT (season, result_id) DO UPDATE
 SET race_id        = EXCLUDED.race_id,
     driver_id      = EXCLUDED.driver_id,
     constructor_id = EXCLUDED.constructor_id,
     position       = EXCLUDED.position,
     points         = EXCLUDED.points;
 
+INSERT INTO core.qualifying (qualify_id, race_id, driver_id, constructor_id, number, position, q1, q2, q3, season)
+SELECT s.qualify_id, s.race_id, s.driver_id, s.constructor_id, s.number, s.position, s.q1, s.q2, s.q3, ra.year
+FROM staging.stg_qualifying s
+JOIN core.races ra ON ra.race_id = s.race_id
+ON CONFLICT (season, qualify_id) DO UPDATE
+SET race_id        = EXCLUDED.race_id,
+    driver_id      = EXCLUDED.driver_id,
+    constructor_id = EXCLUDED.constructor_id,
+    number         = EXCLUDED.number,
+    position       = EXCLUDED.position,
+    q1             = EXCLUDED.q1,
+    q2             = EXCLUDED.q2,
+    q3             = EXCLUDED.q3;
+
+INSERT INTO core.driver_standings (driver_standings_id, race_id, driver_id, points, position, position_text, wins, season)
+SELECT s.driver_standings_id, s.race_id, s.driver_id, s.points, s.position, s.position_text, s.wins, ra.year
+FROM staging.stg_driver_standings s
+JOIN core.races ra ON ra.race_id = s.race_id
+ON CONFLICT (season, driver_standings_id) DO UPDATE
+SET race_id       = EXCLUDED.race_id,
+    driver_id     = EXCLUDED.driver_id,
+    points        = EXCLUDED.points,
+    position      = EXCLUDED.position,
+    position_text = EXCLUDED.position_text,
+    wins          = EXCLUDED.wins;
+
+INSERT INTO core.constructor_standings (
+  constructor_standings_id, race_id, constructor_id, points, position, position_text, wins, season
+)
+SELECT s.constructor_standings_id, s.race_id, s.constructor_id, s.points, s.position, s.position_text, s.wins, ra.year
+FROM staging.stg_constructor_standings s
+JOIN core.races ra ON ra.race_id = s.race_id
+ON CONFLICT (season, constructor_standings_id) DO UPDATE
+SET race_id        = EXCLUDED.race_id,
+    constructor_id = EXCLUDED.constructor_id,
+    points         = EXCLUDED.points,
+    position       = EXCLUDED.position,
+    position_text  = EXCLUDED.position_text,
+    wins           = EXCLUDED.wins;
+
+INSERT INTO core.pit_stops (race_id, driver_id, stop, lap, time, duration, milliseconds, season)
+SELECT s.race_id, s.driver_id, s.stop, s.lap, s.time, s.duration, s.milliseconds, ra.year
+FROM staging.stg_pit_stops s
+JOIN core.races ra ON ra.race_id = s.race_id
+ON CONFLICT (season, race_id, driver_id, stop) DO UPDATE
+SET lap          = EXCLUDED.lap,
+    time         = EXCLUDED.time,
+    duration     = EXCLUDED.duration,
+    milliseconds = EXCLUDED.milliseconds;
+
+INSERT INTO core.sprint_results (
+  result_id, race_id, driver_id, constructor_id, number, grid, position, position_text,
+  position_order, points, laps, time, milliseconds, fastest_lap, fastest_lap_time, status_id
+)
+SELECT s.result_id, s.race_id, s.driver_id, s.constructor_id, s.number, s.grid, s.position, s.position_text,
+       s.position_order, s.points, s.laps, s.time, s.milliseconds, s.fastest_lap, s.fastest_lap_time, s.status_id
+FROM staging.stg_sprint_results s
+ON CONFLICT (result_id) DO UPDATE
+SET race_id          = EXCLUDED.race_id,
+    driver_id        = EXCLUDED.driver_id,
+    constructor_id   = EXCLUDED.constructor_id,
+    number           = EXCLUDED.number,
+    grid             = EXCLUDED.grid,
+    position         = EXCLUDED.position,
+    position_text    = EXCLUDED.position_text,
+    position_order   = EXCLUDED.position_order,
+    points           = EXCLUDED.points,
+    laps             = EXCLUDED.laps,
+    time             = EXCLUDED.time,
+    milliseconds     = EXCLUDED.milliseconds,
+    fastest_lap      = EXCLUDED.fastest_lap,
+    fastest_lap_time = EXCLUDED.fastest_lap_time,
+    status_id        = EXCLUDED.status_id;
+
 -- 5) Add indexes + foreign keys (safe “IF NOT EXISTS” pattern via DO blocks)
 CREATE INDEX IF NOT EXISTS idx_core_results_race_id        ON core.results (race_id);
 CREATE INDEX IF NOT EXISTS idx_core_results_driver_id      ON core.results (driver_id);
 CREATE INDEX IF NOT EXISTS idx_core_results_constructor_id ON core.results (constructor_id);
+CREATE INDEX IF NOT EXISTS idx_core_qualifying_race_id                 ON core.qualifying (race_id);
+CREATE INDEX IF NOT EXISTS idx_core_qualifying_driver_id               ON core.qualifying (driver_id);
+CREATE INDEX IF NOT EXISTS idx_core_driver_standings_race_id           ON core.driver_standings (race_id);
+CREATE INDEX IF NOT EXISTS idx_core_driver_standings_driver_id         ON core.driver_standings (driver_id);
+CREATE INDEX IF NOT EXISTS idx_core_constructor_standings_race_id      ON core.constructor_standings (race_id);
+CREATE INDEX IF NOT EXISTS idx_core_constructor_standings_constructor_id ON core.constructor_standings (constructor_id);
+CREATE INDEX IF NOT EXISTS idx_core_sprint_results_race_id             ON core.sprint_results (race_id);
 
 DO $$
 BEGIN
@@ -121,4 +403,14 @@ SELECT 'core.drivers', COUNT(*) FROM core.drivers
 UNION ALL
 SELECT 'core.races', COUNT(*) FROM core.races
 UNION ALL
-SELECT 'core.results', COUNT(*) FROM core.results;
\ No newline at end of file
+SELECT 'core.results', COUNT(*) FROM core.results
+UNION ALL
+SELECT 'core.qualifying', COUNT(*) FROM core.qualifying
+UNION ALL
+SELECT 'core.driver_standings', COUNT(*) FROM core.driver_standings
+UNION ALL
+SELECT 'core.constructor_standings', COUNT(*) FROM core.constructor_standings
+UNION ALL
+SELECT 'core.pit_stops', COUNT(*) FROM core.pit_stops
+UNION ALL
+SELECT 'core.sprint_results', COUNT(*) FROM core.sprint_results;
\ No newline at end of file
@@ -0,0 +1,63 @@
+-- Search support for /api/tables/{table}?search=...
+--
+-- Each core table gets a search_doc column holding the text form of every
+-- other column, joined with chr(31) (unit separator), kept current by a
+-- trigger and indexed with pg_trgm so ILIKE '%term%' can use the index.
+-- The API still re-checks the per-column predicate on the candidate rows,
+-- so results match CAST(col AS TEXT) ILIKE '%term%' exactly.
+-- Assumes DateStyle = ISO (the default), so dates render the same in JSON and text.
+-- On the season-partitioned fact tables the column, trigger and index are
+-- created on the parent, so every partition (including ones core.reload_season
+-- attaches later) gets them.
+
+-- 1) Extension
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 2) Trigger function shared by all core tables
+CREATE OR REPLACE FUNCTION core.set_search_doc() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  SELECT string_agg(j.value, chr(31))
+  INTO NEW.search_doc
+  FROM jsonb_each_text(to_jsonb(NEW) - 'search_doc') AS j(key, value);
+
+  RETURN NEW;
+END $$;
+
+-- 3) Column, trigger, backfill and index per table
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY[
+    'constructors', 'drivers', 'races', 'results', 'qualifying',
+    'driver_standings', 'constructor_standings', 'pit_stops', 'sprint_results'
+  ] LOOP
+    EXECUTE format('ALTER TABLE core.%I ADD COLUMN IF NOT EXISTS search_doc TEXT', t);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_search_doc ON core.%I', t, t);
+    EXECUTE format(
+      'CREATE TRIGGER trg_%s_search_doc BEFORE INSERT OR UPDATE ON core.%I
+         FOR EACH ROW EXECUTE FUNCTION core.set_search_doc()',
+      t, t
+    );
+
+    -- Backfill existing rows (the trigger fills search_doc)
+    EXECUTE format('UPDATE core.%I SET search_doc = NULL WHERE search_doc IS NULL', t);
+
+    EXECUTE format(
+      'CREATE INDEX IF NOT EXISTS idx_core_%s_search_doc ON core.%I USING gin (search_doc gin_trgm_ops)',
+      t, t
+    );
+  END LOOP;
+END $$;
+
+ANALYZE core.constructors;
+ANALYZE core.drivers;
+ANALYZE core.races;
+ANALYZE core.results;
+ANALYZE core.qualifying;
+ANALYZE core.driver_standings;
+ANALYZE core.constructor_standings;
+ANALYZE core.pit_stops;
+ANALYZE core.sprint_results;
@@ -0,0 +1,49 @@
+-- Pre-aggregated analytics for the leaderboard, driver stats and
+-- constructors-by-year endpoints.
+--
+-- Each view has a unique index, which REFRESH MATERIALIZED VIEW CONCURRENTLY
+-- requires; ingestion refreshes them after loading (post_load in config.yaml),
+-- so readers never see an empty or locked view.
+
+-- 1) Driver career totals (one row per driver with at least one result)
+CREATE MATERIALIZED VIEW IF NOT EXISTS core.mv_driver_career AS
+SELECT
+    d.driver_id,
+    d.forename || ' ' || d.surname AS driver_name,
+    COUNT(*) AS races,
+    SUM(CASE WHEN r.position = 1 THEN 1 ELSE 0 END) AS wins,
+    SUM(CASE WHEN r.position IN (1, 2, 3) THEN 1 ELSE 0 END) AS podiums,
+    SUM(r.points) AS total_points
+FROM core.results r
+JOIN core.drivers d ON d.driver_id = r.driver_id
+GROUP BY d.driver_id, driver_name
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_driver_career_driver_id
+  ON core.mv_driver_career (driver_id);
+
+-- Matches the leaderboard's ORDER BY total_points DESC, driver_id, so LIMIT n reads n index entries
+-- (replaces idx_mv_driver_career_total_points, which lacked the tie-break)
+DROP INDEX IF EXISTS core.idx_mv_driver_career_total_points;
+CREATE INDEX IF NOT EXISTS idx_mv_driver_career_points_driver
+  ON core.mv_driver_career (total_points DESC, driver_id);
+
+-- 2) Constructor points per season (core.results carries the season, no join to races)
+CREATE MATERIALIZED VIEW IF NOT EXISTS core.mv_constructor_season_points AS
+SELECT
+    r.season AS year,
+    c.constructor_id,
+    c.name AS constructor_name,
+    SUM(r.points) AS total_points
+FROM core.results r
+JOIN core.constructors c ON c.constructor_id = r.constructor_id
+GROUP BY r.season, c.constructor_id, constructor_name
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_constructor_season_points_year_constructor
+  ON core.mv_constructor_season_points (year, constructor_id);
+
+-- 3) Quick verification
+SELECT 'core.mv_driver_career' AS view, COUNT(*) AS rows FROM core.mv_driver_career
+UNION ALL
+SELECT 'core.mv_constructor_season_points', COUNT(*) FROM core.mv_constructor_season_points;
@@ -0,0 +1,15 @@
+-- Ingestion run log.
+--
+-- run_all_ingestion inserts one row per run that loads the database; the
+-- latest run_id is the "data version" the API uses to key its response
+-- cache and ETags, so cached responses go stale exactly when data changes.
+
+CREATE SCHEMA IF NOT EXISTS meta;
+
+CREATE TABLE IF NOT EXISTS meta.ingestion_runs (
+  run_id       BIGSERIAL PRIMARY KEY,
+  started_at   TIMESTAMPTZ NOT NULL,
+  finished_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  full_refresh BOOLEAN NOT NULL DEFAULT FALSE,
+  datasets     JSONB NOT NULL DEFAULT '{}'::jsonb
+);
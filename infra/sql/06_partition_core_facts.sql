@@ -0,0 +1,16 @@
+-- One-time migration for databases created before the core fact tables were
+-- partitioned by season (infra/sql/02_core_schema.sql). A no-op otherwise.
+--
+-- core.results is rebuilt from staging, so it drops the old table and the
+-- analytics views that depend on it. Afterwards run, in order:
+--   02_core_schema.sql, 03_search_schema.sql, 04_analytics_views.sql
+
+DO $$
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('core.results')) = 'r' THEN
+    DROP MATERIALIZED VIEW IF EXISTS core.mv_driver_career;
+    DROP MATERIALIZED VIEW IF EXISTS core.mv_constructor_season_points;
+    DROP TABLE core.results;
+    RAISE NOTICE 'Dropped unpartitioned core.results; now run 02, 03 and 04';
+  END IF;
+END $$;
@@ -1,2 +1,44 @@
+import numpy as np
+import pandas as pd
+
+
 def deduplicate(df, key_columns):
-    return df.drop_duplicates(subset = key_columns)
\ No newline at end of file
+    return df.drop_duplicates(subset = key_columns)
+
+def deduplicate_against_seen(df, key_columns, seen_keys):
+    """
+    Deduplicate df on key_columns, then drop rows whose key is already in
+    seen_keys (keys from earlier chunks) and add the remaining keys to it.
+    """
+    df = deduplicate(df, key_columns)
+
+    if len(key_columns) == 1:
+        keys = pd.Index(df[key_columns[0]])
+    else:
+        keys = pd.MultiIndex.from_frame(df[key_columns])
+
+    already_seen = np.asarray(keys.isin(seen_keys)) if seen_keys else np.zeros(len(df), dtype = bool)
+    seen_keys.update(keys[~already_seen])
+
+    return df[~already_seen]
+
+def deduplicate_against_index(df, key_columns, key_index):
+    """
+    Deduplicate df on key_columns, then drop rows whose key is already in
+    key_index (an ingestion.key_index.KeyIndex, e.g. keys from earlier chunks
+    or earlier appended runs). The index is not changed: once the rows have
+    been validated, record_keys adds the keys of the ones actually written.
+    """
+    df = deduplicate(df, key_columns)
+
+    keys, present = key_index.encode(df, key_columns)
+    already_seen = present & key_index.contains(keys)
+
+    return df[~already_seen]
+
+def record_keys(df, key_columns, key_index):
+    """
+    Add the keys of df's rows to key_index (rows with a missing key value are skipped).
+    """
+    keys, present = key_index.encode(df, key_columns)
+    key_index.add(keys[present])
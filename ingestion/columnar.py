@@ -0,0 +1,285 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+SCHEMA_FILE = "schema.json"
+
+
+def columnar_dir_for(csv_path: str) -> str:
+    """
+    Sidecar directory for a processed CSV: results_processed.csv -> results_processed.columns/
+    """
+    path = Path(csv_path)
+    return str(path.with_name(path.stem + ".columns"))
+
+
+def _source_signature(csv_path: str) -> dict:
+    stat = os.stat(csv_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _staging_dir(out: Path) -> Path:
+    tmp = out.with_name(out.name + f".tmp-{os.getpid()}")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents = True)
+    return tmp
+
+
+def _finish(tmp: Path, out: Path, rows: int, columns: list[dict], source: dict | None) -> None:
+    schema = {
+        "format": FORMAT_VERSION,
+        "rows": rows,
+        "columns": columns,
+        "source": source,
+    }
+    (tmp / SCHEMA_FILE).write_text(json.dumps(schema, indent = 2), encoding = "utf-8")
+
+    # Swap in the new directory; the old one is removed afterwards
+    old = out.with_name(out.name + f".old-{os.getpid()}")
+    if out.exists():
+        out.rename(old)
+    tmp.rename(out)
+    if old.exists():
+        shutil.rmtree(old)
+
+
+def _is_stored_as_is(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and isinstance(dtype, np.dtype)
+
+
+def write_columnar(df: pd.DataFrame, out_dir: str, source_csv: str | None = None) -> None:
+    """
+    Write df as one .npy file per column plus schema.json, replacing out_dir.
+
+    Numeric and bool columns are stored as-is. Other columns are stored as
+    fixed-width unicode arrays plus a validity mask, so every file can be
+    memory-mapped. source_csv records the CSV the sidecar mirrors, so readers
+    can tell when it has gone stale.
+    """
+    out = Path(out_dir)
+    tmp = _staging_dir(out)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        entry = {"name": str(name), "dtype": str(series.dtype)}
+
+        if _is_stored_as_is(series.dtype):
+            entry["kind"] = "numeric"
+            entry["file"] = f"{i}.npy"
+            np.save(tmp / entry["file"], series.to_numpy())
+        else:
+            valid = series.notna().to_numpy()
+            values = np.where(valid, series.astype(str).to_numpy(dtype = object), "")
+            entry["kind"] = "string"
+            entry["file"] = f"{i}.npy"
+            entry["valid_file"] = f"{i}.valid.npy"
+            np.save(tmp / entry["file"], values.astype(str) if len(values) else np.array([], dtype = "<U1"))
+            np.save(tmp / entry["valid_file"], valid)
+
+        columns.append(entry)
+
+    _finish(tmp, out, len(df), columns, _source_signature(source_csv) if source_csv else None)
+
+
+def _is_plain_number(dtype) -> bool:
+    return isinstance(dtype, np.dtype) and dtype.kind in "iuf"
+
+
+def _string_width(series: pd.Series) -> int:
+    values = series.dropna()
+    return int(values.astype(str).str.len().max()) if len(values) else 0
+
+
+def _whole_file_dtype(profile: dict):
+    """
+    The dtype pd.read_csv infers for a column over the whole file, from the
+    dtypes it inferred chunk by chunk (all-missing chunks say nothing).
+    """
+    seen = profile["dtypes"]
+    if not seen:
+        return profile["first"]
+    if all(_is_plain_number(d) for d in seen):
+        dtype = np.result_type(*seen)
+        return np.dtype(np.float64) if profile["missing"] and dtype.kind in "iu" else dtype
+    if all(d == np.dtype(bool) for d in seen):
+        return np.dtype(object) if profile["missing"] else np.dtype(bool)
+    # Numbers mixed with text: the whole column is read as text
+    text = [d for d in seen if not _is_plain_number(d)]
+    if all(str(d) == str(text[0]) for d in text):
+        return text[0]
+    return np.dtype(object)
+
+
+def write_columnar_csv(csv_path: str, out_dir: str, chunk_size: int | None = None) -> None:
+    """
+    Write the sidecar for csv_path (as write_columnar(pd.read_csv(csv_path)) would),
+    reading the CSV chunk_size rows at a time; without chunk_size, all at once.
+
+    Chunked, the CSV is read twice: first to settle each column's dtype and
+    string width, then to fill preallocated memory-mapped .npy files, so
+    memory stays bounded by the chunk size rather than the file.
+    """
+    if not chunk_size:
+        write_columnar(pd.read_csv(csv_path), out_dir, source_csv = csv_path)
+        return
+
+    # Taken first, so a CSV changing underneath leaves the sidecar stale rather than wrong
+    source = _source_signature(csv_path)
+
+    rows = 0
+    profiles: dict[str, dict] = {}
+    for chunk in pd.read_csv(csv_path, chunksize = chunk_size):
+        rows += len(chunk)
+        for name in chunk.columns:
+            series = chunk[name]
+            p = profiles.setdefault(
+                name, {"first": series.dtype, "dtypes": [], "missing": False, "width": 0, "numbers": False}
+            )
+            has_values = bool(series.notna().any())
+            p["missing"] = p["missing"] or not series.notna().all()
+            if not has_values:
+                continue
+            if not any(str(d) == str(series.dtype) for d in p["dtypes"]):
+                p["dtypes"].append(series.dtype)
+            if _is_plain_number(series.dtype):
+                p["numbers"] = True
+            else:
+                p["width"] = max(p["width"], _string_width(series))
+
+    if rows == 0:
+        write_columnar(pd.read_csv(csv_path), out_dir, source_csv = csv_path)
+        return
+
+    dtypes = {name: _whole_file_dtype(p) for name, p in profiles.items()}
+    # Columns of numbers and text are read as text throughout (as the whole-file read
+    # does), which needs another pass for the width of the chunks parsed as numbers
+    mixed = [name for name, p in profiles.items() if p["numbers"] and not _is_stored_as_is(dtypes[name])]
+    as_text = {name: str for name in mixed}
+    if mixed:
+        for chunk in pd.read_csv(csv_path, usecols = mixed, dtype = as_text, chunksize = chunk_size):
+            for name in mixed:
+                profiles[name]["width"] = max(profiles[name]["width"], _string_width(chunk[name]))
+
+    out = Path(out_dir)
+    tmp = _staging_dir(out)
+
+    columns, targets = [], {}
+    for i, (name, dtype) in enumerate(dtypes.items()):
+        entry = {"name": str(name), "dtype": str(dtype), "file": f"{i}.npy"}
+        if _is_stored_as_is(dtype):
+            entry["kind"] = "numeric"
+            targets[name] = (
+                np.lib.format.open_memmap(tmp / entry["file"], mode = "w+", dtype = dtype, shape = (rows,)),
+                None,
+            )
+        else:
+            entry["kind"] = "string"
+            entry["valid_file"] = f"{i}.valid.npy"
+            width = max(profiles[name]["width"], 1)
+            targets[name] = (
+                np.lib.format.open_memmap(tmp / entry["file"], mode = "w+", dtype = f"<U{width}", shape = (rows,)),
+                np.lib.format.open_memmap(tmp / entry["valid_file"], mode = "w+", dtype = bool, shape = (rows,)),
+            )
+        columns.append(entry)
+
+    start = 0
+    for chunk in pd.read_csv(csv_path, dtype = as_text, chunksize = chunk_size):
+        stop = start + len(chunk)
+        for name, (values, valid) in targets.items():
+            series = chunk[name]
+            if valid is None:
+                values[start:stop] = series.to_numpy().astype(values.dtype)
+            else:
+                mask = series.notna().to_numpy()
+                values[start:stop] = np.where(mask, series.astype(str).to_numpy(dtype = object), "")
+                valid[start:stop] = mask
+        start = stop
+
+    # Flush and drop the maps before the directory is renamed into place
+    for values, valid in targets.values():
+        values.flush()
+        if valid is not None:
+            valid.flush()
+    del targets, values, valid
+
+    _finish(tmp, out, rows, columns, source)
+
+
+class ColumnarTable:
+    """
+    Read-only view of a columnar sidecar. Nothing but schema.json is read
+    until a column is requested; numeric columns are memory-mapped, not copied.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.schema = json.loads((self.path / SCHEMA_FILE).read_text(encoding = "utf-8"))
+        if self.schema.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format in {path}: {self.schema.get('format')}")
+        self._columns = {c["name"]: c for c in self.schema["columns"]}
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    @property
+    def num_rows(self) -> int:
+        return self.schema["rows"]
+
+    def is_fresh_for(self, csv_path: str) -> bool:
+        """
+        True if csv_path is unchanged since the sidecar was written from it.
+        """
+        try:
+            return self.schema.get("source") == _source_signature(csv_path)
+        except FileNotFoundError:
+            return False
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        The raw memory-mapped array for a column (strings: fixed-width unicode, '' where missing).
+        """
+        # A plain ndarray view of the memmap, so results of operations on it aren't memmaps
+        return np.load(self.path / self._columns[name]["file"], mmap_mode = "r").view(np.ndarray)
+
+    def column(self, name: str) -> pd.Series:
+        entry = self._columns[name]
+        values = self.array(name)
+
+        if entry["kind"] == "numeric":
+            return pd.Series(values, name = name, copy = False)
+
+        valid = np.load(self.path / entry["valid_file"])
+        objects = values.astype(object)
+        objects[~valid] = np.nan
+        return pd.Series(objects, name = name, dtype = entry["dtype"])
+
+    def to_pandas(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """
+        DataFrame of the requested columns (all by default), with the same
+        dtypes pd.read_csv gives for the source CSV.
+        """
+        names = columns if columns is not None else self.columns
+        return pd.DataFrame({name: self.column(name) for name in names}, copy = False)
+
+
+def read_processed(csv_path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Read a processed CSV, via its memory-mapped columnar sidecar when one
+    exists and is still fresh, otherwise by parsing the CSV.
+    """
+    sidecar = columnar_dir_for(csv_path)
+    if (Path(sidecar) / SCHEMA_FILE).exists():
+        table = ColumnarTable(sidecar)
+        if table.is_fresh_for(csv_path):
+            return table.to_pandas(columns)
+
+    df = pd.read_csv(csv_path, usecols = columns)
+    return df[columns] if columns is not None else df
@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ingestion.loader import ensure_parent_dir
+from ingestion.manifest import hash_columns
+
+
+def key_index_path_for(valid_output_path: str) -> str:
+    """
+    The dedupe key index is kept next to the processed output it describes.
+    """
+    return str(Path(valid_output_path).with_suffix(".keys.npy"))
+
+
+def _integer_values(series: pd.Series) -> np.ndarray | None:
+    """
+    series (no missing values) as int64, or None if it isn't all whole numbers.
+    A float column (ints with NaNs elsewhere in the chunk) still qualifies.
+    """
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.to_numpy(dtype = np.int64)
+
+    values = pd.to_numeric(series, errors = "coerce").to_numpy(dtype = np.float64, na_value = np.nan)
+    if np.isnan(values).any() or (values != np.floor(values)).any():
+        return None
+    return values.astype(np.int64)
+
+
+class KeyIndex:
+    """
+    Sorted array of the dedupe keys already written for a dataset.
+
+    A single integer key column is stored as the int64 values themselves;
+    composite or non-integer keys as uint64 hashes of their text form (the
+    same hashing as the incremental row hashes). Either way it is 8 bytes per
+    key, whatever the width of the rows, and lookups are one np.searchsorted
+    per chunk. Rows with a missing key value are never indexed.
+    """
+
+    def __init__(self, keys: np.ndarray | None = None):
+        self.keys = keys
+
+    @classmethod
+    def load(cls, path: str) -> "KeyIndex":
+        """
+        The index saved at path, or an empty one if there is none yet.
+        """
+        if not Path(path).exists():
+            return cls()
+        return cls(np.load(path))
+
+    def save(self, path: str) -> None:
+        ensure_parent_dir(path)
+        tmp_path = f"{path}.tmp.npy"
+        np.save(tmp_path, self.keys if self.keys is not None else np.array([], dtype = np.int64))
+        os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return 0 if self.keys is None else len(self.keys)
+
+    def encode(self, df: pd.DataFrame, key_columns: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return (keys, present): the encoded key of every row of df, and a mask
+        of the rows whose key has no missing value (only those are encoded
+        meaningfully).
+        """
+        present = df[key_columns].notna().all(axis = 1).to_numpy()
+
+        if len(key_columns) == 1:
+            ints = _integer_values(df[key_columns[0]][present])
+            if ints is not None:
+                keys = np.zeros(len(df), dtype = np.int64)
+                keys[present] = ints
+                return self._check_kind(keys), present
+
+        return self._check_kind(hash_columns(df, key_columns)), present
+
+    def _check_kind(self, keys: np.ndarray) -> np.ndarray:
+        # An empty index takes the kind of the first keys it sees
+        if self.keys is None or (len(self.keys) == 0 and keys.dtype != self.keys.dtype):
+            self.keys = np.array([], dtype = keys.dtype)
+        elif keys.dtype != self.keys.dtype:
+            raise ValueError(
+                f"Dedupe keys are {keys.dtype} but the saved key index holds {self.keys.dtype}; "
+                "the key columns changed type, rerun with a full refresh"
+            )
+        return keys
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask of the keys that are already in the index.
+        """
+        if not len(self):
+            return np.zeros(len(keys), dtype = bool)
+        positions = np.searchsorted(self.keys, keys)
+        found = positions < len(self.keys)
+        found[found] = self.keys[positions[found]] == keys[found]
+        return found
+
+    def add(self, keys: np.ndarray) -> None:
+        """
+        Add keys (which must not be in the index yet) keeping it sorted.
+        """
+        new = np.unique(keys)
+        self.keys = np.insert(self.keys, np.searchsorted(self.keys, new), new) if len(self) else new
@@ -1,5 +1,12 @@
 from pathlib import Path
 import yaml
+from pandas.api.types import pandas_dtype
+
+from ingestion.scheduler import dataset_dependencies, execution_order
+from ingestion.validators import compile_validation_plan
+
+# Supported values for datasets.<name>.load_mode
+LOAD_MODES = ("insert", "copy", "swap")
 
 def load_config(config_path: str = "ingestion/config.yaml") -> dict:
     """
@@ -16,10 +23,37 @@ def validate_config(config: dict) -> None:
 
     if "logging" not in config or "log_dir" not in config["logging"]:
         raise ValueError("Missing 'logging.log_dir' in config")
+
+    if not isinstance(config["logging"].get("report_dir", ""), str):
+        raise ValueError("logging.report_dir must be a path")
     
     if "datasets" not in config or not isinstance(config["datasets"], dict) or not config["datasets"]:
         raise ValueError("Missing or empty 'datasets' section in config")
     
+    max_workers = config.get("scheduler", {}).get("max_workers", 1)
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("scheduler.max_workers must be a positive integer")
+
+    incremental = config.get("incremental", {})
+    if incremental.get("enabled", False) and not isinstance(incremental.get("manifest_path"), str):
+        raise ValueError("incremental.manifest_path must be set when incremental.enabled is true")
+
+    if not isinstance(config.get("columnar_output", {}).get("enabled", False), bool):
+        raise ValueError("columnar_output.enabled must be true or false")
+
+    post_load = config.get("post_load", {})
+    for key in ["sql_scripts", "refresh_views"]:
+        value = post_load.get(key, [])
+        if not isinstance(value, list) or not all(isinstance(x, str) for x in value):
+            raise ValueError(f"post_load.{key} must be a list of strings")
+
+    reload_seasons = post_load.get("reload_seasons", {})
+    if not isinstance(reload_seasons, dict) or not all(
+        isinstance(seasons, list) and all(isinstance(s, int) and not isinstance(s, bool) for s in seasons)
+        for seasons in reload_seasons.values()
+    ):
+        raise ValueError("post_load.reload_seasons must map table names to lists of seasons")
+
     required_dataset_keys = [
         "input_path",
         "valid_output_path",
@@ -49,7 +83,62 @@ def validate_config(config: dict) -> None:
         
         if not isinstance(ds["table_name"], str) or not ds["table_name"].strip():
             raise ValueError(f"datasets.{ds_name}.table_name must be a non-empty string")
+
+        if ds.get("load_mode", "insert") not in LOAD_MODES:
+            raise ValueError(f"datasets.{ds_name}.load_mode must be one of {list(LOAD_MODES)}")
+
+        depends_on = ds.get("depends_on", [])
+        if not isinstance(depends_on, list) or not all(isinstance(x, str) for x in depends_on):
+            raise ValueError(f"datasets.{ds_name}.depends_on must be a list of strings")
+
+        if not isinstance(ds.get("append", False), bool):
+            raise ValueError(f"datasets.{ds_name}.append must be true or false")
+
+        if ds.get("append", False) and ds.get("load_mode") == "swap":
+            raise ValueError(f"datasets.{ds_name}: load_mode swap replaces the table, so it can't be used with append")
+
+        if ds.get("chunk_size") is not None and (not isinstance(ds["chunk_size"], int) or ds["chunk_size"] < 1):
+            raise ValueError(f"datasets.{ds_name}.chunk_size must be a positive integer")
+
+        if "copy_chunk_size" in ds and (not isinstance(ds["copy_chunk_size"], int) or ds["copy_chunk_size"] < 1):
+            raise ValueError(f"datasets.{ds_name}.copy_chunk_size must be a positive integer")
+
+        _validate_parse_schema(ds_name, ds)
+
+        try:
+            compile_validation_plan(ds)
+        except ValueError as e:
+            raise ValueError(f"datasets.{ds_name}: {e}") from e
+
+    # Raises ValueError on unknown depends_on entries or dependency cycles
+    execution_order(dataset_dependencies(config["datasets"]))
         
+def _validate_parse_schema(ds_name: str, ds: dict) -> None:
+    """
+    Check a dataset's parse-time schema: dtypes (raw column -> pandas dtype
+    name), parse_dates and na_values.
+    """
+    dtypes = ds.get("dtypes", {})
+    if not isinstance(dtypes, dict):
+        raise ValueError(f"datasets.{ds_name}.dtypes must be a mapping of column name to dtype")
+
+    for column, dtype in dtypes.items():
+        if not isinstance(column, str) or not isinstance(dtype, str):
+            raise ValueError(f"datasets.{ds_name}.dtypes must map column names to dtype names")
+        try:
+            pandas_dtype(dtype)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"datasets.{ds_name}.dtypes.{column}: unknown dtype '{dtype}'") from e
+
+    for key in ["parse_dates", "na_values"]:
+        value = ds.get(key, [])
+        if not isinstance(value, list) or not all(isinstance(x, str) for x in value):
+            raise ValueError(f"datasets.{ds_name}.{key} must be a list of strings")
+
+    both = [c for c in ds.get("parse_dates", []) if c in dtypes]
+    if both:
+        raise ValueError(f"datasets.{ds_name}: columns in both dtypes and parse_dates: {both}")
+
 def ensure_parent_dir(path_str: str) -> None:
     """
     Create the parent directory for a file path if it doesn't exist.
@@ -2,12 +2,14 @@ import logging
 from pathlib import Path
 from datetime import datetime
 
-def setup_logger(config) -> logging.Logger:
+def setup_logger(config, log_path: str | None = None) -> logging.Logger:
     log_dir = config["logging"]["log_dir"]
     Path(log_dir).mkdir(parents = True, exist_ok = True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_path = Path(log_dir) / f"ingestion_{timestamp}.log"
+    # Worker processes pass the parent's log_path so everything lands in one file
+    if log_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_path = Path(log_dir) / f"ingestion_{timestamp}.log"
 
     logger = logging.getLogger("ingestion")
     logger.setLevel(logging.INFO)
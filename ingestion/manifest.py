@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ingestion.loader import ensure_parent_dir
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def load_manifest(manifest_path: str) -> dict:
+    """
+    Load the ingestion manifest, or an empty one if it doesn't exist yet.
+    """
+    path = Path(manifest_path)
+    if not path.exists():
+        return {"datasets": {}}
+
+    with open(path, "r", encoding = "utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest_path: str, manifest: dict) -> None:
+    """
+    Write the manifest atomically (temp file + rename) so a crash never leaves half a file.
+    """
+    ensure_parent_dir(manifest_path)
+    tmp_path = f"{manifest_path}.tmp"
+
+    with open(tmp_path, "w", encoding = "utf-8") as f:
+        json.dump(manifest, f, indent = 2, sort_keys = True)
+
+    os.replace(tmp_path, manifest_path)
+
+
+def config_hash(ds: dict) -> str:
+    """
+    Hash of a dataset's config section. Any config change forces a full reload.
+    """
+    return hashlib.sha256(json.dumps(ds, sort_keys = True, default = str).encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(path: str, with_hash: bool = True) -> dict:
+    """
+    Size, mtime and (optionally) sha256 of an input file.
+    """
+    stat = os.stat(path)
+    fingerprint = {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        fingerprint["sha256"] = digest.hexdigest()
+
+    return fingerprint
+
+
+def check_unchanged(entry: dict | None, ds: dict) -> tuple[bool, dict]:
+    """
+    Compare a dataset's input and config against its previous manifest entry.
+
+    Size + mtime equal means unchanged without reading the file; otherwise the
+    content hash decides (a touched but identical file is still unchanged).
+    Returns (unchanged, current_fingerprint).
+    """
+    input_path = ds["input_path"]
+
+    if entry is None or entry.get("config_hash") != config_hash(ds):
+        return False, file_fingerprint(input_path)
+
+    outputs = [ds["valid_output_path"], ds["rejected_output_path"], entry.get("row_hashes_path", "")]
+    if not all(Path(p).exists() for p in outputs):
+        return False, file_fingerprint(input_path)
+
+    previous = entry["input"]
+    quick = file_fingerprint(input_path, with_hash = False)
+    if quick["size"] == previous["size"] and quick["mtime"] == previous["mtime"]:
+        return True, previous
+
+    current = file_fingerprint(input_path)
+    return current["sha256"] == previous["sha256"], current
+
+
+def make_entry(ds: dict, fingerprint: dict, row_hashes_path: str) -> dict:
+    return {
+        "input": fingerprint,
+        "config_hash": config_hash(ds),
+        "row_hashes_path": row_hashes_path,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def row_hashes_path_for(valid_output_path: str) -> str:
+    """
+    Row hashes are kept next to the processed output they describe.
+    """
+    return str(Path(valid_output_path).with_suffix(".rowhash.npz"))
+
+
+def hash_columns(df: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    # Hash the text form so 1 and 1.0 hash the same whatever dtype a chunk inferred
+    text = df[columns].astype(str).apply(lambda s: s.str.replace(r"\.0$", "", regex = True))
+    return pd.util.hash_pandas_object(text, index = False).to_numpy(dtype = np.uint64)
+
+
+def row_hashes(df: pd.DataFrame, key_columns: list[str], columns: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return (key_hashes, row_hashes) for df: one uint64 per row for the key and
+    one for the full set of loaded columns.
+    """
+    return hash_columns(df, key_columns), hash_columns(df, columns)
+
+
+def load_row_hashes(path: str) -> tuple[np.ndarray, np.ndarray]:
+    with np.load(path) as data:
+        return data["keys"], data["rows"]
+
+
+def save_row_hashes(path: str, keys: np.ndarray, rows: np.ndarray) -> None:
+    ensure_parent_dir(path)
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, keys = keys, rows = rows)
+    os.replace(tmp_path, path)
+
+
+def changed_rows_mask(
+        keys: np.ndarray, rows: np.ndarray, previous_keys: np.ndarray, previous_rows: np.ndarray
+) -> np.ndarray:
+    """
+    Boolean mask of rows that are new (key not seen before) or modified (same
+    key, different row hash) compared to the previous run.
+    """
+    if len(previous_keys) == 0:
+        return np.ones(len(keys), dtype = bool)
+
+    # Keys are unique after dedupe; guard against hash collisions anyway
+    unique = ~pd.Index(previous_keys).duplicated(keep = "last")
+    previous_keys, previous_rows = previous_keys[unique], previous_rows[unique]
+
+    positions = pd.Index(previous_keys).get_indexer(keys)
+    is_new = positions == -1
+
+    changed = is_new.copy()
+    changed[~is_new] = previous_rows[positions[~is_new]] != rows[~is_new]
+    return changed
@@ -0,0 +1,210 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_FORMAT = 1
+
+# Regressions smaller than this are timer noise, however large in relative terms
+MIN_REGRESSION_SECONDS = 0.05
+
+# Linux: writing "5" to clear_refs resets the process's peak RSS (VmHWM in status)
+PROC_CLEAR_REFS = "/proc/self/clear_refs"
+PROC_STATUS = "/proc/self/status"
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Restart the peak RSS measurement; False where the OS can't (the peak then
+    covers the whole process so far).
+    """
+    try:
+        with open(PROC_CLEAR_REFS, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_bytes() -> int | None:
+    try:
+        with open(PROC_STATUS, "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    if resource is None:
+        return None
+    # ru_maxrss: KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def file_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+class DatasetMetrics:
+    """
+    Per-stage wall time and row counts for one dataset's ingestion, plus bytes
+    read/written and peak memory.
+
+    Peak memory is the process's peak resident set size. On Linux it is reset
+    when the dataset starts, so datasets run one after another in the same
+    worker are measured separately (peak_rss_scope "dataset"); elsewhere it is
+    the worker's peak so far (scope "process").
+    """
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._rss_scope = "dataset" if _reset_peak_rss() else "process"
+        self._started = time.perf_counter()
+
+    def add(self, stage: str, seconds: float, rows: int = 0) -> None:
+        entry = self.stages.setdefault(stage, {"seconds": 0.0, "rows": 0})
+        entry["seconds"] += seconds
+        entry["rows"] += rows
+
+    @contextmanager
+    def stage(self, stage: str, rows: int = 0):
+        """
+        Time the block as part of stage (rows: rows the stage processed).
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started, rows)
+
+    def timed(self, stage: str, frames):
+        """
+        Yield from frames, timing each step (e.g. reading the next CSV chunk) as stage.
+        """
+        frames = iter(frames)
+        while True:
+            started = time.perf_counter()
+            try:
+                df = next(frames)
+            except StopIteration:
+                self.add(stage, time.perf_counter() - started)
+                return
+            self.add(stage, time.perf_counter() - started, len(df))
+            yield df
+
+    def seconds(self, stage: str) -> float:
+        return self.stages.get(stage, {}).get("seconds", 0.0)
+
+    def finish(self) -> dict:
+        """
+        The JSON-ready metrics so far.
+        """
+        return {
+            "seconds": round(time.perf_counter() - self._started, 4),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "peak_rss_scope": self._rss_scope,
+            "stages": {
+                name: {
+                    "seconds": round(s["seconds"], 4),
+                    "rows": s["rows"],
+                    "rows_per_sec": round(s["rows"] / s["seconds"]) if s["seconds"] > 0 else None,
+                }
+                for name, s in self.stages.items()
+            },
+        }
+
+
+def report_path_for(report_dir: str, log_path: str | None) -> str:
+    """
+    data/reports/ingestion_<timestamp>.json, named after the run's log file.
+    """
+    stem = Path(log_path).stem if log_path else time.strftime("ingestion_%Y%m%d_%H%M%S")
+    return str(Path(report_dir) / f"{stem}.json")
+
+
+def write_report(path: str, report: dict) -> None:
+    Path(path).parent.mkdir(parents = True, exist_ok = True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding = "utf-8") as f:
+        json.dump({"format": REPORT_FORMAT, **report}, f, indent = 2, default = str)
+    os.replace(tmp_path, path)
+
+
+def load_report(path: str) -> dict:
+    with open(path, "r", encoding = "utf-8") as f:
+        report = json.load(f)
+    if report.get("format") != REPORT_FORMAT:
+        raise ValueError(f"Unsupported run report format in {path}: {report.get('format')}")
+    return report
+
+
+def _measures(report: dict) -> dict[tuple[str, str], float]:
+    """
+    (dataset, measure) -> value for everything diff_reports compares.
+    Datasets skipped as unchanged did no work, so there is nothing to compare.
+    """
+    values = {}
+    for name, ds in report.get("datasets", {}).items():
+        metrics = ds.get("metrics")
+        if not metrics or ds.get("counts", {}).get("skipped"):
+            continue
+        values[(name, "seconds")] = metrics["seconds"]
+        if metrics.get("peak_rss_bytes") is not None and metrics.get("peak_rss_scope") == "dataset":
+            values[(name, "peak_rss_bytes")] = metrics["peak_rss_bytes"]
+        for stage, s in metrics["stages"].items():
+            values[(name, f"{stage}.seconds")] = s["seconds"]
+    return values
+
+
+def diff_reports(before: dict, after: dict, threshold: float = 0.2) -> list[dict]:
+    """
+    Compare two run reports measure by measure (dataset and stage seconds,
+    peak memory) for datasets present in both. A measure regressed if it grew
+    by more than threshold (0.2 = 20%); for times, also by more than
+    MIN_REGRESSION_SECONDS.
+    """
+    a, b = _measures(before), _measures(after)
+    rows = []
+    for key in sorted(a.keys() & b.keys()):
+        old, new = a[key], b[key]
+        change = (new - old) / old if old else None
+        grew = new > old * (1 + threshold) if old else new > 0
+        if key[1].endswith("seconds"):
+            grew = grew and new - old > MIN_REGRESSION_SECONDS
+        rows.append({
+            "dataset": key[0],
+            "measure": key[1],
+            "before": old,
+            "after": new,
+            "change": change,
+            "regression": grew,
+        })
+    return rows
+
+
+def _format_value(measure: str, value: float) -> str:
+    return f"{value / 2**20:.1f} MiB" if measure.endswith("bytes") else f"{value:.3f}s"
+
+
+def format_diff(rows: list[dict]) -> str:
+    lines = [f"{'dataset':<24} {'measure':<26} {'before':>12} {'after':>12} {'change':>8}"]
+    for r in rows:
+        change = f"{r['change']:+.0%}" if r["change"] is not None else "n/a"
+        flag = "  REGRESSION" if r["regression"] else ""
+        lines.append(
+            f"{r['dataset']:<24} {r['measure']:<26} {_format_value(r['measure'], r['before']):>12} "
+            f"{_format_value(r['measure'], r['after']):>12} {change:>8}{flag}"
+        )
+    return "\n".join(lines)
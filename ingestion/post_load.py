@@ -0,0 +1,74 @@
+import logging
+import time
+from pathlib import Path
+
+from psycopg2 import sql
+
+
+def run_sql_script(conn, script_path: str) -> None:
+    """
+    Execute a SQL file (e.g. infra/sql/02_core_schema.sql) in the current transaction.
+    """
+    with conn.cursor() as cur:
+        cur.execute(Path(script_path).read_text(encoding = "utf-8"))
+
+
+def refresh_materialized_view(conn, view_name: str) -> bool:
+    """
+    REFRESH MATERIALIZED VIEW CONCURRENTLY schema.view, so readers keep seeing
+    the old rows until the new ones are ready. Returns False if the view does not exist.
+    """
+    schema, _, name = view_name.rpartition(".")
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s)", (view_name,))
+        if cur.fetchone()[0] is None:
+            return False
+
+        cur.execute(
+            sql.SQL("REFRESH MATERIALIZED VIEW CONCURRENTLY {}").format(
+                sql.Identifier(schema, name) if schema else sql.Identifier(name)
+            )
+        )
+    return True
+
+
+def reload_season(conn, table: str, season: int) -> int:
+    """
+    Replace one season's partition of core.<table> with that season's rows
+    from staging (core.reload_season in infra/sql/02_core_schema.sql), in the
+    current transaction. Returns the number of rows loaded.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT core.reload_season(%s, %s)", (table, season))
+        return cur.fetchone()[0]
+
+
+def run_post_load(conn, post_load: dict, logger: logging.Logger) -> None:
+    """
+    Run post_load.sql_scripts in order, then rebuild the seasons listed in
+    post_load.reload_seasons ({table: [season, ...]}) from staging, then
+    refresh post_load.refresh_views. Each step is committed on its own so a
+    slow refresh doesn't hold earlier work.
+    """
+    for script_path in post_load.get("sql_scripts", []):
+        start = time.perf_counter()
+        run_sql_script(conn, script_path)
+        conn.commit()
+        logger.info(f"Post-load script {script_path} done in {time.perf_counter() - start:.2f}s")
+
+    for table, seasons in post_load.get("reload_seasons", {}).items():
+        for season in seasons:
+            start = time.perf_counter()
+            loaded = reload_season(conn, table, season)
+            conn.commit()
+            logger.info(f"Reloaded core.{table} season {season}: {loaded} rows in {time.perf_counter() - start:.2f}s")
+
+    for view_name in post_load.get("refresh_views", []):
+        start = time.perf_counter()
+        if refresh_materialized_view(conn, view_name):
+            conn.commit()
+            logger.info(f"Refreshed {view_name} in {time.perf_counter() - start:.2f}s")
+        else:
+            conn.rollback()
+            logger.warning(f"Materialized view {view_name} does not exist; run infra/sql/04_analytics_views.sql")
@@ -1,19 +1,61 @@
 # Testing to see if we can read the data
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
-from ingestion.validators import validate_required_columns, split_valid_rejects_by_required_not_null
+from ingestion.validators import validate_required_columns, compile_validation_plan
 from ingestion.loader import load_config, validate_config, ensure_parent_dir
 from ingestion.logging_utils import setup_logger
-from ingestion.cleaners import deduplicate
+from ingestion.cleaners import deduplicate_against_index, record_keys
+from ingestion.key_index import KeyIndex, key_index_path_for
+from ingestion.scheduler import dataset_dependencies, run_with_dependencies
+from ingestion import manifest as mf
+from ingestion.columnar import SCHEMA_FILE, ColumnarTable, columnar_dir_for, write_columnar_csv
+from ingestion.post_load import run_post_load
+from ingestion.metrics import DatasetMetrics, file_size, report_path_for, write_report
 
-from backend.db import get_conn
-from backend.load_csvs_postgres import load_dataframe_to_postgres
+from backend.db import connection
+from backend.data_version import record_ingestion_run
+from backend.load_csvs_postgres import (
+    load_dataframe_to_postgres,
+    copy_dataframe_to_postgres,
+    upsert_dataframe_to_postgres,
+    create_shadow_table,
+    swap_in_shadow_table
+)
 
 
-def _apply_dataset_transforms(dataset_name: str, ds: dict, df: pd.DataFrame) -> pd.DataFrame:
-    df = df.replace(r"\\N", np.nan, regex=True)
+# Missing-value marker in the raw Ergast files, on top of pandas' defaults ("", "NA", ...)
+RAW_NA_VALUES = [r"\N"]
+
 
+def _read_csv_options(ds: dict) -> dict:
+    """
+    pd.read_csv arguments for a dataset's raw input: its declared dtypes and
+    date columns, RAW_NA_VALUES as missing, and only the raw columns it requires or keeps.
+    """
+    options = {
+        "dtype": ds.get("dtypes") or None,
+        "parse_dates": ds.get("parse_dates") or None,
+        "na_values": ds.get("na_values", RAW_NA_VALUES),
+    }
+
+    keep_columns = ds.get("keep_columns")
+    if keep_columns:
+        raw_names = {new: old for old, new in ds.get("rename_map", {}).items()}
+        wanted = set(ds["required_columns"]) | {raw_names.get(c, c) for c in keep_columns}
+        # A callable (not a list) so a missing column is reported by validate_required_columns
+        options["usecols"] = lambda c: c in wanted
+
+    return options
+
+def _apply_dataset_transforms(dataset_name: str, ds: dict, df: pd.DataFrame) -> pd.DataFrame:
     rename_map = ds.get("rename_map", {})
     if rename_map:
         df = df.rename(columns=rename_map)
@@ -22,92 +64,419 @@ def _apply_dataset_transforms(dataset_name: str, ds: dict, df: pd.DataFrame) ->
     if keep_columns:
         df = df[[c for c in keep_columns if c in df.columns]]
 
-    if dataset_name == "results":
-        if "position" in df.columns:
-            df["position"] = pd.to_numeric(df["position"], errors="coerce")
-        if "points" in df.columns:
-            df["points"] = pd.to_numeric(df["points"], errors="coerce")
-
     return df
 
-def run_all_ingestion(config_path: str = "./ingestion/config.yaml", load_datasets_to_db: bool = True) -> None:
+def _load_valid_rows(ds: dict, df: pd.DataFrame, conn, truncate_first: bool, table_name: str | None = None) -> int:
+    """
+    Load rows into the dataset's staging table (or table_name, e.g. its shadow
+    table) using its configured load_mode. "swap" loads with COPY like "copy".
+    Nothing is committed; ingest_dataset commits once every chunk is in.
+    """
+    if ds.get("load_mode", "insert") in ("copy", "swap"):
+        return copy_dataframe_to_postgres(
+            df = df,
+            conn = conn,
+            table_name = table_name or ds["table_name"],
+            columns = ds["db_columns"],
+            chunk_size = ds.get("copy_chunk_size", 50000),
+            truncate_first = truncate_first,
+            commit = False
+        )
+
+    return load_dataframe_to_postgres(
+        df = df,
+        conn = conn,
+        table_name = table_name or ds["table_name"],
+        columns = ds["db_columns"],
+        page_size = 1000,
+        truncate_first = truncate_first,
+        commit = False
+    )
+
+@contextmanager
+def _restore_appended_outputs_on_error(output_sizes_before: dict[str, int], append_outputs: dict[str, bool], append: bool):
+    """
+    If the block fails, cut appended outputs back to their size before this
+    run (and remove ones this run created), so no rows stay in them whose keys
+    never made it into the saved key index.
+    """
+    try:
+        yield
+    except BaseException:
+        if append:
+            for path, size in output_sizes_before.items():
+                if append_outputs[path]:
+                    os.truncate(path, size)
+                elif Path(path).exists():
+                    os.remove(path)
+        raise
+
+def _iter_input_frames(input_path: str, chunk_size: int | None, read_options: dict | None = None):
+    """
+    Yield the raw input as DataFrames: the whole file at once, or chunk_size
+    rows at a time when a chunk size is configured. read_options are passed
+    on to pd.read_csv.
+    """
+    read_options = read_options or {}
+    try:
+        if chunk_size:
+            reader = pd.read_csv(input_path, chunksize = chunk_size, **read_options)
+        else:
+            reader = [pd.read_csv(input_path, **read_options)]
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Input file not found at: {input_path}") from e
+
+    for df in reader:
+        yield df
+
+def _write_columnar_sidecar(dataset_name: str, valid_output_path: str, chunk_size: int | None, logger) -> None:
+    # Built from the finished CSV so readers get exactly what pd.read_csv would give them,
+    # read back in the dataset's chunks so a chunked dataset never holds the whole file
+    sidecar = columnar_dir_for(valid_output_path)
+    write_columnar_csv(valid_output_path, sidecar, chunk_size = chunk_size)
+    logger.info(f"{dataset_name}: Columnar copy -> {sidecar}")
+
+def _ensure_columnar(dataset_name: str, valid_output_path: str, chunk_size: int | None, logger) -> None:
+    sidecar = columnar_dir_for(valid_output_path)
+    if Path(sidecar, SCHEMA_FILE).exists() and ColumnarTable(sidecar).is_fresh_for(valid_output_path):
+        return
+    if Path(valid_output_path).exists():
+        _write_columnar_sidecar(dataset_name, valid_output_path, chunk_size, logger)
+
+def ingest_dataset(
+        dataset_name: str,
+        ds: dict,
+        logger,
+        load_datasets_to_db: bool = True,
+        incremental: bool = False,
+        previous_entry: dict | None = None,
+        columnar_output: bool = False,
+        full_refresh: bool = False
+) -> dict:
+    """
+    Run one dataset through read -> transform -> dedupe -> validate -> write -> DB load.
+
+    With chunk_size set, each chunk goes through every stage in turn and the
+    outputs are appended as it goes, so memory stays bounded by the chunk size.
+
+    With incremental set, previous_entry (the dataset's manifest entry from the
+    last run) decides what to do: unchanged input + config skips the dataset,
+    changed input upserts only new/modified rows, anything else is a full reload.
+    Rows that disappear from the input are not deleted from the table.
+
+    With append set in the dataset config, each run's input is a new batch:
+    outputs are appended to and the table isn't truncated, and rows whose key
+    was written by an earlier run are dropped as duplicates (via the key index
+    saved next to the valid output). Otherwise, or with full_refresh, the key
+    index and outputs are rebuilt from this run's input. The index is saved
+    once the DB load is committed; if the run fails before that, the appended
+    outputs are cut back to where they were.
+
+    With load_mode "swap", a full reload goes into an unlogged shadow table
+    that replaces the staging table in one rename once every chunk is in.
+
+    With columnar_output set, a memory-mappable columnar copy of the valid
+    output is written next to it (see ingestion/columnar.py).
+    Returns the row counts for the dataset, its per-stage metrics (see
+    ingestion/metrics.py), plus its new manifest_entry when incremental.
+    """
+    input_path = ds["input_path"]
+    valid_output_path = ds["valid_output_path"]
+    rejected_output_path = ds["rejected_output_path"]
+    table_name = ds["table_name"]
+
+    required_columns = ds["required_columns"]
+    dedupe_keys = ds["dedupe_keys"]
+    chunk_size = ds.get("chunk_size")
+    load_mode = ds.get("load_mode", "insert")
+    append = ds.get("append", False) and not full_refresh
+
+    ensure_parent_dir(valid_output_path)
+    ensure_parent_dir(rejected_output_path)
+
+    logger.info(f"--- Starting ingestion: {dataset_name} ---")
+    logger.info(f"Reading: {input_path}" + (f" in chunks of {chunk_size} rows" if chunk_size else ""))
+
+    # Row rules (dedupe keys not null + the dataset's validation section), checked in one pass per chunk
+    plan = compile_validation_plan(ds)
+    rejects_by_rule: dict[str, int] = {}
+
+    counts = {"raw_rows": 0, "valid_rows": 0, "rejected_rows": 0, "inserted_rows": 0, "skipped": False}
+    # Dedupe keys written so far: this run's chunks, plus earlier runs when appending
+    key_index_path = key_index_path_for(valid_output_path)
+    key_index = KeyIndex.load(key_index_path) if append else KeyIndex()
+    append_outputs = {p: append and Path(p).exists() for p in [valid_output_path, rejected_output_path]}
+    shadow_table = None
+    metrics = DatasetMetrics()
+    output_sizes_before = {p: file_size(p) if append_outputs[p] else 0 for p in append_outputs}
+
+    delta = False
+    if incremental:
+        unchanged, fingerprint = mf.check_unchanged(previous_entry, ds)
+        if unchanged:
+            logger.info(f"{dataset_name}: input and config unchanged since last run, skipping")
+            if columnar_output:
+                _ensure_columnar(dataset_name, valid_output_path, chunk_size, logger)
+            counts["skipped"] = True
+            counts["manifest_entry"] = {**previous_entry, "input": fingerprint}
+            counts["metrics"] = metrics.finish()
+            return counts
+
+        row_hashes_path = mf.row_hashes_path_for(valid_output_path)
+        delta = (
+            not append
+            and previous_entry is not None
+            and previous_entry.get("config_hash") == mf.config_hash(ds)
+            and Path(row_hashes_path).exists()
+        )
+        if delta:
+            previous_keys, previous_rows = mf.load_row_hashes(row_hashes_path)
+            logger.info(f"{dataset_name}: input changed, loading new/modified rows only")
+
+        key_hash_parts, row_hash_parts = [], []
+
+    with (
+        _restore_appended_outputs_on_error(output_sizes_before, append_outputs, append),
+        (connection() if load_datasets_to_db else nullcontext()) as conn
+    ):
+        frames = _iter_input_frames(input_path, chunk_size, _read_csv_options(ds))
+        for chunk_no, df in enumerate(metrics.timed("read", frames)):
+            first_chunk = chunk_no == 0
+            counts["raw_rows"] += len(df)
+
+            if first_chunk:
+                logger.info(f"{dataset_name}: Raw columns: {list(df.columns)}")
+
+            with metrics.stage("transform", len(df)):
+                # Validate required columns
+                validate_required_columns(df, required_columns)
+
+                # Apply the transformations
+                df = _apply_dataset_transforms(dataset_name, ds, df)
+
+            if first_chunk:
+                logger.info(f"{dataset_name}: Transformed columns: {list(df.columns)}")
+
+            missing_keys = [c for c in dedupe_keys if c not in df.columns]
+            if missing_keys:
+                raise ValueError(
+                    f"{dataset_name}: dedupe_keys not found after transforms: {missing_keys}. "
+                    f"Available columns: {list(df.columns)}"
+                )
+
+            # Deduplicate (after transforms, so keys match final column names),
+            # also against keys already written by earlier chunks (and runs, when appending)
+            with metrics.stage("dedupe", len(df)):
+                df = deduplicate_against_index(df, dedupe_keys, key_index)
+
+            with metrics.stage("validate", len(df)):
+                valid_df, rejects_df, rule_counts = plan.split(df)
+            del df
+            # Only written rows claim their key: a rejected row's key can still come in corrected
+            record_keys(valid_df, dedupe_keys, key_index)
+            for rule, n in rule_counts.items():
+                rejects_by_rule[rule] = rejects_by_rule.get(rule, 0) + n
+
+            with metrics.stage("write", len(valid_df) + len(rejects_df)):
+                for out_df, out_path in [(valid_df, valid_output_path), (rejects_df, rejected_output_path)]:
+                    fresh_file = first_chunk and not append_outputs[out_path]
+                    out_df.to_csv(out_path, index = False, mode = "w" if fresh_file else "a", header = fresh_file)
+
+            counts["valid_rows"] += len(valid_df)
+            counts["rejected_rows"] += len(rejects_df)
+
+            if incremental:
+                with metrics.stage("row_hashes", len(valid_df)):
+                    key_hashes, row_hashes = mf.row_hashes(valid_df, ds["key_columns"], ds["db_columns"])
+                key_hash_parts.append(key_hashes)
+                row_hash_parts.append(row_hashes)
+
+            # DB load: All datasets now (truncate once, then append each chunk), all in one
+            # transaction, so a failure part way leaves the table as it was
+            if conn is not None:
+                started, inserted_before = time.perf_counter(), counts["inserted_rows"]
+                if delta:
+                    changed = mf.changed_rows_mask(key_hashes, row_hashes, previous_keys, previous_rows)
+                    counts["inserted_rows"] += upsert_dataframe_to_postgres(
+                        df = valid_df[changed],
+                        conn = conn,
+                        table_name = table_name,
+                        columns = ds["db_columns"],
+                        key_columns = ds["key_columns"],
+                        commit = False
+                    )
+                elif load_mode == "swap":
+                    if first_chunk:
+                        shadow_table = create_shadow_table(conn, table_name)
+                    counts["inserted_rows"] += _load_valid_rows(
+                        ds, valid_df, conn, truncate_first = False, table_name = shadow_table
+                    )
+                else:
+                    counts["inserted_rows"] += _load_valid_rows(
+                        ds, valid_df, conn, truncate_first = first_chunk and not append
+                    )
+                metrics.add("load", time.perf_counter() - started, counts["inserted_rows"] - inserted_before)
+
+        if shadow_table is not None:
+            with metrics.stage("load"):
+                swap_in_shadow_table(conn, table_name, shadow_table)
+            logger.info(f"{dataset_name}: Swapped {shadow_table} in as {table_name}")
+        elif conn is not None:
+            with metrics.stage("load"):
+                conn.commit()
+
+        # Saved with the load committed, so the index never lists keys the table and outputs lack
+        key_index.save(key_index_path)
+
+    logger.info(f"{dataset_name}: Valid rows: {counts['valid_rows']} -> {valid_output_path}")
+    logger.info(f"{dataset_name}: Rejected rows: {counts['rejected_rows']} -> {rejected_output_path}")
+    for rule, n in rejects_by_rule.items():
+        logger.info(f"{dataset_name}: Rejected by {rule}: {n}")
+
+    if columnar_output:
+        with metrics.stage("columnar", counts["valid_rows"]):
+            _write_columnar_sidecar(dataset_name, valid_output_path, chunk_size, logger)
+
+    if load_datasets_to_db:
+        load_seconds = metrics.seconds("load")
+        rate = counts["inserted_rows"] / load_seconds if load_seconds > 0 else 0.0
+        logger.info(
+            f"DB load complete ({table_name}, mode={load_mode}). Inserted rows: {counts['inserted_rows']} "
+            f"in {load_seconds:.2f}s ({rate:,.0f} rows/sec)"
+        )
+
+    if incremental:
+        mf.save_row_hashes(
+            row_hashes_path,
+            np.concatenate(key_hash_parts) if key_hash_parts else np.array([], dtype = np.uint64),
+            np.concatenate(row_hash_parts) if row_hash_parts else np.array([], dtype = np.uint64)
+        )
+        counts["manifest_entry"] = mf.make_entry(ds, fingerprint, row_hashes_path)
+
+    metrics.bytes_read = file_size(input_path)
+    metrics.bytes_written = sum(file_size(p) - size for p, size in output_sizes_before.items())
+    counts["metrics"] = metrics.finish()
+    logger.info(
+        f"{dataset_name}: " + ", ".join(f"{stage} {s['seconds']:.2f}s" for stage, s in counts["metrics"]["stages"].items())
+    )
+
+    logger.info(f"--- Finished ingestion: {dataset_name} ---")
+    return counts
+
+def _ingest_dataset_worker(
+        dataset_name: str,
+        config_path: str,
+        load_datasets_to_db: bool,
+        log_path: str | None,
+        incremental: bool,
+        manifest: dict,
+        full_refresh: bool = False
+) -> dict:
+    """
+    Scheduler task: ingest one dataset, in this process or in a pool worker.
+    Each call opens its own DB connection inside ingest_dataset.
+    """
+    config = load_config(config_path)
+
+    logger = logging.getLogger("ingestion")
+    if not logger.handlers:
+        logger = setup_logger(config, log_path = log_path)
+
+    return ingest_dataset(
+        dataset_name,
+        config["datasets"][dataset_name],
+        logger,
+        load_datasets_to_db,
+        incremental = incremental,
+        previous_entry = manifest["datasets"].get(dataset_name),
+        columnar_output = config.get("columnar_output", {}).get("enabled", False),
+        full_refresh = full_refresh
+    )
+
+def run_all_ingestion(
+        config_path: str = "./ingestion/config.yaml",
+        load_datasets_to_db: bool = True,
+        full_refresh: bool = False,
+        logger: logging.Logger | None = None
+) -> str:
+    """
+    Ingest every configured dataset, run the post-load steps and record the
+    run. Returns the path of the JSON run report (per-dataset counts and
+    per-stage metrics), written to logging.report_dir next to the run's log.
+
+    logger is the caller's logger from setup_logger, if it has one; otherwise
+    the run sets up its own.
+    """
+    started_at = datetime.now(timezone.utc)
+    run_started = time.perf_counter()
     config = load_config(config_path)
     validate_config(config)
-    logger = setup_logger(config)
-
-    for dataset_name, ds in config["datasets"].items():
-        input_path = ds["input_path"]
-        valid_output_path = ds["valid_output_path"]
-        rejected_output_path = ds["rejected_output_path"]
-        table_name = ds["table_name"]
-
-        required_columns = ds["required_columns"]
-        dedupe_keys = ds["dedupe_keys"]
-        db_columns = ds["db_columns"]
-
-        ensure_parent_dir(valid_output_path)
-        ensure_parent_dir(rejected_output_path)
-
-        logger.info(f"--- Starting ingestion: {dataset_name} ---")
-        logger.info(f"Reading: {input_path}")
-
-        # Read CSV
-        try:
-            df = pd.read_csv(input_path)
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"Input file not found at: {input_path}") from e
-        
-        logger.info(f"{dataset_name}: Raw columns: {list(df.columns)}")
-        
-        # Validate required columns
-        validate_required_columns(df, required_columns)
-
-        # Apply the transformations
-        df = _apply_dataset_transforms(dataset_name, ds, df)
-
-        logger.info(f"{dataset_name}: Transformed columns: {list(df.columns)}")
-
-        missing_keys = [c for c in dedupe_keys if c not in df.columns]
-        if missing_keys:
-            raise ValueError(
-                f"{dataset_name}: dedupe_keys not found after transforms: {missing_keys}. "
-                f"Available columns: {list(df.columns)}"
-            )
-
-        # Deduplicate (after transforms, so keys match final column names)
-        df = deduplicate(df, dedupe_keys)
-
-        # Required not null: use the dedupe keys for every dataset
-        required_not_null = dedupe_keys.copy()
-        if dataset_name == "results":
-            required_not_null += ["points"]
-        
-        valid_df, rejects_df = split_valid_rejects_by_required_not_null(df, required_not_null)
-
-        valid_df.to_csv(valid_output_path, index = False)
-        rejects_df.to_csv(rejected_output_path, index = False)
-
-        logger.info(f"{dataset_name}: Valid rows: {len(valid_df)} -> {valid_output_path}")
-        logger.info(f"{dataset_name}: Rejected rows: {len(rejects_df)} -> {rejected_output_path}")
-
-        # DB load: All datasets now
-        if load_datasets_to_db:
-            logger.info(f"Loading {len(valid_df)} valid rows into DB table: {table_name}")
-
-            conn = get_conn()
-            try:
-                inserted = load_dataframe_to_postgres(
-                    df = valid_df,
-                    conn = conn,
-                    table_name = table_name,
-                    columns = db_columns,
-                    page_size = 1000,
-                    truncate_first = True
-                )
-                
-                logger.info(f"DB load complete. Inserted rows: {inserted}")
-            finally:
-                conn.close()
-        
-        logger.info(f"--- Finished ingestion: {dataset_name} ---")
-    logger.info("All dataset ingestions complete.")
\ No newline at end of file
+    if logger is None:
+        logger = setup_logger(config)
+
+    max_workers = config.get("scheduler", {}).get("max_workers", 1)
+    log_path = next((h.baseFilename for h in logger.handlers if isinstance(h, logging.FileHandler)), None)
+
+    # Incremental runs need the DB load to stay in step with the manifest
+    incremental_cfg = config.get("incremental", {})
+    incremental = incremental_cfg.get("enabled", False) and load_datasets_to_db
+    manifest_path = incremental_cfg.get("manifest_path")
+    manifest = mf.load_manifest(manifest_path) if incremental and not full_refresh else {"datasets": {}}
+
+    logger.info(f"Scheduling {len(config['datasets'])} datasets with up to {max_workers} worker(s)")
+
+    results = run_with_dependencies(
+        dataset_dependencies(config["datasets"]),
+        _ingest_dataset_worker,
+        task_args = (config_path, load_datasets_to_db, log_path, incremental, manifest, full_refresh),
+        max_workers = max_workers
+    )
+
+    report_datasets = {}
+    for dataset_name, counts in results.items():
+        entry = counts.pop("manifest_entry", None)
+        if entry is not None:
+            manifest["datasets"][dataset_name] = entry
+        metrics = counts.pop("metrics", None)
+        report_datasets[dataset_name] = {"counts": dict(counts), "metrics": metrics}
+        logger.info(f"{dataset_name}: {counts}")
+
+    if incremental:
+        mf.save_manifest(manifest_path, manifest)
+        logger.info(f"Manifest written: {manifest_path}")
+
+    changed = any(not counts.get("skipped") for counts in results.values())
+    post_load_seconds = None
+
+    if load_datasets_to_db and not changed:
+        logger.info("No dataset changed; skipping post-load steps and keeping the data version")
+    elif load_datasets_to_db:
+        with connection() as conn:
+            post_load_started = time.perf_counter()
+            run_post_load(conn, config.get("post_load", {}), logger)
+            post_load_seconds = round(time.perf_counter() - post_load_started, 4)
+
+            # New data version: API response caches, ETags and schema catalogs keyed on it go stale
+            run_id = record_ingestion_run(conn, started_at, results, full_refresh = full_refresh)
+            if run_id is None:
+                logger.warning("meta.ingestion_runs does not exist; run infra/sql/05_metadata.sql")
+            else:
+                logger.info(f"Recorded ingestion run {run_id}")
+
+    # Without logging.report_dir, reports go next to the log directory (data/logs -> data/reports)
+    logging_cfg = config["logging"]
+    report_dir = logging_cfg.get("report_dir") or str(Path(logging_cfg["log_dir"]).parent / "reports")
+    report_path = report_path_for(report_dir, log_path)
+    write_report(report_path, {
+        "started_at": started_at.isoformat(),
+        "seconds": round(time.perf_counter() - run_started, 4),
+        "full_refresh": full_refresh,
+        "max_workers": max_workers,
+        "log_path": log_path,
+        "post_load_seconds": post_load_seconds,
+        "datasets": report_datasets,
+    })
+    logger.info(f"Run report written: {report_path}")
+
+    logger.info("All dataset ingestions complete.")
+    return report_path
@@ -0,0 +1,84 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable
+
+
+def dataset_dependencies(datasets: dict) -> dict[str, list[str]]:
+    """
+    Build {dataset_name: [dependency, ...]} from each dataset's depends_on list.
+    """
+    return {name: list(ds.get("depends_on", [])) for name, ds in datasets.items()}
+
+
+def execution_order(dependencies: dict[str, list[str]]) -> list[str]:
+    """
+    Return dataset names so every dataset comes after its dependencies.
+    Ties keep the config order. Raises ValueError on unknown dependencies or cycles.
+    """
+    for name, deps in dependencies.items():
+        unknown = [d for d in deps if d not in dependencies]
+        if unknown:
+            raise ValueError(f"datasets.{name}.depends_on references unknown datasets: {unknown}")
+
+    order: list[str] = []
+    remaining = {name: set(deps) for name, deps in dependencies.items()}
+
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between datasets: {sorted(remaining)}")
+
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    return order
+
+
+def run_with_dependencies(
+        dependencies: dict[str, list[str]],
+        task: Callable[..., Any],
+        task_args: tuple = (),
+        max_workers: int = 1
+) -> dict[str, Any]:
+    """
+    Run task(name, *task_args) for every dataset, starting each one as soon as
+    its dependencies have finished. Independent datasets run at the same time
+    in a process pool of at most max_workers; max_workers <= 1 runs them one
+    by one in this process. Returns {name: task result}.
+
+    If a task fails, nothing new is started, tasks still queued in the pool
+    are cancelled, and the error is raised once the tasks already running
+    have finished.
+    """
+    order = execution_order(dependencies)
+
+    if max_workers <= 1:
+        return {name: task(name, *task_args) for name in order}
+
+    results: dict[str, Any] = {}
+    remaining = {name: set(dependencies[name]) for name in order}
+    running = {}
+
+    with ProcessPoolExecutor(max_workers = max_workers) as pool:
+        while remaining or running:
+            for name in [n for n in order if n in remaining and not remaining[n]]:
+                running[pool.submit(task, name, *task_args)] = name
+                del remaining[name]
+
+            done, _ = wait(running, return_when = FIRST_COMPLETED)
+
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except BaseException:
+                    pool.shutdown(cancel_futures = True)
+                    raise
+
+                for deps in remaining.values():
+                    deps.discard(name)
+
+    return results
@@ -1,5 +1,16 @@
+import re
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
 import pandas as pd
 
+# Column added to rejected rows: the names of every rule the row failed, ";"-separated
+REJECT_REASONS_COLUMN = "reject_reasons"
+
+# A row's reject bitmask is a uint64, one bit per compiled rule
+MAX_RULES = 64
+
 
 def validate_required_columns(df: pd.DataFrame, required_columns: list[str]) -> None:
     """
@@ -48,4 +59,195 @@ def split_valid_rejects_by_required_not_null(
     valid_df = df[~reject_mask].copy()
     rejects_df = df[reject_mask].copy()
 
-    return valid_df, rejects_df
\ No newline at end of file
+    return valid_df, rejects_df
+
+
+@dataclass(frozen = True)
+class ValidationRule:
+    """
+    One check on one column. kind is not_null, numeric, range, allowed_values
+    or regex; arg is the kind's parameter (bounds, values or compiled pattern).
+    """
+    kind: str
+    column: str
+    arg: Any = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}:{self.column}"
+
+
+def _failed_not_null(series: pd.Series, rule: ValidationRule) -> np.ndarray:
+    return series.isna().to_numpy()
+
+def _failed_numeric(series: pd.Series, rule: ValidationRule) -> np.ndarray:
+    # Present but not coercible to a number (numeric dtypes can't fail)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return np.zeros(len(series), dtype = bool)
+    return (series.notna() & pd.to_numeric(series, errors = "coerce").isna()).to_numpy()
+
+def _failed_range(series: pd.Series, rule: ValidationRule) -> np.ndarray:
+    low, high = rule.arg
+    failed = np.zeros(len(series), dtype = bool)
+    if low is not None:
+        failed |= (series < low).to_numpy(dtype = bool, na_value = False)
+    if high is not None:
+        failed |= (series > high).to_numpy(dtype = bool, na_value = False)
+    return failed
+
+def _failed_allowed_values(series: pd.Series, rule: ValidationRule) -> np.ndarray:
+    return (series.notna() & ~series.isin(rule.arg)).to_numpy()
+
+def _failed_regex(series: pd.Series, rule: ValidationRule) -> np.ndarray:
+    matched = series.astype("str").str.fullmatch(rule.arg)
+    return (series.notna() & ~matched.fillna(False).astype(bool)).to_numpy()
+
+_RULE_CHECKS = {
+    "not_null": _failed_not_null,
+    "numeric": _failed_numeric,
+    "range": _failed_range,
+    "allowed_values": _failed_allowed_values,
+    "regex": _failed_regex,
+}
+
+
+class ValidationPlan:
+    """
+    Row-level rules compiled once per dataset (see compile_validation_plan).
+
+    Every rule is evaluated over the whole frame into one uint64 bitmask per
+    row (bit i set = rule i failed), so a row is checked against all rules in a
+    single pass and rejects carry every reason, not just the first.
+    """
+
+    def __init__(self, rules: list[ValidationRule]):
+        if len(rules) > MAX_RULES:
+            raise ValueError(f"At most {MAX_RULES} validation rules are supported, got {len(rules)}")
+        self.rules = rules
+
+    @property
+    def columns(self) -> list[str]:
+        return list(dict.fromkeys(rule.column for rule in self.rules))
+
+    def evaluate(self, df: pd.DataFrame) -> tuple[pd.DataFrame, np.ndarray]:
+        """
+        Return (df, reject bitmask). Columns with a numeric rule come back
+        coerced to numbers, so later rules (e.g. ranges) compare numerically.
+        """
+        missing = [c for c in self.columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"Validation columns missing from DataFrame: {missing}")
+
+        coerced = {
+            rule.column: pd.to_numeric(df[rule.column], errors = "coerce")
+            for rule in self.rules
+            if rule.kind == "numeric" and not pd.api.types.is_numeric_dtype(df[rule.column].dtype)
+        }
+
+        reasons = np.zeros(len(df), dtype = np.uint64)
+        for bit, rule in enumerate(self.rules):
+            series = df[rule.column] if rule.kind == "numeric" else coerced.get(rule.column, df[rule.column])
+            failed = _RULE_CHECKS[rule.kind](series, rule)
+            reasons |= failed.astype(np.uint64) << np.uint64(bit)
+
+        if coerced:
+            df = df.assign(**coerced)
+
+        return df, reasons
+
+    def reason_names(self, reasons: np.ndarray) -> np.ndarray:
+        """
+        ";"-joined names of the failed rules for each bitmask in reasons.
+        """
+        unique, inverse = np.unique(reasons, return_inverse = True)
+        names = np.array([
+            ";".join(rule.name for bit, rule in enumerate(self.rules) if int(mask) >> bit & 1)
+            for mask in unique
+        ], dtype = object)
+        return names[inverse.reshape(-1)]
+
+    def rule_counts(self, reasons: np.ndarray) -> dict[str, int]:
+        """
+        Number of rows that failed each rule (rules nothing failed are left out).
+        """
+        counts = {}
+        for bit, rule in enumerate(self.rules):
+            n = int(np.count_nonzero(reasons & np.uint64(1 << bit)))
+            if n:
+                counts[rule.name] = n
+        return counts
+
+    def split(self, df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, dict[str, int]]:
+        """
+        Split df into (valid_df, rejects_df, rejects per rule). Each row lands in
+        exactly one half, so together they hold one copy of the rows; rejects_df
+        gets a REJECT_REASONS_COLUMN.
+        """
+        df, reasons = self.evaluate(df)
+        rejected = reasons != 0
+
+        if not rejected.any():
+            return df, df.iloc[:0].assign(**{REJECT_REASONS_COLUMN: pd.Series(dtype = "str")}), {}
+
+        rejects_df = df[rejected].assign(**{REJECT_REASONS_COLUMN: self.reason_names(reasons[rejected])})
+        return df[~rejected], rejects_df, self.rule_counts(reasons)
+
+
+def compile_validation_plan(ds: dict) -> ValidationPlan:
+    """
+    Build a dataset's ValidationPlan from its config: its dedupe_keys are
+    always not-null, plus the optional validation section:
+
+        validation:
+          not_null: [column, ...]
+          numeric: [column, ...]                 # must be coercible to a number
+          ranges: {column: {min: x, max: y}}     # either bound may be omitted
+          allowed_values: {column: [value, ...]}
+          regex: {column: pattern}              # must match the whole value
+
+    Missing values only fail not_null; the other rules skip them.
+    Raises ValueError if the section is malformed.
+    """
+    validation = ds.get("validation", {}) or {}
+    if not isinstance(validation, dict):
+        raise ValueError("validation must be a mapping")
+
+    unknown = [k for k in validation if k not in ("not_null", "numeric", "ranges", "allowed_values", "regex")]
+    if unknown:
+        raise ValueError(f"unknown validation rule kinds: {unknown}")
+
+    for key in ["not_null", "numeric"]:
+        value = validation.get(key, [])
+        if not isinstance(value, list) or not all(isinstance(x, str) for x in value):
+            raise ValueError(f"validation.{key} must be a list of strings")
+
+    for key in ["ranges", "allowed_values", "regex"]:
+        if not isinstance(validation.get(key, {}), dict):
+            raise ValueError(f"validation.{key} must be a mapping of column name to rule")
+
+    rules = [
+        ValidationRule("not_null", c)
+        for c in dict.fromkeys(list(ds.get("dedupe_keys", [])) + validation.get("not_null", []))
+    ]
+    rules += [ValidationRule("numeric", c) for c in validation.get("numeric", [])]
+
+    for column, bounds in validation.get("ranges", {}).items():
+        if not isinstance(bounds, dict) or not bounds or set(bounds) - {"min", "max"}:
+            raise ValueError(f"validation.ranges.{column} must set min and/or max")
+        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in bounds.values()):
+            raise ValueError(f"validation.ranges.{column} bounds must be numbers")
+        rules.append(ValidationRule("range", column, (bounds.get("min"), bounds.get("max"))))
+
+    for column, values in validation.get("allowed_values", {}).items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"validation.allowed_values.{column} must be a non-empty list")
+        rules.append(ValidationRule("allowed_values", column, tuple(values)))
+
+    for column, pattern in validation.get("regex", {}).items():
+        try:
+            compiled = re.compile(pattern)
+        except (re.error, TypeError) as e:
+            raise ValueError(f"validation.regex.{column} is not a valid pattern: {e}") from e
+        rules.append(ValidationRule("regex", column, compiled))
+
+    return ValidationPlan(rules)
@@ -1,8 +1,16 @@
+import bisect
+import os
+import threading
 from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+from backend.cache import LRUCache
+from ingestion.columnar import read_processed
+
 app = FastAPI(title="ETL Data API")
 
 # allow React frontend
@@ -14,14 +22,174 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip for clients that accept it, on bodies of at least GZIP_MINIMUM_SIZE bytes
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", 1000)))
+
 DATA_DIR = Path("data/processed")
 
 
+class SearchIndex:
+    """
+    Case-insensitive substring index over every cell of a table.
+
+    Built once per loaded table: each row's cells, stringified exactly like
+    df.astype(str), are lowercased and joined with a unit separator, and all
+    rows are joined into one string with newlines. A plain-text search is then
+    a handful of C-level str.find calls that jump from match to next row,
+    instead of a per-column regex pass over a freshly stringified copy.
+
+    Terms the index can't answer identically (regex metacharacters, non-ASCII,
+    separators) fall back to the per-column str.contains the API always used.
+    """
+
+    SEPARATOR = "\x1f"
+    REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+    # Characters that re.IGNORECASE matches to an ASCII letter but str.lower() doesn't
+    _IGNORECASE_FOLDS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+    def __init__(self, df: pd.DataFrame):
+        text = df.astype(str)
+        if len(text.columns):
+            joined = text.iloc[:, 0].fillna("")
+            for column in text.columns[1:]:
+                joined = joined + self.SEPARATOR + text[column].fillna("")
+        else:
+            joined = pd.Series([""] * len(df), dtype = object)
+
+        rows = joined.str.translate(self._IGNORECASE_FOLDS).str.lower()
+        lengths = rows.str.len().to_numpy(dtype = np.int64)
+
+        self.text = "\n".join(rows)
+        # starts[i] is the offset of row i in text; starts[-1] is past the end.
+        # A plain list: bisect on it is much cheaper per match than np.searchsorted
+        self.starts = [0] + np.cumsum(lengths + 1).tolist()
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.text) + 8 * len(self.starts)
+
+    def can_answer(self, term: str) -> bool:
+        return (
+            term.isascii()
+            and not self.REGEX_METACHARACTERS.intersection(term)
+            and self.SEPARATOR not in term
+            and "\n" not in term
+        )
+
+    def search(self, df: pd.DataFrame, term: str) -> np.ndarray:
+        """
+        Positions of rows in df with a cell containing term (case-insensitive),
+        in row order; the same rows as the per-column str.contains search.
+        """
+        if not self.can_answer(term):
+            text = df.astype(str)
+            mask = np.zeros(len(df), dtype = bool)
+            for column in text.columns:
+                mask |= text[column].str.contains(term, case = False, na = False).to_numpy(dtype = bool)
+            return np.flatnonzero(mask)
+
+        needle = term.lower()
+        text, starts = self.text, self.starts
+        positions = []
+
+        at = text.find(needle)
+        while at != -1:
+            row = bisect.bisect_right(starts, at) - 1
+            positions.append(row)
+            at = text.find(needle, starts[row + 1])
+
+        return np.asarray(positions, dtype = np.int64)
+
+
+class LoadedTable:
+    """
+    A parsed table plus its search index, as held by TableCache.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.search_index = SearchIndex(df)
+        self.nbytes = int(df.memory_usage(deep = True).sum()) + self.search_index.nbytes
+
+
+class TableCache:
+    """
+    Process-level cache of parsed tables (and their search indexes).
+
+    A cached table is reused while its file's (mtime, size) is unchanged and
+    re-read otherwise. Tables are evicted least-recently-used once their
+    combined in-memory size exceeds max_bytes. Cached DataFrames are shared:
+    callers must not modify them in place.
+    """
+
+    def __init__(self, data_dir: Path, max_bytes: int):
+        self.data_dir = data_dir
+        # name -> (file signature, LoadedTable), weighed by the table's memory use
+        self._tables = LRUCache(
+            max_entries = 1024,
+            max_weight = max_bytes,
+            weigh = lambda entry: entry[1].nbytes,
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def path_for(self, name: str) -> Path:
+        return self.data_dir / f"{name}_processed.csv"
+
+    def get(self, name: str) -> LoadedTable:
+        path = self.path_for(name)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{name} not found")
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._tables.get(name)
+        with self._lock:
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+
+        # Memory-mapped columnar copy when ingestion wrote a fresh one, else a CSV parse
+        table = LoadedTable(read_processed(str(path)))
+        self._tables.put(name, (signature, table))
+        return table
+
+    def clear(self) -> None:
+        self._tables.clear()
+
+    def stats(self) -> dict:
+        lru = self._tables.stats()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "evictions": lru["evictions"],
+                "tables": lru["entries"],
+                "bytes": lru["weight"],
+                "max_bytes": lru["max_weight"],
+            }
+
+
+table_cache = TableCache(DATA_DIR, max_bytes = int(os.getenv("TABLE_CACHE_MAX_BYTES", 512 * 1024 * 1024)))
+
+
 def load_table(name: str) -> pd.DataFrame:
-    path = DATA_DIR / f"{name}_processed.csv"
-    if not path.exists():
-        raise FileNotFoundError(f"{name} not found")
-    return pd.read_csv(path)
+    return table_cache.get(name).df
+
+
+@app.get("/api/health/table-cache")
+def get_table_cache_stats():
+    return table_cache.stats()
 
 
 @app.get("/api/tables")
@@ -38,16 +206,15 @@ def get_table(
     table: str,
     page: int = 1,
     page_size: int = 25,
-    search: str = Query(default="")
+    search: str = Query(default=""),
+    fmt: str = Query(default="rows", alias="format", pattern="^(rows|columnar)$")
 ):
-    df = load_table(table)
+    loaded = table_cache.get(table)
+    df = loaded.df
 
     # simple search across all columns
     if search:
-        mask = df.astype(str).apply(
-            lambda row: row.str.contains(search, case=False, na=False)
-        ).any(axis=1)
-        df = df[mask]
+        df = df.iloc[loaded.search_index.search(df, search)]
 
     total_rows = len(df)
 
@@ -56,10 +223,16 @@ def get_table(
 
     df_page = df.iloc[start:end]
 
+    # columnar: one array per column instead of one object per row
+    if fmt == "columnar":
+        payload = {"data": {c: df_page[c].tolist() for c in df_page.columns}}
+    else:
+        payload = {"rows": df_page.to_dict(orient="records")}
+
     return {
         "table": table,
         "columns": list(df_page.columns),
-        "rows": df_page.to_dict(orient="records"),
+        **payload,
         "page": page,
         "page_size": page_size,
         "total_rows": total_rows
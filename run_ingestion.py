@@ -8,29 +8,72 @@ This script is responsible for:
 All dataset-specifc logic lives in the ingestion package.
 """
 
+import argparse
+import sys
+
 from ingestion.read_csv import run_all_ingestion
 from ingestion.loader import load_config
 from ingestion.logging_utils import setup_logger
+from ingestion.metrics import diff_reports, format_diff, load_report
+
+
+def parse_args(argv = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description = "Run the config-driven ingestion pipeline.")
+    parser.add_argument(
+        "--full-refresh",
+        action = "store_true",
+        help = "Ignore the incremental manifest and reload every dataset (append datasets start over).",
+    )
+    parser.add_argument(
+        "--diff",
+        nargs = 2,
+        metavar = ("BEFORE", "AFTER"),
+        help = "Compare two run reports (data/reports/*.json) instead of ingesting; exits 1 on any regression.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type = float,
+        default = 0.2,
+        help = "With --diff, the relative slowdown or memory growth that counts as a regression (default 0.2).",
+    )
+    return parser.parse_args(argv)
+
 
+def diff_runs(before_path: str, after_path: str, threshold: float) -> int:
+    """
+    Print the per-dataset, per-stage comparison of two run reports.
+    Returns the exit status: 1 if anything regressed, else 0.
+    """
+    rows = diff_reports(load_report(before_path), load_report(after_path), threshold)
+    print(format_diff(rows))
 
+    regressions = [r for r in rows if r["regression"]]
+    print(f"\n{len(regressions)} regression(s) over {threshold:.0%}")
+    return 1 if regressions else 0
 
-def main():
+
+def main(argv = None):
     """
     Main execution function for running ingestion tasks.
 
     Additional ingestion steps (e.g., drivers, races) can be added later if we want
     """
+    args = parse_args(argv)
+    if args.diff:
+        return diff_runs(*args.diff, args.threshold)
+
     config = load_config()
     logger = setup_logger(config)
 
     logger.info("Ingestion run started")
 
     try:
-        run_all_ingestion()
+        # One logger (and log file) for the whole run, which the run report is named after
+        run_all_ingestion(full_refresh = args.full_refresh, logger = logger)
         logger.info("Ingestion run finished successfully")
     except Exception as e:
         logger.exception(f"Ingestion run failed: {e}")
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
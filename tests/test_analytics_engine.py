@@ -0,0 +1,227 @@
+import sqlite3
+from decimal import Decimal
+
+import numpy as np
+import psycopg2
+import pytest
+
+from backend import api
+from backend.analytics_engine import AnalyticsEngine, AnalyticsSnapshot, _fetch_results, load_snapshot
+from backend.db import get_conn
+
+# The materialized views and endpoint queries, in SQLite (points held as integer hundredths;
+# "IS NOT NULL" first reproduces Postgres' NULLS FIRST for DESC)
+SQLITE_DRIVER_CAREER = """
+    SELECT d.driver_id, d.forename || ' ' || d.surname AS driver_name,
+           COUNT(*) AS races,
+           SUM(CASE WHEN r.position = 1 THEN 1 ELSE 0 END) AS wins,
+           SUM(CASE WHEN r.position IN (1, 2, 3) THEN 1 ELSE 0 END) AS podiums,
+           SUM(r.points) AS total_points
+    FROM results r
+    JOIN drivers d ON d.driver_id = r.driver_id
+    GROUP BY d.driver_id
+    ORDER BY total_points IS NOT NULL, total_points DESC, d.driver_id
+"""
+
+SQLITE_CONSTRUCTOR_SEASONS = """
+    SELECT r.season, c.constructor_id, c.name, SUM(r.points) AS total_points
+    FROM results r
+    JOIN constructors c ON c.constructor_id = r.constructor_id
+    GROUP BY r.season, c.constructor_id
+    ORDER BY r.season, total_points IS NOT NULL, total_points DESC, c.constructor_id
+"""
+
+
+def _cents(points):
+    return None if points is None else Decimal(points).scaleb(-2)
+
+
+@pytest.fixture
+def tables():
+    rng = np.random.default_rng(7)
+    n = 3000
+
+    results = {
+        # Ids 1..70 but only 1..60 exist in drivers (and 1..15 of 1..18 constructors)
+        "driver_id": rng.integers(1, 71, n).astype(np.int32),
+        "constructor_id": rng.integers(1, 19, n).astype(np.int32),
+        "season": rng.integers(2000, 2011, n).astype(np.int16),
+        "position": rng.integers(0, 21, n).astype(np.int16),
+        # Few distinct values, so ties are common
+        "cents": (rng.integers(0, 6, n) * 250).astype(np.int32),
+        "has_points": rng.random(n) > 0.05,
+    }
+    results["cents"][~results["has_points"]] = 0
+    # Driver 5 never has points, so its total is NULL
+    results["has_points"][results["driver_id"] == 5] = False
+    results["cents"][results["driver_id"] == 5] = 0
+
+    drivers = [(i, f"First{i}", None if i == 9 else f"Last{i}") for i in range(1, 61)]
+    constructors = [(i, f"Team {i}") for i in range(1, 16)]
+    return results, drivers, constructors
+
+
+def _snapshot(results, drivers, constructors) -> AnalyticsSnapshot:
+    driver_names = np.empty(len(drivers), dtype = object)
+    driver_names[:] = [None if s is None else f"{f} {s}" for _, f, s in drivers]
+    constructor_names = np.empty(len(constructors), dtype = object)
+    constructor_names[:] = [name for _, name in constructors]
+
+    return AnalyticsSnapshot.build(
+        results,
+        np.array([d[0] for d in drivers], dtype = np.int32),
+        driver_names,
+        np.array([c[0] for c in constructors], dtype = np.int32),
+        constructor_names,
+    )
+
+
+def _sqlite(results, drivers, constructors):
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE results (driver_id, constructor_id, season, position, points)")
+    db.execute("CREATE TABLE drivers (driver_id, forename, surname)")
+    db.execute("CREATE TABLE constructors (constructor_id, name)")
+
+    rows = zip(
+        results["driver_id"].tolist(),
+        results["constructor_id"].tolist(),
+        results["season"].tolist(),
+        [p or None for p in results["position"].tolist()],
+        [c if ok else None for c, ok in zip(results["cents"].tolist(), results["has_points"].tolist())],
+    )
+    db.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?)", rows)
+    db.executemany("INSERT INTO drivers VALUES (?, ?, ?)", drivers)
+    db.executemany("INSERT INTO constructors VALUES (?, ?)", constructors)
+    return db
+
+
+def test_driver_aggregates_match_sql(tables):
+    snap = _snapshot(*tables)
+    career = _sqlite(*tables).execute(SQLITE_DRIVER_CAREER).fetchall()
+
+    expected = [
+        {"driver_id": d, "driver_name": name, "races": races, "wins": wins, "podiums": podiums,
+         "total_points": _cents(points)}
+        for d, name, races, wins, podiums, points in career
+    ]
+    assert [snap.driver_stats(row["driver_id"]) for row in expected] == expected
+
+    leaderboard = [{k: row[k] for k in ("driver_id", "driver_name", "total_points")} for row in expected]
+    assert snap.leaderboard(50) == leaderboard[:50]
+    assert snap.leaderboard(len(expected) + 10) == leaderboard
+
+
+def test_null_points_and_names_follow_sql(tables):
+    snap = _snapshot(*tables)
+
+    assert snap.leaderboard(1)[0]["driver_id"] == 5
+    assert snap.driver_stats(5)["total_points"] is None
+    assert snap.driver_stats(9)["driver_name"] is None
+    # Same scale as SUM() over NUMERIC(6,2), so rows compare equal to the SQL path's Decimals
+    assert all(row["total_points"].as_tuple().exponent == -2 for row in snap.leaderboard(10)[1:])
+
+
+def test_constructor_seasons_match_sql(tables):
+    snap = _snapshot(*tables)
+    seasons = _sqlite(*tables).execute(SQLITE_CONSTRUCTOR_SEASONS).fetchall()
+
+    for year in range(1998, 2013):
+        expected = [
+            {"constructor_id": c, "constructor_name": name, "total_points": _cents(points)}
+            for season, c, name, points in seasons if season == year
+        ]
+        assert snap.constructors_by_year(year) == expected
+
+
+def test_driver_batches_keep_request_and_leaderboard_order(tables):
+    snap = _snapshot(*tables)
+
+    batch = snap.drivers_stats([20, 65, 3, 10_000, 7])
+    assert [row["driver_id"] for row in batch] == [20, 3, 7]
+    assert batch == [snap.driver_stats(d) for d in (20, 3, 7)]
+
+    top = snap.top_driver_stats(10)
+    assert [row["driver_id"] for row in top] == [row["driver_id"] for row in snap.leaderboard(10)]
+    assert snap.drivers_stats([]) == []
+
+
+def test_unknown_driver_has_no_stats(tables):
+    snap = _snapshot(*tables)
+
+    assert snap.driver_stats(65) is None  # has results, but no core.drivers row
+    assert snap.driver_stats(0) is None
+    assert snap.driver_stats(10_000) is None
+
+
+def test_engine_reloads_only_on_new_version(monkeypatch):
+    loads = []
+    monkeypatch.setattr("backend.analytics_engine.load_snapshot", lambda conn: loads.append(conn) or object())
+    engine = AnalyticsEngine()
+
+    first = engine.snapshot("1", conn = "c")
+    assert engine.snapshot("1", conn = "c") is first
+    assert engine.snapshot("2", conn = "c") is not first
+    assert len(loads) == 2
+
+    # Without a data version changes can't be detected, so callers fall back to SQL
+    assert engine.snapshot(None, conn = "c") is None
+    assert engine.is_current("2") and not engine.is_current(None)
+
+
+@pytest.fixture
+def conn():
+    try:
+        conn = get_conn()
+    except (psycopg2.Error, TypeError, ValueError):
+        pytest.skip("No PostgreSQL database configured")
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('core.mv_driver_career'), to_regclass('core.mv_constructor_season_points')")
+        if None in cur.fetchone():
+            conn.close()
+            pytest.skip("infra/sql/04_analytics_views.sql has not been applied")
+
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+def _fetch_dicts(conn, query, params):
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        names = [d[0] for d in cur.description]
+        return [dict(zip(names, row)) for row in cur.fetchall()]
+
+
+def test_engine_matches_endpoint_sql(conn):
+    snap = load_snapshot(conn)
+
+    assert snap.leaderboard(50) == _fetch_dicts(conn, api.LEADERBOARD_SQL, (50,))
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT DISTINCT year FROM core.mv_constructor_season_points ORDER BY year")
+        years = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT driver_id FROM core.drivers ORDER BY driver_id")
+        driver_ids = [r[0] for r in cur.fetchall()]
+
+    for year in years:
+        assert snap.constructors_by_year(year) == _fetch_dicts(conn, api.CONSTRUCTORS_BY_YEAR_SQL, (year,))
+
+    for driver_id in driver_ids:
+        rows = _fetch_dicts(conn, api.DRIVER_STATS_SQL, (driver_id,))
+        assert snap.driver_stats(driver_id) == (rows[0] if rows else None)
+
+    assert snap.top_driver_stats(50) == _fetch_dicts(conn, api.TOP_DRIVERS_STATS_SQL, (50,))
+    batch = driver_ids[::-7] + [999_999]
+    assert snap.drivers_stats(batch) == _fetch_dicts(conn, api.DRIVERS_STATS_SQL, (batch, batch))
+
+
+def test_results_stream_in_batches(conn):
+    whole = _fetch_results(conn)
+    conn.rollback()
+    batched = _fetch_results(conn, batch_rows = 997)
+
+    assert whole.keys() == batched.keys()
+    for name, values in whole.items():
+        assert values.dtype == batched[name].dtype
+        np.testing.assert_array_equal(values, batched[name])
@@ -0,0 +1,84 @@
+import psycopg2
+import pytest
+
+from backend.db import get_conn
+from ingestion.post_load import refresh_materialized_view
+
+# The aggregates the API computed on every request before the materialized views
+LIVE_DRIVER_CAREER = """
+    SELECT
+        d.driver_id,
+        d.forename || ' ' || d.surname AS driver_name,
+        COUNT(*) AS races,
+        SUM(CASE WHEN r.position = 1 THEN 1 ELSE 0 END) AS wins,
+        SUM(CASE WHEN r.position IN (1, 2, 3) THEN 1 ELSE 0 END) AS podiums,
+        SUM(r.points) AS total_points
+    FROM core.results r
+    JOIN core.drivers d ON d.driver_id = r.driver_id
+    GROUP BY d.driver_id, driver_name
+    ORDER BY d.driver_id
+"""
+
+LIVE_CONSTRUCTOR_SEASONS = """
+    SELECT
+        ra.year,
+        c.constructor_id,
+        c.name AS constructor_name,
+        SUM(r.points) AS total_points
+    FROM core.results r
+    JOIN core.races ra ON ra.race_id = r.race_id
+    JOIN core.constructors c ON c.constructor_id = r.constructor_id
+    GROUP BY ra.year, c.constructor_id, constructor_name
+    ORDER BY ra.year, c.constructor_id
+"""
+
+
+@pytest.fixture
+def conn():
+    try:
+        conn = get_conn()
+    except (psycopg2.Error, TypeError, ValueError):
+        pytest.skip("No PostgreSQL database configured")
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('core.mv_driver_career'), to_regclass('core.mv_constructor_season_points')")
+        if None in cur.fetchone():
+            conn.close()
+            pytest.skip("infra/sql/04_analytics_views.sql has not been applied")
+
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+def _fetch(conn, query):
+    with conn.cursor() as cur:
+        cur.execute(query)
+        return cur.fetchall()
+
+
+def test_driver_career_view_matches_live_aggregate(conn):
+    assert refresh_materialized_view(conn, "core.mv_driver_career")
+
+    view = _fetch(
+        conn,
+        "SELECT driver_id, driver_name, races, wins, podiums, total_points FROM core.mv_driver_career ORDER BY driver_id",
+    )
+
+    assert view == _fetch(conn, LIVE_DRIVER_CAREER)
+
+
+def test_constructor_season_view_matches_live_aggregate(conn):
+    assert refresh_materialized_view(conn, "core.mv_constructor_season_points")
+
+    view = _fetch(
+        conn,
+        "SELECT year, constructor_id, constructor_name, total_points FROM core.mv_constructor_season_points "
+        "ORDER BY year, constructor_id",
+    )
+
+    assert view == _fetch(conn, LIVE_CONSTRUCTOR_SEASONS)
+
+
+def test_refresh_reports_missing_view(conn):
+    assert not refresh_materialized_view(conn, "core.mv_does_not_exist")
@@ -0,0 +1,91 @@
+import asyncio
+
+import psycopg2
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import api, api_async
+from backend.db import get_conn
+
+PATHS = [
+    "/api/tables",
+    "/api/tables/results?page=3&page_size=10",
+    "/api/tables/results?page=1&page_size=10&exact_count=true",
+    "/api/tables/results?page=2&page_size=10&format=columnar",
+    "/api/tables/drivers?search=ham&page=1&page_size=5",
+    "/api/tables/races?search=2009&page=2&page_size=5",
+    "/api/tables/nope",
+    "/api/core/leaderboard?limit=5",
+    "/api/core/constructors?year=2008",
+    "/api/core/drivers/1/stats",
+    "/api/core/drivers/999999/stats",
+    "/api/core/drivers/stats?top=5",
+    "/api/core/drivers/stats?ids=20&ids=1&ids=999999&ids=20",
+    "/api/core/drivers/stats",
+]
+
+
+@pytest.fixture(scope = "module")
+def clients():
+    try:
+        get_conn().close()
+    except (psycopg2.Error, TypeError, ValueError):
+        pytest.skip("No PostgreSQL database configured")
+
+    with TestClient(api.app) as sync_client, TestClient(api_async.app) as async_client:
+        yield sync_client, async_client
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_async_app_matches_sync_app(clients, path):
+    sync_client, async_client = clients
+
+    expected = sync_client.get(path)
+    actual = async_client.get(path)
+
+    assert actual.status_code == expected.status_code
+    assert actual.json() == expected.json()
+
+
+def test_async_cursor_pages_follow_sync_cursor(clients):
+    sync_client, async_client = clients
+
+    first = sync_client.get("/api/tables/results?page_size=5").json()
+    path = f"/api/tables/results?page_size=5&cursor={first['next_cursor']}"
+
+    assert async_client.get(path).json() == sync_client.get(path).json()
+
+
+def test_async_requests_never_load_the_catalog_on_the_event_loop(clients, monkeypatch):
+    _, async_client = clients
+    load = api.catalog.snapshot
+    on_loop = []
+
+    def snapshot(conn = None):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            pass
+        return load(conn)
+
+    monkeypatch.setattr(api.catalog, "snapshot", snapshot)
+    # Expires as soon as it is loaded, i.e. between the refresh and the request's own lookups
+    monkeypatch.setattr(api.catalog, "ttl", 0)
+
+    for path in ["/api/tables", "/api/tables/results?page_size=5", "/api/tables/drivers?search=ham", "/api/tables/drivers/export"]:
+        assert async_client.get(path).status_code == 200
+    assert on_loop == []
+
+
+def test_async_app_starts_without_database(monkeypatch):
+    # Nothing listens on port 1, so every connection attempt is refused
+    monkeypatch.setenv("PGHOST", "127.0.0.1")
+    monkeypatch.setenv("PGPORT", "1")
+    monkeypatch.setenv("PGPOOL_CHECKOUT_TIMEOUT", "0.5")
+    monkeypatch.setattr(api, "analytics", None)
+    # A pool of its own, leaving any the clients fixture opened alone
+    monkeypatch.setattr("backend.db_async._pool", None)
+
+    with TestClient(api_async.app) as client:
+        assert client.get("/api/health/analytics").json() == {"enabled": False}
@@ -0,0 +1,29 @@
+from backend.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used_by_count():
+    cache = LRUCache(max_entries = 2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    assert cache.get("a") == [1]
+
+    cache.put("c", [3])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1]
+    assert cache.get("c") == [3]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_bounds_total_weight_and_skips_oversized_values():
+    cache = LRUCache(max_entries = 10, max_weight = 5)
+    cache.put("a", [1, 2, 3])
+    cache.put("b", [4, 5])
+    cache.put("c", [6])
+
+    assert cache.get("a") is None
+    assert cache.stats()["weight"] == 3
+
+    cache.put("huge", list(range(6)))
+    assert cache.get("huge") is None
+    assert cache.get("b") == [4, 5]
@@ -0,0 +1,101 @@
+from backend.catalog import SchemaCatalog
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params = None):
+        self.conn.queries += 1
+
+    def fetchall(self):
+        # Columns query first, then primary keys, then row estimates
+        return [self.conn.rows, self.conn.pk_rows, self.conn.estimate_rows][(self.conn.queries - 1) % 3]
+
+
+class FakeConn:
+    def __init__(self, rows, pk_rows = (), estimate_rows = ()):
+        self.rows = rows
+        self.pk_rows = list(pk_rows)
+        self.estimate_rows = list(estimate_rows)
+        self.queries = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+ROWS = [
+    ("drivers", "driver_id"),
+    ("drivers", "surname"),
+    ("results", "result_id"),
+    ("results", "points"),
+]
+
+
+PK_ROWS = [("results", "result_id")]
+
+ESTIMATE_ROWS = [("results", 26759), ("drivers", -1)]
+
+
+def test_catalog_serves_lookups_from_memory_until_invalidated():
+    conn = FakeConn(ROWS, PK_ROWS, ESTIMATE_ROWS)
+    catalog = SchemaCatalog("core", ttl = 300)
+
+    assert catalog.tables(conn) == ["drivers", "results"]
+    assert catalog.columns("results", conn) == ["result_id", "points"]
+    assert catalog.columns("missing", conn) is None
+    assert catalog.primary_key("results", conn) == ["result_id"]
+    assert catalog.primary_key("drivers", conn) == []
+    assert catalog.row_estimate("results", conn) == 26759
+    assert catalog.row_estimate("drivers", conn) is None
+    assert conn.queries == 3
+
+    catalog.invalidate()
+    assert catalog.tables(conn) == ["drivers", "results"]
+    assert conn.queries == 6
+
+
+def test_catalog_reloads_after_ttl():
+    conn = FakeConn(ROWS, PK_ROWS)
+    catalog = SchemaCatalog("core", ttl = 0)
+
+    catalog.tables(conn)
+    catalog.tables(conn)
+
+    assert conn.queries == 6
+    assert catalog.stats()["misses"] == 2
+
+
+class FakeDataVersion:
+    def __init__(self, value):
+        self.value = value
+
+    def is_fresh(self):
+        return True
+
+    def current(self):
+        return self.value
+
+
+def test_catalog_reloads_on_new_data_version():
+    conn = FakeConn(ROWS, PK_ROWS)
+    version = FakeDataVersion("1")
+    catalog = SchemaCatalog("core", ttl = 300, data_version = version)
+
+    catalog.tables(conn)
+    catalog.tables(conn)
+    assert conn.queries == 3
+    assert catalog.is_fresh()
+
+    # An ingestion run recorded by another process
+    version.value = "2"
+    assert not catalog.is_fresh()
+    catalog.tables(conn)
+    assert conn.queries == 6
+    assert catalog.stats()["data_version"] == "2"
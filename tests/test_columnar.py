@@ -0,0 +1,101 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from ingestion.columnar import ColumnarTable, columnar_dir_for, read_processed, write_columnar, write_columnar_csv
+from ingestion.read_csv import ingest_dataset
+
+
+def _csv(tmp_path):
+    path = tmp_path / "drivers_processed.csv"
+    path.write_text(
+        "driver_id,code,forename,dob,points\n"
+        "1,HAM,Lewis,1985-01-07,4912.5\n"
+        "2,,Nick,1977-05-10,\n"
+        "3,ROS,Nico,,57.0\n"
+    )
+    return str(path)
+
+
+def test_sidecar_reads_back_exactly_like_read_csv(tmp_path):
+    csv_path = _csv(tmp_path)
+    write_columnar(pd.read_csv(csv_path), columnar_dir_for(csv_path), source_csv = csv_path)
+
+    table = ColumnarTable(columnar_dir_for(csv_path))
+    assert table.is_fresh_for(csv_path)
+    assert table.num_rows == 3
+
+    pd.testing.assert_frame_equal(table.to_pandas(), pd.read_csv(csv_path))
+    pd.testing.assert_frame_equal(
+        read_processed(csv_path, columns = ["points", "code"]), pd.read_csv(csv_path)[["points", "code"]]
+    )
+
+
+def test_numeric_columns_are_memory_mapped(tmp_path):
+    csv_path = _csv(tmp_path)
+    write_columnar(pd.read_csv(csv_path), columnar_dir_for(csv_path), source_csv = csv_path)
+
+    table = ColumnarTable(columnar_dir_for(csv_path))
+    points = table.column("points")
+
+    values = points.to_numpy()
+    assert not values.flags.owndata
+    assert isinstance(values.base, np.memmap) or isinstance(getattr(values.base, "base", None), np.memmap)
+    assert points.sum() == 4969.5
+
+
+def test_chunked_sidecar_matches_whole_file_read(tmp_path):
+    path = tmp_path / "results_processed.csv"
+    # In chunks of 2: points is ints, then a gap, then a float; position_text is numbers and
+    # text ("R"), read as text; notes is empty, then text
+    path.write_text(
+        "result_id,points,finished,position_text,notes\n"
+        "1,10,True,1,\n"
+        "2,8,False,2,\n"
+        "3,,True,R,\n"
+        "4,6.50,True,4,wet\n"
+        "5,0,False,05,\n"
+    )
+    csv_path = str(path)
+    write_columnar_csv(csv_path, columnar_dir_for(csv_path), chunk_size = 2)
+
+    table = ColumnarTable(columnar_dir_for(csv_path))
+    assert table.is_fresh_for(csv_path)
+    pd.testing.assert_frame_equal(table.to_pandas(), pd.read_csv(csv_path))
+
+
+def test_stale_sidecar_falls_back_to_csv(tmp_path):
+    csv_path = _csv(tmp_path)
+    write_columnar(pd.read_csv(csv_path), columnar_dir_for(csv_path), source_csv = csv_path)
+
+    with open(csv_path, "a") as f:
+        f.write("4,VER,Max,1997-09-30,2912.5\n")
+    os.utime(csv_path, ns = (1, 1))
+
+    assert not ColumnarTable(columnar_dir_for(csv_path)).is_fresh_for(csv_path)
+    assert read_processed(csv_path)["driver_id"].tolist() == [1, 2, 3, 4]
+
+
+def test_ingestion_writes_sidecar_matching_valid_output(tmp_path):
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n1,Hamilton\n2,\\N\n3,Rosberg\n")
+    ds = {
+        "input_path": str(tmp_path / "drivers.csv"),
+        "valid_output_path": str(tmp_path / "processed" / "drivers_processed.csv"),
+        "rejected_output_path": str(tmp_path / "rejects" / "drivers_rejects.csv"),
+        "table_name": "staging.stg_drivers",
+        "required_columns": ["driverId", "surname"],
+        "rename_map": {"driverId": "driver_id"},
+        "key_columns": ["driver_id"],
+        "dedupe_keys": ["driver_id"],
+        "db_columns": ["driver_id", "surname"],
+        "chunk_size": 2,
+    }
+
+    ingest_dataset("drivers", ds, logging.getLogger("test_ingestion"), load_datasets_to_db = False, columnar_output = True)
+
+    valid_output_path = ds["valid_output_path"]
+    table = ColumnarTable(columnar_dir_for(valid_output_path))
+    assert table.is_fresh_for(valid_output_path)
+    pd.testing.assert_frame_equal(table.to_pandas(), pd.read_csv(valid_output_path))
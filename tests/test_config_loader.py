@@ -42,6 +42,12 @@ def test_validate_config_raises_when_datasets_missing():
     with pytest.raises(ValueError):
         validate_config(bad_config)
 
+def test_validate_config_raises_when_report_dir_not_a_path():
+    bad_config = {"logging": {"log_dir": "data/logs", "report_dir": ["data/reports"]}, "datasets": {"x": {}}}
+
+    with pytest.raises(ValueError, match = "report_dir"):
+        validate_config(bad_config)
+
 def test_validate_config_raises_when_dataset_missing_required_key():
     bad_config = {
         "logging": {"log_dir": "data/logs"},
@@ -93,4 +99,39 @@ def test_validate_config_raises_when_key_columns_not_list_of_strings():
     }
 
     with pytest.raises(ValueError):
-        validate_config(bad_config)
\ No newline at end of file
+        validate_config(bad_config)
+
+def test_validate_config_raises_when_post_load_views_not_list():
+    config = load_config("ingestion/config.yaml")
+    config["post_load"] = {"refresh_views": "core.mv_driver_career"}  # invalid (not a list)
+
+    with pytest.raises(ValueError):
+        validate_config(config)
+
+def test_validate_config_raises_when_reload_seasons_not_lists_of_seasons():
+    config = load_config("ingestion/config.yaml")
+    config["post_load"]["reload_seasons"] = {"results": ["2024"]}  # invalid (not an int)
+
+    with pytest.raises(ValueError, match = "reload_seasons"):
+        validate_config(config)
+
+def test_validate_config_raises_on_unknown_dtype():
+    config = load_config("ingestion/config.yaml")
+    config["datasets"]["results"]["dtypes"]["points"] = "float33"  # invalid (not a dtype)
+
+    with pytest.raises(ValueError):
+        validate_config(config)
+
+def test_validate_config_raises_when_parse_dates_not_list():
+    config = load_config("ingestion/config.yaml")
+    config["datasets"]["drivers"]["parse_dates"] = "dob"  # invalid (not a list)
+
+    with pytest.raises(ValueError):
+        validate_config(config)
+
+def test_validate_config_raises_on_bad_validation_rule():
+    config = load_config("ingestion/config.yaml")
+    config["datasets"]["results"]["validation"]["ranges"] = {"points": {"min": "zero"}}  # invalid (not a number)
+
+    with pytest.raises(ValueError):
+        validate_config(config)
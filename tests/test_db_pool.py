@@ -0,0 +1,161 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from backend.db import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params = None):
+        if self.conn.broken:
+            raise psycopg2.OperationalError("server closed the connection")
+        self.conn.status = TRANSACTION_STATUS_INTRANS
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.status = TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+def _pool(**kwargs):
+    created = []
+
+    def connect():
+        conn = FakeConn()
+        created.append(conn)
+        return conn
+
+    return ConnectionPool(connect = connect, **kwargs), created
+
+
+def test_pool_reuses_connections_and_rolls_back_on_return():
+    pool, created = _pool(max_size = 2)
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+
+    with pool.connection() as again:
+        assert again is conn
+
+    assert len(created) == 1
+    assert conn.rollbacks == 1
+    stats = pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["created"] == 1
+    assert stats["idle"] == 1
+    assert stats["in_use"] == 0
+
+
+def test_pool_discards_unhealthy_connection_on_checkout():
+    pool, created = _pool(ping_after = 0)
+
+    with pool.connection() as conn:
+        pass
+    conn.broken = True
+
+    with pool.connection() as fresh:
+        assert fresh is not conn
+
+    assert conn.closed
+    assert len(created) == 2
+    assert pool.stats()["discarded"] == 1
+
+
+def test_pool_closes_connections_idle_past_timeout_above_min_size():
+    pool, created = _pool(min_size = 0, idle_timeout = 0.01)
+
+    with pool.connection():
+        pass
+    time.sleep(0.02)
+
+    with pool.connection():
+        pass
+
+    assert created[0].closed
+    assert len(created) == 2
+
+
+def test_pool_open_fills_to_min_size():
+    pool, created = _pool(min_size = 2, max_size = 3)
+
+    pool.open()
+    pool.open()
+
+    assert len(created) == 2
+    assert pool.stats()["idle"] == 2
+    with pool.connection() as conn:
+        assert conn is created[1]
+    assert len(created) == 2
+
+
+def test_pool_closes_expired_connections_outside_the_lock():
+    pool, created = _pool(min_size = 0, idle_timeout = 0.01)
+    lock_free = []
+
+    with pool.connection() as conn:
+        pass
+
+    def try_lock():
+        acquired = pool._cond.acquire(timeout = 0.5)
+        if acquired:
+            pool._cond.release()
+        lock_free.append(acquired)
+
+    def close():
+        # Another thread must be able to take the pool's lock while the connection closes
+        t = threading.Thread(target = try_lock)
+        t.start()
+        t.join()
+        conn.closed = 1
+
+    conn.close = close
+    time.sleep(0.02)
+
+    with pool.connection():
+        pass
+
+    assert conn.closed
+    assert lock_free == [True]
+
+
+def test_pool_waits_then_times_out_at_max_size():
+    pool, _ = _pool(max_size = 1, checkout_timeout = 0.05)
+    held = pool.getconn()
+
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+
+    # A waiter gets the connection as soon as it is returned
+    threading.Timer(0.01, pool.putconn, args = (held,)).start()
+    pool.checkout_timeout = 1.0
+    assert pool.getconn() is held
+    assert pool.stats()["timeouts"] == 1
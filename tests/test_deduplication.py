@@ -88,4 +88,19 @@ def test_deduplication_collapses_same_key_even_if_other_columns_differ():
         assert len(out) == 2
         return
 
-    pytest.fail("No deduplication function found in ingestion/cleaners.py")
\ No newline at end of file
+    pytest.fail("No deduplication function found in ingestion/cleaners.py")
+
+def test_deduplicate_against_seen_drops_keys_from_earlier_chunks():
+    key_columns = ["resultId"]
+    seen_keys = set()
+
+    first = cleaners.deduplicate_against_seen(
+        pd.DataFrame({"resultId": [1, 2, 2], "points": [25.0, 18.0, 18.0]}), key_columns, seen_keys
+    )
+    second = cleaners.deduplicate_against_seen(
+        pd.DataFrame({"resultId": [2, 3], "points": [0.0, 15.0]}), key_columns, seen_keys
+    )
+
+    assert first["resultId"].tolist() == [1, 2]
+    assert second["resultId"].tolist() == [3]
+    assert seen_keys == {1, 2, 3}
@@ -0,0 +1,56 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.api as api
+
+
+@pytest.fixture
+def client(monkeypatch):
+    batches = []
+
+    def drivers_stats(batch):
+        batches.append(batch)
+        return [{"driver_id": 1, "driver_name": "Lewis Hamilton", "races": 356, "wins": 105, "podiums": 202,
+                 "total_points": "4820.50"}]
+
+    monkeypatch.setattr(api, "_drivers_stats", drivers_stats)
+    monkeypatch.setattr(api.data_version, "current", lambda: "1")
+    api.response_cache.clear()
+
+    yield TestClient(api.app), batches
+    api.response_cache.clear()
+
+
+def test_ids_are_deduplicated_in_request_order(client):
+    http, batches = client
+
+    first = http.get("/api/core/drivers/stats?ids=20&ids=1&ids=20")
+    second = http.get("/api/core/drivers/stats?ids=20&ids=1")
+
+    assert first.status_code == 200
+    assert first.json()[0]["driver_id"] == 1
+    assert first.headers["etag"] == second.headers["etag"]
+    assert batches == [("ids", (20, 1))]
+
+
+def test_top_selector(client):
+    http, batches = client
+
+    assert http.get("/api/core/drivers/stats?top=10").status_code == 200
+    assert batches == [("top", 10)]
+    assert http.get("/api/core/drivers/stats?top=51").status_code == 422
+
+
+@pytest.mark.parametrize("query", ["", "?ids=1&top=5", f"?{'&'.join(f'ids={i}' for i in range(api.MAX_DRIVER_BATCH + 1))}"])
+def test_invalid_batches_are_rejected(client, query):
+    http, batches = client
+
+    response = http.get(f"/api/core/drivers/stats{query}")
+
+    assert response.status_code == 400
+    assert batches == []
+
+
+def test_batch_queries():
+    assert api._driver_batch_query(("top", 5)) == (api.TOP_DRIVERS_STATS_SQL, (5,))
+    assert api._driver_batch_query(("ids", (3, 1))) == (api.DRIVERS_STATS_SQL, ([3, 1], [3, 1]))
@@ -0,0 +1,107 @@
+import logging
+import os
+from contextlib import nullcontext
+
+import pytest
+
+import ingestion.read_csv as read_csv
+
+
+class CountingLoads:
+    def __init__(self):
+        self.full = 0
+        self.upserted = 0
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def full_load(self, ds, df, conn, truncate_first):
+        self.full += len(df)
+        return len(df)
+
+    def upsert(self, df, conn, table_name, columns, key_columns, commit = True):
+        self.upserted += len(df)
+        return len(df)
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    counter = CountingLoads()
+    monkeypatch.setattr(read_csv, "connection", lambda: nullcontext(counter))
+    monkeypatch.setattr(read_csv, "_load_valid_rows", counter.full_load)
+    monkeypatch.setattr(read_csv, "upsert_dataframe_to_postgres", counter.upsert)
+    return counter
+
+
+def _dataset(tmp_path):
+    return {
+        "input_path": str(tmp_path / "drivers.csv"),
+        "valid_output_path": str(tmp_path / "processed" / "drivers_processed.csv"),
+        "rejected_output_path": str(tmp_path / "rejects" / "drivers_rejects.csv"),
+        "table_name": "staging.stg_drivers",
+        "required_columns": ["driverId", "surname"],
+        "rename_map": {"driverId": "driver_id"},
+        "key_columns": ["driver_id"],
+        "dedupe_keys": ["driver_id"],
+        "db_columns": ["driver_id", "surname"],
+        "chunk_size": 2,
+    }
+
+
+def _run(ds, entry):
+    return read_csv.ingest_dataset(
+        "drivers", ds, logging.getLogger("test_ingestion"), incremental = True, previous_entry = entry
+    )
+
+
+def test_unchanged_input_is_skipped_without_writing_rows(tmp_path, loads):
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n1,Hamilton\n2,Heidfeld\n3,Rosberg\n")
+    ds = _dataset(tmp_path)
+
+    first = _run(ds, None)
+    assert loads.full == 3
+    # Two chunks, one transaction
+    assert loads.commits == 1
+
+    second = _run(ds, first["manifest_entry"])
+    assert second["skipped"]
+    assert second["inserted_rows"] == 0
+    assert loads.full == 3
+    assert loads.upserted == 0
+
+    # Touching the file without changing content is still a skip (hash matches)
+    os.utime(ds["input_path"], (1, 1))
+    third = _run(ds, second["manifest_entry"])
+    assert third["skipped"]
+    assert loads.full == 3 and loads.upserted == 0
+
+
+def test_changed_input_upserts_only_new_and_modified_rows(tmp_path, loads):
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n1,Hamilton\n2,Heidfeld\n3,Rosberg\n")
+    ds = _dataset(tmp_path)
+    first = _run(ds, None)
+
+    (tmp_path / "drivers.csv").write_text(
+        "driverId,surname\n1,Hamilton\n2,HEIDFELD\n3,Rosberg\n4,Alonso\n"
+    )
+    second = _run(ds, first["manifest_entry"])
+
+    assert not second["skipped"]
+    assert second["valid_rows"] == 4
+    assert second["inserted_rows"] == 2
+    assert loads.upserted == 2
+    assert loads.full == 3
+
+
+def test_config_change_forces_full_reload(tmp_path, loads):
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n1,Hamilton\n2,Heidfeld\n")
+    ds = _dataset(tmp_path)
+    first = _run(ds, None)
+
+    ds["chunk_size"] = 10
+    second = _run(ds, first["manifest_entry"])
+
+    assert not second["skipped"]
+    assert loads.full == 4
+    assert loads.upserted == 0
@@ -0,0 +1,114 @@
+import json
+import logging
+
+import pytest
+
+import run_ingestion
+from ingestion import metrics as m
+from ingestion.metrics import DatasetMetrics, diff_reports, format_diff, write_report
+from ingestion.read_csv import ingest_dataset
+
+
+def test_stages_accumulate_time_and_rows():
+    metrics = DatasetMetrics()
+
+    frames = list(metrics.timed("read", [[1, 2, 3], [4, 5]]))
+    with metrics.stage("write", 5):
+        pass
+    with metrics.stage("write", 2):
+        pass
+    metrics.add("load", 0.5, 7)
+
+    result = metrics.finish()
+    assert frames == [[1, 2, 3], [4, 5]]
+    assert result["stages"]["read"]["rows"] == 5
+    assert result["stages"]["write"]["rows"] == 7
+    assert result["stages"]["load"] == {"seconds": 0.5, "rows": 7, "rows_per_sec": 14}
+    assert result["peak_rss_scope"] in ("dataset", "process")
+    json.dumps(result)
+
+
+def test_ingest_dataset_reports_every_stage(tmp_path):
+    (tmp_path / "drivers.csv").write_text("driverId,code\n1,HAM\n2,\\N\n2,VER\n3,ALO\n")
+    ds = {
+        "input_path": str(tmp_path / "drivers.csv"),
+        "valid_output_path": str(tmp_path / "out" / "valid.csv"),
+        "rejected_output_path": str(tmp_path / "out" / "rejects.csv"),
+        "table_name": "staging.stg_drivers",
+        "required_columns": ["driverId", "code"],
+        "rename_map": {"driverId": "driver_id"},
+        "keep_columns": ["driver_id", "code"],
+        "key_columns": ["driver_id"],
+        "dedupe_keys": ["driver_id"],
+        "db_columns": ["driver_id", "code"],
+        "validation": {"not_null": ["code"]},
+    }
+
+    counts = ingest_dataset("drivers", ds, logging.getLogger("test_ingestion"), load_datasets_to_db = False)
+    metrics = counts["metrics"]
+
+    assert list(metrics["stages"]) == ["read", "transform", "dedupe", "validate", "write"]
+    assert metrics["stages"]["read"]["rows"] == 4
+    assert metrics["stages"]["validate"]["rows"] == 3
+    assert metrics["bytes_read"] == (tmp_path / "drivers.csv").stat().st_size
+    written = (tmp_path / "out" / "valid.csv").stat().st_size + (tmp_path / "out" / "rejects.csv").stat().st_size
+    assert metrics["bytes_written"] == written
+
+
+def _report(seconds, read_seconds, rss = 100 * 2**20, skipped = False):
+    return {
+        "format": m.REPORT_FORMAT,
+        "datasets": {
+            "results": {
+                "counts": {"skipped": skipped},
+                "metrics": {
+                    "seconds": seconds,
+                    "peak_rss_bytes": rss,
+                    "peak_rss_scope": "dataset",
+                    "stages": {"read": {"seconds": read_seconds, "rows": 10, "rows_per_sec": 1}},
+                },
+            },
+        },
+    }
+
+
+def test_diff_flags_slower_stages_and_memory_growth():
+    rows = {r["measure"]: r for r in diff_reports(_report(2.0, 1.0), _report(2.1, 1.5, rss = 130 * 2**20))}
+
+    assert rows["read.seconds"]["regression"]
+    assert rows["read.seconds"]["change"] == pytest.approx(0.5)
+    assert not rows["seconds"]["regression"]  # +5%, under the threshold
+    assert rows["peak_rss_bytes"]["regression"]
+    assert "REGRESSION" in format_diff(list(rows.values()))
+
+
+def test_diff_ignores_timer_noise_and_skipped_datasets():
+    # +100%, but only 10 ms
+    assert not any(r["regression"] for r in diff_reports(_report(0.01, 0.01), _report(0.02, 0.02)))
+    assert diff_reports(_report(1.0, 1.0), _report(5.0, 5.0, skipped = True)) == []
+
+
+def test_cli_diff_exit_status(tmp_path, capsys):
+    before, same, slower = (str(tmp_path / f"{name}.json") for name in ["before", "same", "slower"])
+    write_report(before, _report(2.0, 1.0))
+    write_report(same, _report(2.0, 1.0))
+    write_report(slower, _report(4.0, 3.0))
+
+    assert run_ingestion.main(["--diff", before, same]) == 0
+    assert run_ingestion.main(["--diff", before, slower]) == 1
+    assert "read.seconds" in capsys.readouterr().out
+
+
+def test_cli_run_logs_to_one_file(tmp_path, monkeypatch):
+    calls = {}
+    monkeypatch.setattr(run_ingestion, "load_config", lambda: {"logging": {"log_dir": str(tmp_path)}})
+    monkeypatch.setattr(run_ingestion, "run_all_ingestion", lambda **kwargs: calls.update(kwargs))
+
+    run_ingestion.main([])
+
+    # The run reuses the CLI's logger, so its report is named after this log file
+    (log_file,) = tmp_path.glob("*.log")
+    handlers = [h for h in calls["logger"].handlers if isinstance(h, logging.FileHandler)]
+    assert [h.baseFilename for h in handlers] == [str(log_file)]
+    for h in handlers:
+        h.close()
@@ -0,0 +1,144 @@
+import logging
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingestion.cleaners import deduplicate_against_index, record_keys
+from ingestion.key_index import KeyIndex, key_index_path_for
+import ingestion.read_csv as read_csv
+from ingestion.read_csv import ingest_dataset
+
+
+def test_integer_keys_are_stored_sorted_as_int64(tmp_path):
+    index = KeyIndex()
+
+    first = deduplicate_against_index(pd.DataFrame({"id": [5, 1, 1, 3]}), ["id"], index)
+    record_keys(first, ["id"], index)
+    second = deduplicate_against_index(pd.DataFrame({"id": [3.0, 2.0, np.nan]}), ["id"], index)
+    record_keys(second, ["id"], index)
+
+    assert first["id"].tolist() == [5, 1, 3]
+    assert second["id"].tolist()[0] == 2 and pd.isna(second["id"].tolist()[1])
+    assert index.keys.dtype == np.int64
+    assert index.keys.tolist() == [1, 2, 3, 5]
+    assert index.keys.nbytes == 8 * len(index)
+
+    path = str(tmp_path / "index.keys.npy")
+    index.save(path)
+    assert KeyIndex.load(path).keys.tolist() == [1, 2, 3, 5]
+
+
+def test_composite_keys_are_hashed():
+    index = KeyIndex()
+
+    keys = ["race", "driver"]
+
+    first = deduplicate_against_index(pd.DataFrame({"race": [1, 1, 2], "driver": ["a", "b", "a"]}), keys, index)
+    record_keys(first, keys, index)
+    second = deduplicate_against_index(pd.DataFrame({"race": [1.0, 3.0], "driver": ["b", "b"]}), keys, index)
+    record_keys(second, keys, index)
+
+    assert len(first) == 3
+    assert second["race"].tolist() == [3.0]
+    assert index.keys.dtype == np.uint64
+    assert len(index) == 4
+
+
+def test_key_type_change_is_an_error():
+    index = KeyIndex(np.array([1, 2], dtype = np.int64))
+
+    with pytest.raises(ValueError):
+        deduplicate_against_index(pd.DataFrame({"id": ["x1", "x2"]}), ["id"], index)
+
+
+def _append_dataset(tmp_path):
+    return {
+        "input_path": str(tmp_path / "drivers.csv"),
+        "valid_output_path": str(tmp_path / "processed" / "drivers_processed.csv"),
+        "rejected_output_path": str(tmp_path / "rejects" / "drivers_rejects.csv"),
+        "table_name": "staging.stg_drivers",
+        "required_columns": ["driverId", "surname"],
+        "rename_map": {"driverId": "driver_id"},
+        "key_columns": ["driver_id"],
+        "dedupe_keys": ["driver_id"],
+        "db_columns": ["driver_id", "surname"],
+        "chunk_size": 2,
+        "append": True,
+    }
+
+
+def test_append_runs_drop_keys_from_earlier_runs(tmp_path):
+    ds = _append_dataset(tmp_path)
+    logger = logging.getLogger("test_ingestion")
+
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n1,Hamilton\n2,Heidfeld\n3,Rosberg\n")
+    ingest_dataset("drivers", ds, logger, load_datasets_to_db = False)
+
+    # Next day's file repeats driver 3
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n3,Rosberg\n4,Alonso\n4,Alonso\n")
+    counts = ingest_dataset("drivers", ds, logger, load_datasets_to_db = False)
+
+    assert counts["valid_rows"] == 1
+    assert pd.read_csv(ds["valid_output_path"])["driver_id"].tolist() == [1, 2, 3, 4]
+    assert KeyIndex.load(key_index_path_for(ds["valid_output_path"])).keys.tolist() == [1, 2, 3, 4]
+
+    # A full refresh starts the outputs and the index over from this input
+    ingest_dataset("drivers", ds, logger, load_datasets_to_db = False, full_refresh = True)
+    assert pd.read_csv(ds["valid_output_path"])["driver_id"].tolist() == [3, 4]
+    assert KeyIndex.load(key_index_path_for(ds["valid_output_path"])).keys.tolist() == [3, 4]
+
+
+def test_rejected_key_can_be_sent_again_corrected(tmp_path):
+    ds = {**_append_dataset(tmp_path), "validation": {"not_null": ["surname"]}}
+    logger = logging.getLogger("test_ingestion")
+
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n1,Hamilton\n2,\n")
+    counts = ingest_dataset("drivers", ds, logger, load_datasets_to_db = False)
+    assert (counts["valid_rows"], counts["rejected_rows"]) == (1, 1)
+    assert KeyIndex.load(key_index_path_for(ds["valid_output_path"])).keys.tolist() == [1]
+
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n2,Heidfeld\n")
+    counts = ingest_dataset("drivers", ds, logger, load_datasets_to_db = False)
+    assert counts["valid_rows"] == 1
+    assert pd.read_csv(ds["valid_output_path"])["surname"].tolist() == ["Hamilton", "Heidfeld"]
+
+
+class FailingLoads:
+    def __init__(self):
+        self.calls = 0
+
+    def load(self, ds, df, conn, truncate_first):
+        self.calls += 1
+        if self.calls == 2:
+            raise RuntimeError("connection lost")
+        return len(df)
+
+    def commit(self):
+        pass
+
+
+def test_failed_append_run_leaves_outputs_and_index_as_they_were(tmp_path, monkeypatch):
+    ds = _append_dataset(tmp_path)
+    logger = logging.getLogger("test_ingestion")
+
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n1,Hamilton\n2,Heidfeld\n")
+    ingest_dataset("drivers", ds, logger, load_datasets_to_db = False)
+    before = (tmp_path / "processed" / "drivers_processed.csv").read_bytes()
+
+    loads = FailingLoads()
+    monkeypatch.setattr(read_csv, "connection", lambda: nullcontext(loads))
+    monkeypatch.setattr(read_csv, "_load_valid_rows", loads.load)
+
+    # The second chunk's load fails after the first chunk was appended
+    (tmp_path / "drivers.csv").write_text("driverId,surname\n3,Rosberg\n4,Alonso\n5,Massa\n")
+    with pytest.raises(RuntimeError):
+        ingest_dataset("drivers", ds, logger)
+
+    assert (tmp_path / "processed" / "drivers_processed.csv").read_bytes() == before
+    assert KeyIndex.load(key_index_path_for(ds["valid_output_path"])).keys.tolist() == [1, 2]
+
+    # So the retry loads every row of the batch
+    monkeypatch.setattr(read_csv, "_load_valid_rows", lambda ds, df, conn, truncate_first: len(df))
+    assert ingest_dataset("drivers", ds, logger)["valid_rows"] == 3
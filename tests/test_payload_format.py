@@ -0,0 +1,70 @@
+import psycopg2
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from backend import api
+from backend.db import get_conn
+from main import TableCache
+
+
+def _rows_from_columns(body):
+    columns = body["columns"]
+    return [dict(zip(columns, values)) for values in zip(*(body["data"][c] for c in columns))]
+
+
+@pytest.fixture
+def csv_client(tmp_path, monkeypatch):
+    lines = ["driver_id,surname,points"] + [f"{i},Driver{i},{i * 0.5}" for i in range(1, 301)]
+    (tmp_path / "drivers_processed.csv").write_text("\n".join(lines) + "\n")
+    monkeypatch.setattr(main, "table_cache", TableCache(tmp_path, max_bytes = 10_000_000))
+    return TestClient(main.app)
+
+
+def test_columnar_page_holds_the_same_rows(csv_client):
+    rows = csv_client.get("/api/tables/drivers?page=2&page_size=50").json()
+    columnar = csv_client.get("/api/tables/drivers?page=2&page_size=50&format=columnar").json()
+
+    assert "rows" not in columnar
+    assert columnar["columns"] == rows["columns"]
+    assert _rows_from_columns(columnar) == rows["rows"]
+    assert {k: v for k, v in columnar.items() if k != "data"} == {k: v for k, v in rows.items() if k != "rows"}
+
+
+def test_unknown_format_is_rejected(csv_client):
+    assert csv_client.get("/api/tables/drivers?format=xml").status_code == 422
+
+
+def test_large_responses_are_gzipped_when_accepted(csv_client):
+    compressed = csv_client.get("/api/tables/drivers?page_size=200", headers = {"Accept-Encoding": "gzip"})
+    plain = csv_client.get("/api/tables/drivers?page_size=200", headers = {"Accept-Encoding": "identity"})
+    small = csv_client.get("/api/tables/drivers?page_size=1", headers = {"Accept-Encoding": "gzip"})
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert int(compressed.headers["content-length"]) < len(plain.content) / 3
+    assert compressed.json() == plain.json()
+    assert "content-encoding" not in plain.headers
+    assert "content-encoding" not in small.headers
+
+
+def test_rows_payload_transposes_in_column_order():
+    rows = [{"a": 1, "b": "x"}, {"a": 2, "b": None}]
+
+    assert api._rows_payload(["a", "b"], rows, "rows") == {"rows": rows}
+    assert api._rows_payload(["b", "a"], rows, "columnar") == {"data": {"b": ["x", None], "a": [1, 2]}}
+    assert api._rows_payload(["a"], [], "columnar") == {"data": {"a": []}}
+
+
+def test_core_table_columnar_matches_rows():
+    try:
+        get_conn().close()
+    except (psycopg2.Error, TypeError, ValueError):
+        pytest.skip("No PostgreSQL database configured")
+
+    with TestClient(api.app) as client:
+        rows = client.get("/api/tables/results?page_size=200").json()
+        response = client.get("/api/tables/results?page_size=200&format=columnar", headers = {"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert _rows_from_columns(response.json()) == rows["rows"]
+    assert response.json()["next_cursor"] == rows["next_cursor"]
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.load_csvs_postgres import copy_dataframe_to_postgres, load_dataframe_to_postgres
+from ingestion.loader import load_config, validate_config
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params = None):
+        self.conn.executed.append(query)
+
+    def copy_expert(self, query, buf):
+        self.conn.copies.append((query, buf.read()))
+
+
+class FakeConn:
+    def __init__(self):
+        self.executed = []
+        self.copies = []
+        self.committed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+def test_copy_loader_streams_chunks_with_nulls_and_ints():
+    df = pd.DataFrame({
+        "result_id": [1, 2, 3],
+        "position": [1.0, np.nan, 3.0],
+        "points": [25.0, 4.5, np.nan],
+        "extra": ["x", "y", "z"],
+    })
+    conn = FakeConn()
+
+    inserted = copy_dataframe_to_postgres(
+        df, conn, "staging.stg_results", ["result_id", "position", "points"], chunk_size = 2, truncate_first = True
+    )
+
+    assert inserted == 3
+    assert conn.committed
+    assert conn.executed == ["TRUNCATE TABLE staging.stg_results"]
+    assert len(conn.copies) == 2
+
+    query, first = conn.copies[0]
+    assert "COPY staging.stg_results (result_id, position, points) FROM STDIN" in query
+    assert first.splitlines() == ["1,1,25.0", "2,\\N,4.5"]
+    assert conn.copies[1][1].splitlines() == ["3,3,\\N"]
+
+
+def test_empty_first_chunk_still_truncates():
+    # Every row of the first chunk rejected: the reload must still clear the table
+    empty = pd.DataFrame({"result_id": [], "points": []})
+
+    for loader in (copy_dataframe_to_postgres, load_dataframe_to_postgres):
+        conn = FakeConn()
+        assert loader(empty, conn, "staging.stg_results", ["result_id", "points"], truncate_first = True) == 0
+        assert conn.executed == ["TRUNCATE TABLE staging.stg_results"]
+        assert conn.committed
+
+    conn = FakeConn()
+    copy_dataframe_to_postgres(empty, conn, "staging.stg_results", ["result_id", "points"])
+    assert conn.executed == []
+
+
+def test_loaders_leave_the_transaction_open_without_commit():
+    df = pd.DataFrame({"result_id": [1, 2, 3], "points": [25.0, 18.0, 15.0]})
+    conn = FakeConn()
+
+    copy_dataframe_to_postgres(df, conn, "staging.stg_results", ["result_id", "points"], truncate_first = True, commit = False)
+    assert conn.executed == ["TRUNCATE TABLE staging.stg_results"]
+    assert len(conn.copies) == 1
+    assert not conn.committed
+
+    conn = FakeConn()
+    load_dataframe_to_postgres(df.iloc[:0], conn, "staging.stg_results", ["result_id", "points"], truncate_first = True, commit = False)
+    assert conn.executed == ["TRUNCATE TABLE staging.stg_results"]
+    assert not conn.committed
+
+
+def test_copy_loader_raises_when_db_column_missing():
+    df = pd.DataFrame({"result_id": [1]})
+
+    with pytest.raises(ValueError):
+        copy_dataframe_to_postgres(df, FakeConn(), "staging.stg_results", ["result_id", "points"])
+
+
+def test_validate_config_rejects_unknown_load_mode():
+    config = load_config("ingestion/config.yaml")
+    config["datasets"]["results"]["load_mode"] = "bulk"
+
+    with pytest.raises(ValueError):
+        validate_config(config)
+
+
+def test_validate_config_rejects_swap_with_append():
+    config = load_config("ingestion/config.yaml")
+    config["datasets"]["results"]["load_mode"] = "swap"
+    config["datasets"]["results"]["append"] = True
+
+    with pytest.raises(ValueError):
+        validate_config(config)
@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.api as api
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+    version = {"value": "1"}
+
+    def leaderboard(limit):
+        calls.append(limit)
+        return [{"driver_id": 1, "driver_name": "Lewis Hamilton", "total_points": Decimal("4912.50")}][:limit]
+
+    monkeypatch.setattr(api, "_leaderboard", leaderboard)
+    monkeypatch.setattr(api.data_version, "current", lambda: version["value"])
+    api.response_cache.clear()
+
+    yield TestClient(api.app), calls, version
+    api.response_cache.clear()
+
+
+def test_repeat_requests_are_served_from_cache_until_data_version_changes(client):
+    http, calls, version = client
+
+    first = http.get("/api/core/leaderboard?limit=1")
+    second = http.get("/api/core/leaderboard?limit=1")
+
+    assert first.json() == second.json()
+    # NUMERIC goes out as a JSON number, as FastAPI encodes it without the cache
+    assert b'"total_points":4912.5}' in first.content
+    assert first.headers["etag"] == second.headers["etag"]
+    assert calls == [1]
+
+    version["value"] = "2"
+    http.get("/api/core/leaderboard?limit=1")
+    assert calls == [1, 1]
+
+
+def test_matching_if_none_match_returns_304_without_body(client):
+    http, calls, _ = client
+
+    etag = http.get("/api/core/leaderboard?limit=1").headers["etag"]
+    revalidated = http.get("/api/core/leaderboard?limit=1", headers = {"If-None-Match": f'"stale", {etag}'})
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+    changed = http.get("/api/core/leaderboard?limit=1", headers = {"If-None-Match": '"stale"'})
+    assert changed.status_code == 200
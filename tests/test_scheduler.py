@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from ingestion.scheduler import execution_order, run_with_dependencies
+
+
+def _timed_task(name, delay):
+    start = time.monotonic()
+    time.sleep(delay)
+    return start, time.monotonic()
+
+
+def _marking_task(name, marker_dir):
+    if name == "fails":
+        raise RuntimeError("boom")
+    time.sleep(0.3)
+    (marker_dir / name).touch()
+    return name
+
+
+def test_execution_order_puts_dimensions_before_facts():
+    dependencies = {
+        "results": ["constructors", "drivers", "races"],
+        "constructors": [],
+        "drivers": [],
+        "races": [],
+    }
+
+    order = execution_order(dependencies)
+
+    assert order.index("results") == 3
+    assert order[:3] == ["constructors", "drivers", "races"]
+
+
+def test_execution_order_raises_on_cycle():
+    with pytest.raises(ValueError):
+        execution_order({"a": ["b"], "b": ["a"]})
+
+
+def test_execution_order_raises_on_unknown_dependency():
+    with pytest.raises(ValueError):
+        execution_order({"results": ["drivers"]})
+
+
+def test_run_with_dependencies_waits_for_dimensions_in_pool():
+    dependencies = {
+        "results": ["constructors", "drivers"],
+        "constructors": [],
+        "drivers": [],
+    }
+
+    timings = run_with_dependencies(dependencies, _timed_task, task_args = (0.2,), max_workers = 2)
+
+    assert set(timings) == set(dependencies)
+    results_start = timings["results"][0]
+    assert results_start >= timings["constructors"][1]
+    assert results_start >= timings["drivers"][1]
+    # The two dimensions are independent, so they overlap in the pool
+    assert timings["drivers"][0] < timings["constructors"][1]
+
+
+def test_failed_dataset_cancels_queued_siblings(tmp_path):
+    # Two workers: "fails" and "slow" start at once, the rest wait in the pool's queue
+    names = ["fails", "slow", "a", "b", "c", "d", "e"]
+    dependencies = {name: [] for name in names}
+
+    with pytest.raises(RuntimeError, match = "boom"):
+        run_with_dependencies(dependencies, _marking_task, task_args = (tmp_path,), max_workers = 2)
+
+    ran = {p.name for p in tmp_path.iterdir()}
+    assert "slow" in ran
+    # The pool had already handed a couple of queued tasks to its workers; the last never started
+    assert "e" not in ran
+    assert len(ran) < len(names) - 1
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from main import SearchIndex
+
+
+def _per_column_search(df, term):
+    # The search main.get_table ran on every request before the index
+    mask = df.astype(str).apply(lambda row: row.str.contains(term, case = False, na = False)).any(axis = 1)
+    return np.flatnonzero(mask.to_numpy())
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "driver_id": [1, 2, 3, 4],
+        "forename": ["Lewis", "Nico", None, "Kimi"],
+        "surname": ["Hamilton", "Rosberg", "Räikkönen", "İnce"],
+        "points": [10.0, np.nan, 6.5, 0.0],
+    })
+
+
+@pytest.mark.parametrize("term", ["ham", "HAM", "o", "1", "6.5", "nan", "ince", "räi", "lewis hamilton", "^N", "s+", "zzz"])
+def test_index_matches_per_column_search(df, term):
+    index = SearchIndex(df)
+
+    assert index.search(df, term).tolist() == _per_column_search(df, term).tolist()
+
+
+def test_matches_do_not_span_cells(df):
+    index = SearchIndex(df)
+
+    assert index.search(df, "lewishamilton").tolist() == []
+    assert index.search(df, "1lewis").tolist() == []
+
+
+def test_regex_and_non_ascii_terms_use_the_per_column_search(df):
+    index = SearchIndex(df)
+
+    assert index.can_answer("hamilton")
+    assert not index.can_answer("ham.*")
+    assert not index.can_answer("räi")
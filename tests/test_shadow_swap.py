@@ -0,0 +1,77 @@
+import uuid
+
+import pandas as pd
+import psycopg2
+import pytest
+
+from backend.db import get_conn
+from backend.load_csvs_postgres import copy_dataframe_to_postgres, create_shadow_table, swap_in_shadow_table
+
+
+@pytest.fixture
+def conns():
+    try:
+        loader, reader = get_conn(), get_conn()
+    except (psycopg2.Error, TypeError, ValueError):
+        pytest.skip("No PostgreSQL database configured")
+
+    table = f"staging.test_swap_{uuid.uuid4().hex[:8]}"
+    with loader.cursor() as cur:
+        cur.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, name TEXT, loaded_at TIMESTAMPTZ DEFAULT NOW())")
+        cur.execute(f"CREATE INDEX {table.split('.')[1]}_name ON {table} (name)")
+        cur.execute(f"INSERT INTO {table} (id, name) VALUES (1, 'old')")
+    loader.commit()
+
+    yield loader, reader, table
+
+    reader.rollback()
+    loader.rollback()
+    with loader.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {table}, {table}__shadow")
+    loader.commit()
+    loader.close()
+    reader.close()
+
+
+def _rows(conn, table):
+    with conn.cursor() as cur:
+        # Fail fast instead of waiting if the table were locked
+        cur.execute("SET lock_timeout = '200ms'")
+        cur.execute(f"SELECT id, name FROM {table} ORDER BY id")
+        rows = cur.fetchall()
+    conn.commit()
+    return rows
+
+
+def test_readers_see_old_rows_until_the_swap(conns):
+    loader, reader, table = conns
+    df = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+
+    shadow = create_shadow_table(loader, table)
+    assert copy_dataframe_to_postgres(df, loader, shadow, ["id", "name"]) == 3
+    assert _rows(reader, table) == [(1, "old")]
+
+    swap_in_shadow_table(loader, table, shadow)
+    assert _rows(reader, table) == [(1, "a"), (2, "b"), (3, "c")]
+
+    with loader.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s)", (shadow,))
+        assert cur.fetchone()[0] is None
+
+        cur.execute(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = 'staging' AND tablename = %s ORDER BY 1",
+            (table.split(".")[1],)
+        )
+        assert [r[0] for r in cur.fetchall()] == sorted([f"{table.split('.')[1]}_name", f"{table.split('.')[1]}_pkey"])
+
+        cur.execute("SELECT relpersistence FROM pg_class WHERE oid = %s::regclass", (table,))
+        assert cur.fetchone()[0] == "p"
+
+        # Column defaults came across
+        cur.execute(f"SELECT COUNT(*) FROM {table} WHERE loaded_at IS NULL")
+        assert cur.fetchone()[0] == 0
+
+        # Still the primary key
+        with pytest.raises(psycopg2.errors.UniqueViolation):
+            cur.execute(f"INSERT INTO {table} (id, name) VALUES (1, 'dup')")
+    loader.rollback()
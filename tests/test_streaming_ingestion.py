@@ -0,0 +1,54 @@
+import logging
+
+import pandas as pd
+
+from ingestion.read_csv import ingest_dataset
+
+
+def _dataset(tmp_path, chunk_size):
+    return {
+        "input_path": str(tmp_path / "results.csv"),
+        "valid_output_path": str(tmp_path / f"out_{chunk_size}" / "valid.csv"),
+        "rejected_output_path": str(tmp_path / f"out_{chunk_size}" / "rejects.csv"),
+        "table_name": "staging.stg_results",
+        "required_columns": ["resultId", "raceId", "points"],
+        "rename_map": {"resultId": "result_id", "raceId": "race_id"},
+        "keep_columns": ["result_id", "race_id", "points"],
+        "key_columns": ["result_id"],
+        "dedupe_keys": ["result_id"],
+        "db_columns": ["result_id", "race_id", "points"],
+        "validation": {"not_null": ["points"]},
+        "chunk_size": chunk_size,
+    }
+
+
+def test_chunked_ingestion_matches_whole_file(tmp_path):
+    (tmp_path / "results.csv").write_text(
+        "resultId,raceId,points\n"
+        "1,18,10\n"
+        "2,18,\\N\n"
+        "1,18,10\n"
+        "3,19,8\n"
+        "3,19,8\n"
+        "4,\\N,6\n"
+        "5,20,1\n"
+    )
+    logger = logging.getLogger("test_ingestion")
+
+    whole = _dataset(tmp_path, None)
+    chunked = _dataset(tmp_path, 2)
+
+    whole_counts = ingest_dataset("results", whole, logger, load_datasets_to_db = False)
+    chunked_counts = ingest_dataset("results", chunked, logger, load_datasets_to_db = False)
+
+    # Timings differ run to run; the row counts must not
+    whole_metrics, chunked_metrics = whole_counts.pop("metrics"), chunked_counts.pop("metrics")
+    assert chunked_counts == whole_counts
+    assert chunked_metrics["stages"]["read"]["rows"] == whole_metrics["stages"]["read"]["rows"] == 7
+    assert chunked_counts["valid_rows"] == 4
+    assert chunked_counts["rejected_rows"] == 1
+
+    for key in ["valid_output_path", "rejected_output_path"]:
+        expected = pd.read_csv(whole[key])
+        actual = pd.read_csv(chunked[key])
+        assert actual["result_id"].tolist() == expected["result_id"].tolist()
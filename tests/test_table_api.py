@@ -0,0 +1,133 @@
+import psycopg2
+import pytest
+from fastapi.testclient import TestClient
+from psycopg2 import sql
+
+from backend import api
+from backend.db import get_conn
+
+
+@pytest.fixture
+def conn():
+    try:
+        conn = get_conn()
+    except (psycopg2.Error, TypeError, ValueError):
+        pytest.skip("No PostgreSQL database configured")
+
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+@pytest.fixture
+def client(conn, monkeypatch):
+    version = {"value": "1"}
+    monkeypatch.setattr(api.data_version, "current", lambda: version["value"])
+    api.search_cache.clear()
+
+    with TestClient(api.app) as client:
+        yield client, version
+    api.search_cache.clear()
+
+
+def _fetch(conn, query, params = None):
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        return cur.fetchall()
+
+
+def test_cached_search_is_replaced_after_a_write(conn, client):
+    http, version = client
+    path = "/api/tables/drivers?search=zqxwv&page_size=5"
+    driver_id, surname = _fetch(conn, "SELECT driver_id, surname FROM core.drivers ORDER BY driver_id LIMIT 1")[0]
+
+    assert http.get(path).json()["total_rows"] == 0
+    hits = api.search_cache.stats()["hits"]
+    assert http.get(path).json()["total_rows"] == 0
+    assert api.search_cache.stats()["hits"] == hits + 1
+
+    try:
+        _fetch(conn, "UPDATE core.drivers SET surname = surname || 'Zqxwv' WHERE driver_id = %s RETURNING 1", (driver_id,))
+        conn.commit()
+        # Ingestion records a new run after it writes, which is the new data version
+        version["value"] = "2"
+
+        body = http.get(path).json()
+        assert body["total_rows"] == 1
+        assert [r["driver_id"] for r in body["rows"]] == [driver_id]
+    finally:
+        _fetch(conn, "UPDATE core.drivers SET surname = %s WHERE driver_id = %s RETURNING 1", (surname, driver_id))
+        conn.commit()
+
+
+def test_search_is_not_cached_without_a_data_version(conn, client):
+    http, version = client
+    version["value"] = None
+
+    http.get("/api/tables/drivers?search=ham&page_size=5")
+    http.get("/api/tables/drivers?search=ham&page_size=5")
+
+    assert api.search_cache.stats()["entries"] == 0
+
+
+def test_unsearched_total_is_the_planner_estimate_unless_exact(conn, client):
+    http, _ = client
+    _fetch(conn, "ANALYZE core.drivers; SELECT 1")
+    conn.commit()
+    api.catalog.invalidate()
+
+    estimate = _fetch(conn, "SELECT reltuples::BIGINT FROM pg_class WHERE oid = 'core.drivers'::regclass")[0][0]
+    exact = _fetch(conn, "SELECT COUNT(*) FROM core.drivers")[0][0]
+
+    body = http.get("/api/tables/drivers?page_size=5").json()
+    assert (body["total_rows"], body["total_rows_exact"]) == (estimate, False)
+
+    body = http.get("/api/tables/drivers?page_size=5&exact_count=true").json()
+    assert (body["total_rows"], body["total_rows_exact"]) == (exact, True)
+
+
+def _columns(conn, table):
+    rows = _fetch(
+        conn,
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = 'core' AND table_name = %s ORDER BY ordinal_position",
+        (table,),
+    )
+    return [r[0] for r in rows]
+
+
+def _matching_ids(conn, table, key, condition, params):
+    query = sql.SQL("SELECT {} FROM core.{} WHERE ").format(sql.Identifier(key), sql.Identifier(table)) + condition
+    return {r[0] for r in _fetch(conn, query, params)}
+
+
+# Text, NULL-able, integer, NUMERIC, DATE and TIME columns
+@pytest.mark.parametrize("table, key, term", [
+    ("drivers", "driver_id", "ham"),
+    ("drivers", "driver_id", "1985-01"),
+    ("drivers", "driver_id", "44"),
+    ("drivers", "driver_id", "none"),
+    ("races", "race_id", "2009-03"),
+    ("races", "race_id", ":00:00"),
+    ("races", "race_id", "grand prix"),
+    ("results", "result_id", "25.00"),
+    ("results", "result_id", ".5"),
+    ("results", "result_id", "null"),
+])
+def test_search_doc_finds_every_per_column_match(conn, table, key, term):
+    columns = _columns(conn, table)
+    if "search_doc" not in columns:
+        pytest.skip("infra/sql/03_search_schema.sql has not been run")
+    columns.remove("search_doc")
+    like = f"%{term}%"
+
+    # The predicate the table endpoint ran on its own before search_doc
+    per_column = sql.SQL("({})").format(sql.SQL(" OR ").join(
+        sql.SQL("CAST({} AS TEXT) ILIKE %s").format(sql.Identifier(c)) for c in columns
+    ))
+    expected = _matching_ids(conn, table, key, per_column, [like] * len(columns))
+    candidates = _matching_ids(conn, table, key, sql.SQL("search_doc ILIKE %s"), [like])
+
+    # The endpoint re-checks the per-column predicate, but search_doc must not miss
+    # a row (NULLs are skipped, numbers and dates render as CAST does)
+    assert candidates == expected
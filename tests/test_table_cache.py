@@ -0,0 +1,55 @@
+import os
+
+import main
+from main import TableCache
+
+
+def _write(path, text, mtime_ns = None):
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns = (mtime_ns, mtime_ns))
+
+
+def test_table_is_parsed_once_until_file_changes(tmp_path):
+    path = tmp_path / "drivers_processed.csv"
+    _write(path, "driver_id,surname\n1,Hamilton\n", mtime_ns = 1_000_000_000)
+    cache = TableCache(tmp_path, max_bytes = 10_000_000)
+
+    first = cache.get("drivers")
+    assert cache.get("drivers") is first
+
+    _write(path, "driver_id,surname\n1,Hamilton\n2,Rosberg\n", mtime_ns = 2_000_000_000)
+    reloaded = cache.get("drivers")
+
+    assert list(reloaded.df["surname"]) == ["Hamilton", "Rosberg"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["reloads"]) == (1, 1, 1)
+
+
+def test_least_recently_used_table_is_evicted_over_budget(tmp_path):
+    for name in ["a", "b"]:
+        _write(tmp_path / f"{name}_processed.csv", "x\n" + "\n".join(str(i) for i in range(100)) + "\n")
+
+    one_table = TableCache(tmp_path, max_bytes = 10**9).get("a").nbytes
+    cache = TableCache(tmp_path, max_bytes = one_table + one_table // 2)
+
+    cache.get("a")
+    cache.get("b")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert stats["tables"] == 1
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+def test_get_table_pages_come_from_cache(tmp_path, monkeypatch):
+    _write(tmp_path / "drivers_processed.csv", "driver_id,surname\n1,Hamilton\n2,Rosberg\n3,Alonso\n")
+    monkeypatch.setattr(main, "table_cache", TableCache(tmp_path, max_bytes = 10_000_000))
+
+    page1 = main.get_table("drivers", page = 1, page_size = 2, search = "")
+    page2 = main.get_table("drivers", page = 2, page_size = 2, search = "")
+
+    assert [r["surname"] for r in page1["rows"] + page2["rows"]] == ["Hamilton", "Rosberg", "Alonso"]
+    assert main.table_cache.stats()["misses"] == 1
+    assert main.table_cache.stats()["hits"] == 1
@@ -0,0 +1,66 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from ingestion.loader import load_config
+from ingestion.read_csv import _read_csv_options, ingest_dataset
+
+
+def _raw_results(path, rows = 20000):
+    rng = np.random.default_rng(0)
+    lines = [
+        "resultId,raceId,driverId,constructorId,number,grid,position,positionText,"
+        "positionOrder,points,laps,time,milliseconds,statusId"
+    ]
+    for i in range(1, rows + 1):
+        position, position_text = ("\\N", "R") if i % 7 == 0 else (str(i % 20 + 1), str(i % 20 + 1))
+        lines.append(
+            f"{i},{rng.integers(1, 1100)},{rng.integers(1, 860)},{rng.integers(1, 210)},{i % 99},"
+            f"{i % 24},{position},\"{position_text}\",{i % 20 + 1},"
+            f"{rng.choice([0, 1, 2.5, 10, 25])},{rng.integers(1, 78)},\"+{i % 60}.{i % 1000:03d}\",\\N,1"
+        )
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_typed_parse_cuts_results_memory(tmp_path):
+    raw = tmp_path / "results.csv"
+    _raw_results(raw)
+    ds = {**load_config("ingestion/config.yaml")["datasets"]["results"], "input_path": str(raw)}
+
+    untyped = pd.read_csv(raw).replace(r"\\N", np.nan, regex = True)
+    typed = pd.read_csv(raw, **_read_csv_options(ds))
+
+    assert str(typed["resultId"].dtype) == "Int32"
+    assert str(typed["points"].dtype) == "float32"
+    assert typed["position"].isna().sum() == len(typed) // 7
+
+    untyped_bytes = untyped.memory_usage(deep = True).sum()
+    typed_bytes = typed.memory_usage(deep = True).sum()
+    assert typed_bytes < untyped_bytes * 0.25, (typed_bytes, untyped_bytes)
+
+
+def test_typed_ingestion_writes_same_values(tmp_path):
+    (tmp_path / "drivers.csv").write_text(
+        "driverId,driverRef,number,code,forename,surname,dob,nationality,url\n"
+        "1,hamilton,44,HAM,Lewis,Hamilton,1985-01-07,British,http://a\n"
+        "2,heidfeld,\\N,HEI,Nick,Heidfeld,1977-05-10,German,http://b\n"
+        "\\N,nobody,\\N,\\N,No,Body,\\N,\\N,http://c\n"
+        "3,rosberg,6,ROS,Nico,Rosberg,\\N,German,http://d\n"
+    )
+    ds = {
+        **load_config("ingestion/config.yaml")["datasets"]["drivers"],
+        "input_path": str(tmp_path / "drivers.csv"),
+        "valid_output_path": str(tmp_path / "out" / "drivers.csv"),
+        "rejected_output_path": str(tmp_path / "out" / "drivers_rejects.csv"),
+    }
+
+    counts = ingest_dataset("drivers", ds, logging.getLogger("test_ingestion"), load_datasets_to_db = False)
+    assert counts["valid_rows"] == 3
+    assert counts["rejected_rows"] == 1
+
+    valid = pd.read_csv(ds["valid_output_path"])
+    assert valid["driver_id"].tolist() == [1, 2, 3]
+    assert valid["number"].tolist()[0] == 44 and pd.isna(valid["number"].tolist()[1])
+    assert valid["dob"].tolist()[:2] == ["1985-01-07", "1977-05-10"]
+    assert pd.isna(valid["dob"].tolist()[2])
@@ -126,4 +126,73 @@ def test_split_required_not_null_raises_when_column_missing():
     required_not_null = ["resultId", "raceId", "points"]
 
     with pytest.raises(ValueError):
-        validators.split_valid_rejects_by_required_not_null(df, required_not_null)
\ No newline at end of file
+        validators.split_valid_rejects_by_required_not_null(df, required_not_null)
+
+def _plan():
+    return validators.compile_validation_plan({
+        "dedupe_keys": ["resultId"],
+        "validation": {
+            "not_null": ["points"],
+            "numeric": ["position"],
+            "ranges": {"points": {"min": 0}, "position": {"min": 1, "max": 30}},
+            "allowed_values": {"status": ["Finished", "Retired"]},
+            "regex": {"code": "[A-Z]{3}"},
+        },
+    })
+
+
+def test_validation_plan_rejects_with_every_failed_rule():
+    df = pd.DataFrame([
+        {"resultId": 1, "points": 25.0, "position": "1", "status": "Finished", "code": "HAM"},
+        {"resultId": 2, "points": -1.0, "position": "x", "status": "Finished", "code": "HAM"},  # rejected twice
+        {"resultId": None, "points": 5.0, "position": "3", "status": "Retired", "code": None},  # null key
+        {"resultId": 4, "points": None, "position": "40", "status": "Lapped", "code": "ham"},  # four rules
+        {"resultId": 5, "points": 0.0, "position": None, "status": None, "code": "ROS"},
+    ])
+
+    valid_df, rejects_df, counts = _plan().split(df)
+
+    assert valid_df["resultId"].tolist() == [1, 5]
+    assert valid_df["position"].tolist()[0] == 1  # coerced to a number
+    assert rejects_df[validators.REJECT_REASONS_COLUMN].tolist() == [
+        "numeric:position;range:points",
+        "not_null:resultId",
+        "not_null:points;range:position;allowed_values:status;regex:code",
+    ]
+    assert counts == {
+        "not_null:resultId": 1,
+        "not_null:points": 1,
+        "numeric:position": 1,
+        "range:points": 1,
+        "range:position": 1,
+        "allowed_values:status": 1,
+        "regex:code": 1,
+    }
+
+
+def test_validation_plan_keeps_reasons_column_when_nothing_rejected():
+    df = pd.DataFrame([{"resultId": 1, "points": 25.0, "position": 1, "status": "Finished", "code": "HAM"}])
+
+    valid_df, rejects_df, counts = _plan().split(df)
+
+    assert len(valid_df) == 1
+    assert list(rejects_df.columns) == list(df.columns) + [validators.REJECT_REASONS_COLUMN]
+    assert counts == {}
+
+
+def test_validation_plan_raises_when_column_missing():
+    df = pd.DataFrame([{"resultId": 1, "points": 25.0}])
+
+    with pytest.raises(ValueError):
+        _plan().split(df)
+
+
+def test_compile_validation_plan_rejects_bad_rules():
+    for validation in [
+        {"ranges": {"points": {"low": 0}}},
+        {"regex": {"code": "[A-Z"}},
+        {"allowed_values": {"status": "Finished"}},
+        {"unique": ["resultId"]},
+    ]:
+        with pytest.raises(ValueError):
+            validators.compile_validation_plan({"dedupe_keys": ["resultId"], "validation": validation})